@@ -31,6 +31,10 @@ try:
     from app.models.cliente import Cliente
     from app.models.vendedor import Vendedor, VendedorClientePorcentaje
     from app.models.factura import Factura
+    from app.models.import_job import ImportJob
+    from app.models.bono_ledger import BonoLedger, BonoLedgerPeriodo
+    from app.models.busqueda import BusquedaTrigrama
+    from app.models.tabla_version import TablaVersion
     # --- FIN DE LA CORRECCIÓN ---
 
     # Importar y configurar PyMySQL para que actúe como MySQLdb
@@ -0,0 +1,43 @@
+"""rut normalizado
+
+Columna rut_normalizado (RUT sin puntos, guion ni espacios, en mayúsculas) indexada en
+vendedores y clientes, para búsquedas exactas y por prefijo. Se rellena a partir de rut.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:40:12.381902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLAS = ('vendedores', 'clientes')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for tabla in TABLAS:
+        op.add_column(tabla, sa.Column('rut_normalizado', sa.String(length=20), nullable=True))
+        # Misma regla que app.core.rut.normalizar_rut
+        op.execute(
+            f"UPDATE {tabla} SET rut_normalizado = "
+            f"UPPER(REPLACE(REPLACE(REPLACE(rut, '.', ''), '-', ''), ' ', ''))"
+        )
+        op.create_index(op.f(f'ix_{tabla}_rut_normalizado'), tabla, ['rut_normalizado'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for tabla in reversed(TABLAS):
+        op.drop_index(op.f(f'ix_{tabla}_rut_normalizado'), table_name=tabla)
+        with op.batch_alter_table(tabla) as batch_op:
+            batch_op.drop_column('rut_normalizado')
@@ -0,0 +1,61 @@
+"""busqueda trigramas
+
+Índice invertido de trigramas (busqueda_trigramas) para la búsqueda de clientes y vendedores
+con search_mode=trigram. Se rellena con los registros existentes.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 01:12:47.520193
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.busqueda import trigramas
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LOTE = 1000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    busqueda = op.create_table('busqueda_trigramas',
+    sa.Column('entidad', sa.String(length=20), nullable=False),
+    sa.Column('trigrama', sa.String(length=3), nullable=False),
+    sa.Column('entidad_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('entidad', 'trigrama', 'entidad_id')
+    )
+    op.create_index('ix_busqueda_trigramas_entidad_id', 'busqueda_trigramas', ['entidad_id', 'entidad'], unique=False)
+
+    # Relleno inicial con la misma función que usa la aplicación (app.core.busqueda)
+    conexion = op.get_bind()
+    fuentes = (
+        ('cliente', sa.text("SELECT id, razon_social, rut_normalizado FROM clientes")),
+        ('vendedor', sa.text("SELECT id, nombre_completo, rut_normalizado FROM vendedores")),
+    )
+    for entidad, consulta in fuentes:
+        filas = []
+        for entidad_id, nombre, rut_normalizado in conexion.execute(consulta):
+            filas.extend(
+                {'entidad': entidad, 'trigrama': trigrama, 'entidad_id': entidad_id}
+                for trigrama in trigramas(nombre, rut_normalizado)
+            )
+            if len(filas) >= LOTE:
+                op.bulk_insert(busqueda, filas)
+                filas = []
+        if filas:
+            op.bulk_insert(busqueda, filas)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_busqueda_trigramas_entidad_id', table_name='busqueda_trigramas')
+    op.drop_table('busqueda_trigramas')
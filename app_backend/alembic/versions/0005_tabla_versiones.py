@@ -0,0 +1,40 @@
+"""tabla versiones
+
+Contador de cambios por tabla (tabla_versiones) que usan los ETag de /clientes/simple
+y /vendedores/simple.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 03:05:41.118524
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    tabla_versiones = op.create_table('tabla_versiones',
+    sa.Column('tabla', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    sa.PrimaryKeyConstraint('tabla')
+    )
+    op.bulk_insert(tabla_versiones, [
+        {'tabla': 'clientes', 'version': 0},
+        {'tabla': 'vendedores', 'version': 0},
+    ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('tabla_versiones')
@@ -0,0 +1,62 @@
+"""bono ledger
+
+Ledger mensual de bonos: totales por (periodo, vendedor, cliente) en bono_ledger y los
+periodos materializados en bono_ledger_periodos. Se llena en el primer cálculo que los usa.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 09:12:41.902715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _existe(tabla: str) -> bool:
+    # Las bases creadas con una versión anterior de 0001 ya tienen la tabla
+    return sa.inspect(op.get_bind()).has_table(tabla)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not _existe('bono_ledger_periodos'):
+        op.create_table('bono_ledger_periodos',
+        sa.Column('periodo', sa.Integer(), nullable=False),
+        sa.Column('materializado_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint('periodo')
+        )
+    if not _existe('bono_ledger'):
+        op.create_table('bono_ledger',
+        sa.Column('periodo', sa.Integer(), nullable=False),
+        sa.Column('vendedor_id', sa.Integer(), nullable=False),
+        sa.Column('cliente_id', sa.Integer(), nullable=False),
+        sa.Column('honorarios', sa.Float(), nullable=False),
+        sa.Column('gastos', sa.Float(), nullable=False),
+        sa.Column('neto', sa.Float(), nullable=False),
+        sa.Column('neto_positivo', sa.Float(), nullable=False),
+        sa.Column('bono', sa.Float(), nullable=False),
+        sa.Column('num_facturas', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ),
+        sa.ForeignKeyConstraint(['vendedor_id'], ['vendedores.id'], ),
+        sa.PrimaryKeyConstraint('periodo', 'vendedor_id', 'cliente_id')
+        )
+        op.create_index(op.f('ix_bono_ledger_cliente_id'), 'bono_ledger', ['cliente_id'], unique=False)
+        op.create_index(op.f('ix_bono_ledger_vendedor_id'), 'bono_ledger', ['vendedor_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bono_ledger_vendedor_id'), table_name='bono_ledger')
+    op.drop_index(op.f('ix_bono_ledger_cliente_id'), table_name='bono_ledger')
+    op.drop_table('bono_ledger')
+    op.drop_table('bono_ledger_periodos')
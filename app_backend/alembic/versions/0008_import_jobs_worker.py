@@ -0,0 +1,33 @@
+"""import jobs worker
+
+Columna import_jobs.worker: proceso que ejecuta cada carga, para que al arrancar se marquen
+como fallidos los trabajos que quedaron pendientes o en curso en un proceso que terminó.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:40:27.305512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('import_jobs') as batch_op:
+        batch_op.add_column(sa.Column('worker', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('import_jobs') as batch_op:
+        batch_op.drop_column('worker')
@@ -1,12 +1,14 @@
 # app/api/deps.py
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from pydantic import ValidationError
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import SessionLocal
+from app.db.session_async import get_async_sessionmaker
 from app.core.config import settings
 from app.models.user import User, UserRole, ApprovalStatus
 from app.schemas.token import TokenPayload
@@ -23,9 +25,16 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Sesión async para las rutas /async (503 si el stack async no está disponible)."""
+    try:
+        async_session_local = get_async_sessionmaker()
+    except (ImportError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Stack async no disponible: {e}")
+    async with async_session_local() as db:
+        yield db
+
+def _username_del_token(token: str) -> str:
     try:
         payload = jwt.decode(
             token, str(settings.SECRET_KEY), algorithms=[settings.ALGORITHM]
@@ -41,8 +50,9 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Could not validate credentials: {e}",
         )
+    return token_data.sub
 
-    user = crud_user.get_user_by_username(db, username=token_data.sub)
+def _validar_usuario(user: Optional[User]) -> User:
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     if not user.is_active:
@@ -51,6 +61,19 @@ def get_current_user(
          raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"User account is {user.approval_status.value}")
     return user
 
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    username = _username_del_token(token)
+    return _validar_usuario(crud_user.get_user_by_username_cacheado(db, username=username))
+
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(reusable_oauth2)
+) -> User:
+    username = _username_del_token(token)
+    user = await db.run_sync(lambda sesion: crud_user.get_user_by_username_cacheado(sesion, username=username))
+    return _validar_usuario(user)
+
 def get_current_active_superuser(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -68,4 +91,9 @@ def get_current_admin_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="The user doesn't have enough privileges (admin required)."
         )
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_current_admin_user_async(
+    current_user: User = Depends(get_current_user_async),
+) -> User:
+    return get_current_admin_user(current_user)
@@ -0,0 +1,25 @@
+# app/api/etag.py
+"""
+ETag / If-None-Match para respuestas que dependen de una versión conocida (app.crud.crud_tabla_version).
+"""
+from typing import Dict, Optional
+
+from fastapi import Request, Response, status
+
+def etag_de_version(recurso: str, version: int) -> str:
+    return f'"{recurso}-{version}"'
+
+def cabeceras_etag(etag: str) -> Dict[str, str]:
+    # no-cache: el navegador guarda la respuesta pero la revalida siempre con If-None-Match
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def coincide_etag(request: Request, etag: str) -> bool:
+    """True si el If-None-Match del cliente incluye el ETag (o es '*')."""
+    if_none_match: Optional[str] = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidatos = {valor.strip().removeprefix("W/") for valor in if_none_match.split(",")}
+    return "*" in candidatos or etag in candidatos
+
+def no_modificado(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabeceras_etag(etag))
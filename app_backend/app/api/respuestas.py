@@ -0,0 +1,36 @@
+# app/api/respuestas.py
+"""
+Respuestas JSON serializadas con orjson para los listados y reportes grandes.
+
+Si un endpoint devuelve una Response, FastAPI no valida ni serializa contra su response_model
+(que queda solo para la documentación): los datos se pasan tal cual a orjson, sin modelos
+intermedios. Se usa cuando settings.ORJSON_RESPONSES_ENABLED está activo y los datos vienen de
+consultas con tipos conocidos; con el modo desactivado los endpoints devuelven los mismos
+datos y FastAPI los valida una vez contra el response_model.
+"""
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+# OPT_UTC_Z: las fechas UTC salen con "Z", igual que al serializar con Pydantic
+_OPCIONES = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+def _por_defecto(valor: Any) -> Any:
+    """Tipos que orjson no conoce: modelos Pydantic ya construidos y Decimal (SUM en MySQL)."""
+    if isinstance(valor, BaseModel):
+        return dict(valor) # Superficial: los campos anidados los sigue serializando orjson
+    if isinstance(valor, Decimal):
+        return float(valor)
+    raise TypeError(f"Tipo no serializable a JSON: {type(valor).__name__}")
+
+class RespuestaJSON(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_por_defecto, option=_OPCIONES)
+
+def respuesta_json(contenido: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> RespuestaJSON:
+    return RespuestaJSON(contenido, status_code=status_code, headers=headers)
@@ -1,6 +1,6 @@
 # En app/api/v1/__init__.py
 from fastapi import APIRouter
-from .endpoints import auth, users, clientes, vendedores, facturas, bonos, reportes # <--- bonos y reportes 23 jun 25
+from .endpoints import auth, users, clientes, vendedores, facturas, bonos, reportes, jobs, asincrono, sistema # <--- bonos y reportes 23 jun 25
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -10,4 +10,6 @@ api_router.include_router(vendedores.router, prefix="/vendedores", tags=["vended
 api_router.include_router(facturas.router, prefix="/facturas", tags=["Facturación"]) # <--- 23 jun 25
 api_router.include_router(bonos.router, prefix="/bonos", tags=["Bonos"]) # <--- 23 jun 25
 api_router.include_router(reportes.router, prefix="/reportes", tags=["Reportes"]) # <--- 23 jun 25
-
+api_router.include_router(jobs.router, prefix="/jobs", tags=["Jobs"])
+api_router.include_router(asincrono.router, prefix="/async", tags=["Async"])
+api_router.include_router(sistema.router, prefix="/sistema", tags=["Sistema"])
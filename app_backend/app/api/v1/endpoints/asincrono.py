@@ -0,0 +1,110 @@
+# app/api/v1/endpoints/asincrono.py
+"""
+Rutas de solo lectura sobre el stack async (AsyncSession + driver async), alternativas a
+GET /facturas/, GET /reportes/facturacion y POST /bonos/calcular. Devuelven lo mismo que
+las rutas síncronas pero no ocupan threads del pool mientras esperan a la base.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Optional
+from datetime import date
+
+from app import crud, schemas
+from app.api import deps
+from app.api.respuestas import respuesta_json
+from app.core.config import settings
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+@router.get("/facturas/", response_model=schemas.factura.FacturasResponse)
+async def read_facturas_async_endpoint(
+    db: AsyncSession = Depends(deps.get_async_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100),
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    vendedor_id: Optional[int] = Query(None),
+    cliente_id: Optional[int] = Query(None),
+    after: Optional[str] = Query(None, description="Cursor 'next_cursor' de la página anterior. Si se envía, se ignora 'skip'."),
+    include_total: bool = Query(True, description="Si es False no se recalcula el total (útil al paginar por cursor)."),
+    current_user: UserModel = Depends(deps.get_current_user_async)
+) -> Any:
+    """
+    Versión async de GET /facturas/.
+    """
+    try:
+        return await crud.crud_async.get_facturas(
+            db, skip=skip, limit=limit,
+            start_date=start_date, end_date=end_date,
+            vendedor_id=vendedor_id, cliente_id=cliente_id,
+            after=after, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+@router.get("/reportes/facturacion", response_model=schemas.reporte.ReporteResponse)
+async def get_reporte_facturacion_async_endpoint(
+    db: AsyncSession = Depends(deps.get_async_db),
+    start_date: date = Query(..., description="Fecha de inicio (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="Fecha de fin (YYYY-MM-DD)"),
+    numero_caso: Optional[str] = Query(None),
+    vendedor_id: Optional[int] = Query(None),
+    cliente_id: Optional[int] = Query(None),
+    vendedor_rut: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: UserModel = Depends(deps.get_current_user_async)
+) -> Any:
+    """
+    Versión async de GET /reportes/facturacion.
+    """
+    reporte = await crud.crud_async.get_reporte_facturacion_enriquecido(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        numero_caso=numero_caso,
+        vendedor_id=vendedor_id,
+        cliente_id=cliente_id,
+        vendedor_rut=vendedor_rut,
+        skip=skip,
+        limit=limit
+    )
+    if settings.ORJSON_RESPONSES_ENABLED:
+        return respuesta_json(reporte)
+    return reporte
+
+@router.post("/bonos/calcular", response_model=schemas.bono.BonoCalculationResponse)
+async def calcular_bonos_async_endpoint(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db),
+    request_body: schemas.bono.BonoCalculationRequest,
+    current_user: UserModel = Depends(deps.get_current_admin_user_async)
+) -> Any:
+    """
+    Versión async de POST /bonos/calcular.
+    """
+    if request_body.start_date > request_body.end_date:
+        raise HTTPException(status_code=400, detail="La fecha de inicio no puede ser posterior a la fecha de fin.")
+
+    try:
+        resultados = await crud.crud_async.calcular_bonos_por_periodo(
+            db,
+            start_date=request_body.start_date,
+            end_date=request_body.end_date,
+            vendedor_id=request_body.vendedor_id,
+            modo=request_body.modo,
+            incluir_detalle=request_body.incluir_detalle
+        )
+    except Exception as e:
+        print(f"Error durante el cálculo de bonos: {e}")
+        raise HTTPException(status_code=500, detail="Ocurrió un error interno durante el cálculo de bonos.")
+
+    respuesta = {
+        "start_date": request_body.start_date,
+        "end_date": request_body.end_date,
+        "resultados": resultados
+    }
+    if settings.ORJSON_RESPONSES_ENABLED:
+        return respuesta_json(respuesta)
+    return respuesta
@@ -5,7 +5,10 @@ from typing import Any
 
 from app import schemas
 from app.api import deps
+from app.api.respuestas import respuesta_json
+from app.core.config import settings
 from app.core.calculations import calcular_bonos_por_periodo
+from app.core.simulacion import simular_bonos
 from app.models.user import User as UserModel
 
 router = APIRouter()
@@ -19,6 +22,8 @@ def calcular_bonos_endpoint(
 ) -> Any:
     """
     Calcula los bonos para uno o todos los vendedores en un período de fechas.
+    Con el ledger activo, los meses cerrados del período que aún no estén en él se materializan
+    (es una lectura que escribe en bono_ledger; ver crud_bono_ledger.rango_materializado).
     """
     if request_body.start_date > request_body.end_date:
         raise HTTPException(status_code=400, detail="La fecha de inicio no puede ser posterior a la fecha de fin.")
@@ -28,15 +33,56 @@ def calcular_bonos_endpoint(
             db=db,
             start_date=request_body.start_date,
             end_date=request_body.end_date,
-            vendedor_id=request_body.vendedor_id
+            vendedor_id=request_body.vendedor_id,
+            modo=request_body.modo,
+            incluir_detalle=request_body.incluir_detalle
         )
 
-        return {
+        respuesta = {
             "start_date": request_body.start_date,
             "end_date": request_body.end_date,
             "resultados": resultados
         }
+        if settings.ORJSON_RESPONSES_ENABLED:
+            return respuesta_json(respuesta)
+        return respuesta
     except Exception as e:
         # En un caso real, loguear el error `e`
         print(f"Error durante el cálculo de bonos: {e}")
         raise HTTPException(status_code=500, detail="Ocurrió un error interno durante el cálculo de bonos.")
+
+
+@router.post("/simular", response_model=schemas.bono.BonoSimulacionResponse)
+def simular_bonos_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    request_body: schemas.bono.BonoSimulacionRequest,
+    current_user: UserModel = Depends(deps.get_current_admin_user)
+) -> Any:
+    """
+    Bonos que habría pagado el período con otros porcentajes ("todos los clientes de Minería
+    al 12 %"), para varios escenarios a la vez y sin modificar las asignaciones.
+    """
+    if request_body.start_date > request_body.end_date:
+        raise HTTPException(status_code=400, detail="La fecha de inicio no puede ser posterior a la fecha de fin.")
+
+    try:
+        escenarios = simular_bonos(
+            db=db,
+            start_date=request_body.start_date,
+            end_date=request_body.end_date,
+            escenarios=request_body.escenarios,
+            vendedor_id=request_body.vendedor_id
+        )
+
+        respuesta = {
+            "start_date": request_body.start_date,
+            "end_date": request_body.end_date,
+            "escenarios": escenarios
+        }
+        if settings.ORJSON_RESPONSES_ENABLED:
+            return respuesta_json(respuesta)
+        return respuesta
+    except Exception as e:
+        print(f"Error durante la simulación de bonos: {e}")
+        raise HTTPException(status_code=500, detail="Ocurrió un error interno durante la simulación de bonos.")
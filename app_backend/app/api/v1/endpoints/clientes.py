@@ -1,12 +1,15 @@
 # app/api/v1/endpoints/clientes.py
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List, Any, Optional
-import csv
-import io
+from typing import List, Any, Optional, Literal
+import pandas as pd
 
 from app import crud, schemas
 from app.api import deps
+from app.api.etag import cabeceras_etag, coincide_etag, etag_de_version, no_modificado
+from app.core import import_jobs
+from app.core.csv_stream import leer_csv_por_bloques
+from app.models.cliente import Cliente
 from app.models.user import User as UserModel 
 
 router = APIRouter()
@@ -36,17 +39,46 @@ def read_clientes_endpoint(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None, min_length=1, max_length=100),
+    search_mode: Literal["contains", "trigram"] = Query(
+        "contains", description="'contains': coincidencia parcial exacta. 'trigram': búsqueda indexada por trigramas, ordenada por relevancia."
+    ),
+    after: Optional[str] = Query(None, description="Cursor 'next_cursor' de la página anterior. Si se envía, se ignora 'skip'."),
+    include_total: bool = Query(True, description="Si es False no se recalcula el total (útil al paginar por cursor)."),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtener lista de clientes con paginación y búsqueda.
-    Busca por razón social o RUT.
+    Busca por razón social o RUT. Admite paginación por OFFSET (skip) o por cursor (after);
+    con search_mode=trigram los resultados van por relevancia y solo se pagina con skip.
     """
-    clientes_items, total_count = crud.crud_cliente.get_clientes(
-        db, skip=skip, limit=limit, search=search
-    )
+    try:
+        clientes_items, total_count, next_cursor = crud.crud_cliente.get_clientes(
+            db, skip=skip, limit=limit, search=search, after=after, include_total=include_total,
+            search_mode=search_mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    return {"items": clientes_items, "total_count": total_count}
+    return {"items": clientes_items, "total_count": total_count, "next_cursor": next_cursor}
+
+# Va antes de /{cliente_id}: si no, esa ruta captura "simple" como ID (422)
+@router.get("/simple", response_model=List[schemas.cliente.ClienteSimple])
+def read_clientes_simple_endpoint(
+    request: Request,
+    response: Response,
+    db: Session = Depends(deps.get_db),
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Obtener una lista simplificada de todos los clientes para los selectores.
+    Responde 304 si el If-None-Match coincide con la versión actual de la tabla clientes.
+    """
+    # Versión antes que datos (ver read_vendedores_simple)
+    etag = etag_de_version("clientes-simple", crud.crud_tabla_version.get_version(db, Cliente.__tablename__))
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+    response.headers.update(cabeceras_etag(etag))
+    return crud.crud_cliente.get_clientes_simple(db)
 
 @router.get("/{cliente_id}", response_model=schemas.cliente.Cliente)
 def read_cliente_by_id_endpoint(
@@ -103,8 +135,9 @@ def delete_cliente_endpoint(
     deleted_cliente = crud.crud_cliente.remove_cliente(db=db, cliente_id=cliente_id)
     return deleted_cliente # O un mensaje de éxito
 
-@router.post("/upload-csv/", response_model=List[schemas.cliente.Cliente]) # O un response_model más detallado con éxitos y errores
-async def upload_clientes_csv(
+# def y no async: FastAPI la ejecuta en su threadpool y la importación (síncrona) no bloquea el event loop
+@router.post("/upload-csv/", response_model=schemas.importacion.ResultadoImportacion)
+def upload_clientes_csv(
     *,
     db: Session = Depends(deps.get_db),
     file: UploadFile = File(...),
@@ -113,81 +146,50 @@ async def upload_clientes_csv(
     """
     Cargar clientes desde un archivo CSV.
     El CSV debe tener las columnas: razon_social, rut, ramo, ubicacion (ramo y ubicacion son opcionales)
+    El archivo se procesa por bloques, sin cargarlo completo en memoria.
     """
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe ser un CSV.")
 
-    created_clientes: List[schemas.cliente.Cliente] = []
-    errors: List[Dict[str, Any]] = []
-
     try:
-        contents = await file.read()
-        decoded_content = contents.decode('utf-8') # Asume UTF-8, ajusta si es necesario
-        # Usar io.StringIO para tratar la cadena como un archivo
-        csv_file = io.StringIO(decoded_content)
-        csv_reader = csv.DictReader(csv_file)
-
-        # Verifica que las columnas existan en el DictReader
-        if not csv_reader.fieldnames:
-             raise HTTPException(status_code=400, detail="CSV vacío o sin cabeceras.")
+        csv_columns, bloques = leer_csv_por_bloques(file.file)
 
         required_columns = {"razon_social", "rut"}
-        if not required_columns.issubset(set(name.lower() for name in csv_reader.fieldnames)): # Normalizar a minúsculas
-            missing = required_columns - set(name.lower() for name in csv_reader.fieldnames)
+        missing = required_columns - set(csv_columns)
+        if missing:
             raise HTTPException(status_code=400, detail=f"Faltan columnas requeridas en el CSV: {', '.join(missing)}")
 
-        # Mapeo de nombres de columna del CSV a nombres de campo del schema (normalizando)
-        column_map = {name.lower(): name for name in csv_reader.fieldnames}
-
-        for row_num, row_dict in enumerate(csv_reader, start=1):
-            # Normalizar claves del diccionario de la fila a minúsculas
-            row = {k.lower(): v for k,v in row_dict.items()}
-            try:
-                # Validar y crear el schema ClienteCreate
-                cliente_data = {
-                    "razon_social": row[column_map["razon_social"]],
-                    "rut": row[column_map["rut"]],
-                    "ramo": row.get(column_map.get("ramo")), # .get() para campos opcionales
-                    "ubicacion": row.get(column_map.get("ubicacion"))
-                }
-                cliente_in = schemas.cliente.ClienteCreate(**cliente_data)
-
-                db_cliente_rut = crud.crud_cliente.get_cliente_by_rut(db, rut=cliente_in.rut)
-                if db_cliente_rut:
-                    errors.append({"row": row_num, "rut": cliente_in.rut, "error": "RUT ya existe."})
-                    continue 
-
-                cliente = crud.crud_cliente.create_cliente(db, cliente_in=cliente_in)
-                created_clientes.append(cliente)
-            except Exception as e_row: # Captura errores de validación Pydantic o de BD por fila
-                errors.append({"row": row_num, "rut": row.get(column_map.get("rut"), 'N/A'), "error": str(e_row)})
+        resultado = crud.crud_cliente.process_clientes_csv(db, bloques=bloques)
 
+    except HTTPException:
+        raise
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="CSV vacío o sin cabeceras.")
     except Exception as e:
         # Captura errores generales del procesamiento del archivo
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error procesando el archivo CSV: {str(e)}")
 
-    if errors:
-        # Si quieres retornar los errores al cliente, puedes hacerlo de varias maneras.
-        # Aquí, por simplicidad, los incluimos en un detalle de una excepción si hubo errores y no se creó nada.
-        if not created_clientes:
-             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail={"message": "No se crearon clientes debido a errores en el CSV.", "errors": errors})
-        # Si algunos se crearon y otros no, podrías retornar una estructura mixta.
-        # Por ahora, solo retornamos los creados y el cliente puede verificar los errores si el total no coincide.
-        # Opcional: loguear los errores en el servidor.
-        print(f"INFO: Carga CSV de clientes completada. Creados: {len(created_clientes)}, Errores: {len(errors)}")
-        print(f"Detalle de errores en carga CSV: {errors}")
-
+    if resultado.errors and not resultado.created_count:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"message": "No se crearon clientes debido a errores en el CSV.", **resultado.model_dump()}
+        )
 
-    return created_clientes # Retorna solo los clientes creados exitosamente
+    return resultado # Incluye los errores de las filas omitidas
 
-# --- AÑADIR ESTE NUEVO ENDPOINT AL FINAL DEL ARCHIVO ---
-@router.get("/simple", response_model=List[schemas.cliente.ClienteSimple])
-def read_clientes_simple_endpoint(
+@router.post("/upload-csv/background", response_model=schemas.import_job.ImportJob, status_code=status.HTTP_202_ACCEPTED)
+def upload_clientes_csv_background(
+    *,
     db: Session = Depends(deps.get_db),
-    current_user: UserModel = Depends(deps.get_current_user)
+    file: UploadFile = File(...),
+    current_user: UserModel = Depends(deps.get_current_admin_user)
 ) -> Any:
     """
-    Obtener una lista simplificada de todos los clientes para los selectores.
+    Encola la carga del CSV en segundo plano y retorna el trabajo de inmediato.
+    El avance se consulta en GET /jobs/{job_id}.
     """
-    clientes = crud.crud_cliente.get_clientes_simple(db)
-    return clientes
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe ser un CSV.")
+    return import_jobs.encolar_importacion(
+        db, tipo="clientes", archivo=file.file, filename=file.filename, created_by_id=current_user.id
+    )
@@ -3,11 +3,12 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile
 from sqlalchemy.orm import Session
 from typing import List, Any, Optional, Dict
 from datetime import date
-import csv
-import io
+import pandas as pd
 
 from app import crud, schemas
 from app.api import deps
+from app.core import import_jobs
+from app.core.csv_stream import leer_csv_por_bloques
 from app.models.user import User as UserModel
 
 router = APIRouter()
@@ -33,17 +34,24 @@ def read_facturas_endpoint(
     end_date: Optional[date] = Query(None),
     vendedor_id: Optional[int] = Query(None),
     cliente_id: Optional[int] = Query(None),
+    after: Optional[str] = Query(None, description="Cursor 'next_cursor' de la página anterior. Si se envía, se ignora 'skip'."),
+    include_total: bool = Query(True, description="Si es False no se recalcula el total (útil al paginar por cursor)."),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtener lista de facturas con paginación y búsqueda.
+    Admite paginación por OFFSET (skip) o por cursor (after).
     """
-    items, total_count = crud.crud_factura.get_facturas(
-        db, skip=skip, limit=limit,
-        start_date=start_date, end_date=end_date,
-        vendedor_id=vendedor_id, cliente_id=cliente_id
-    )
-    return {"items": items, "total_count": total_count}
+    try:
+        items, total_count, next_cursor = crud.crud_factura.get_facturas(
+            db, skip=skip, limit=limit,
+            start_date=start_date, end_date=end_date,
+            vendedor_id=vendedor_id, cliente_id=cliente_id,
+            after=after, include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return {"items": items, "total_count": total_count, "next_cursor": next_cursor}
 
 # --- FIX: Corregido el nombre del parámetro en la ruta de {cliente_id} a {factura_id} ---
 @router.get("/{factura_id}", response_model=schemas.factura.Factura)
@@ -95,8 +103,9 @@ def delete_factura_endpoint(
 
 
 # --- FIX: Endpoint de carga CSV completo y corregido ---
-@router.post("/upload-csv/", response_model=List[schemas.factura.Factura])
-async def upload_facturas_from_csv(
+# def y no async: FastAPI la ejecuta en su threadpool y la importación (síncrona) no bloquea el event loop
+@router.post("/upload-csv/", response_model=schemas.importacion.ResultadoImportacion)
+def upload_facturas_from_csv(
     *,
     db: Session = Depends(deps.get_db),
     file: UploadFile = File(...),
@@ -104,42 +113,57 @@ async def upload_facturas_from_csv(
 ):
     """
     Cargar facturas desde un archivo CSV.
-    El CSV debe tener las columnas: numero_orden, honorarios_generados, gastos_generados, fecha_emision, vendedor_rut, cliente_rut, numero_caso (opcional)
+    El CSV debe tener las columnas: numero_orden, honorarios_generados, gastos_generados, fecha_emision (o fecha_venta), vendedor_rut, cliente_rut, numero_caso (opcional)
+    La carga es todo o nada: si alguna fila tiene errores no se inserta ninguna factura.
     """
     if not file.filename.endswith(".csv"):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe ser un CSV.")
 
     try:
-        # Se usa 'async def' y 'await' para la correcta lectura del archivo
-        contents = await file.read()
-        decoded_content = contents.decode('utf-8')
-        csv_file = io.StringIO(decoded_content)
-        
-        # Usamos DictReader para leer el CSV por filas como diccionarios
-        csv_reader = csv.DictReader(csv_file)
-        
-        if not csv_reader.fieldnames:
-            raise HTTPException(status_code=400, detail="CSV vacío o sin cabeceras.")
+        # Se lee el archivo temporal del upload por bloques, sin cargarlo completo en memoria
+        csv_columns, bloques = leer_csv_por_bloques(file.file)
 
         # Verificamos que las columnas requeridas existan
-        required_columns = {"numero_orden", "honorarios_generados", "gastos_generados", "fecha_emision", "vendedor_rut", "cliente_rut"}
-        csv_columns = {col.lower() for col in csv_reader.fieldnames}
-        if not required_columns.issubset(csv_columns):
-            missing = required_columns - csv_columns
-            raise HTTPException(status_code=400, detail=f"Faltan columnas requeridas en el CSV: {', '.join(missing)}")
+        required_columns = {"numero_orden", "honorarios_generados", "gastos_generados", "vendedor_rut", "cliente_rut"}
+        missing = required_columns - set(csv_columns)
+        if not {"fecha_emision", "fecha_venta"} & set(csv_columns):
+            missing.add("fecha_emision")
+        if missing:
+            raise HTTPException(status_code=400, detail=f"Faltan columnas requeridas en el CSV: {', '.join(sorted(missing))}")
 
-        facturas_creadas, errores = crud.crud_factura.process_facturas_csv(db=db, csv_reader=csv_reader)
+        resultado = crud.crud_factura.process_facturas_csv(db=db, bloques=bloques)
         
-        if errores:
+        if resultado.errors:
              # Si hubo errores, se informa al usuario con detalles
              raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail={"message": "Se encontraron errores en algunas filas del CSV.", "errors": errores, "created_count": len(facturas_creadas)}
+                detail={"message": "Se encontraron errores en algunas filas del CSV.", **resultado.model_dump()}
             )
 
-        return facturas_creadas
+        return resultado
 
+    except HTTPException:
+        raise
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="CSV vacío o sin cabeceras.")
     except Exception as e:
         # Imprimimos el error en la terminal para depuración
         print(f"ERROR CRÍTICO AL PROCESAR CSV: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al procesar el archivo: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error al procesar el archivo: {str(e)}")
+
+@router.post("/upload-csv/background", response_model=schemas.import_job.ImportJob, status_code=status.HTTP_202_ACCEPTED)
+def upload_facturas_csv_background(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Encola la carga del CSV en segundo plano y retorna el trabajo de inmediato.
+    El avance se consulta en GET /jobs/{job_id}.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe ser un CSV.")
+    return import_jobs.encolar_importacion(
+        db, tipo="facturas", archivo=file.file, filename=file.filename, created_by_id=current_user.id
+    )
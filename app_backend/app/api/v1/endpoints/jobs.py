@@ -0,0 +1,28 @@
+# app/api/v1/endpoints/jobs.py
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from typing import Any
+
+from app import crud, schemas
+from app.api import deps
+from app.core import import_jobs
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+@router.get("/{job_id}", response_model=schemas.import_job.ImportJob)
+def read_import_job_endpoint(
+    *,
+    db: Session = Depends(deps.get_db),
+    job_id: str,
+    current_user: UserModel = Depends(deps.get_current_user)
+) -> Any:
+    """
+    Estado de una carga masiva en segundo plano: filas procesadas, errores y throughput.
+    """
+    job = crud.crud_import_job.get_import_job(db, job_id=job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo no encontrado")
+    if job.created_by_id != current_user.id and not crud.is_superuser(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="The user doesn't have enough privileges")
+    return import_jobs.aplicar_progreso_en_vivo(job)
@@ -0,0 +1,42 @@
+# app/api/v1/endpoints/sistema.py
+import os
+from fastapi import APIRouter, Depends
+from typing import Any
+
+from app import schemas
+from app.api import deps
+from app.core.config import settings
+from app.crud import crud_user
+from app.db.pool import estado_pool
+from app.db.session import engine
+from app.db.session_async import async_engine_actual
+from app.models.user import User as UserModel
+
+router = APIRouter()
+
+@router.get("/pool", response_model=schemas.sistema.EstadoPools)
+def read_estado_pool_endpoint(
+    current_user: UserModel = Depends(deps.get_current_admin_user)
+) -> Any:
+    """
+    Estado y estadísticas del pool de conexiones de este worker (sync y, si se usó, async).
+    """
+    async_engine = async_engine_actual()
+    return {
+        "pid": os.getpid(),
+        "sync": estado_pool(engine.pool),
+        "asincrono": estado_pool(async_engine.pool) if async_engine else None,
+    }
+
+@router.get("/cache", response_model=schemas.sistema.EstadoCache)
+def read_estado_cache_endpoint(
+    current_user: UserModel = Depends(deps.get_current_admin_user)
+) -> Any:
+    """
+    Estadísticas de la caché de usuarios autenticados de este worker (hit rate incluido).
+    """
+    return {
+        "pid": os.getpid(),
+        "habilitada": settings.USER_CACHE_ENABLED,
+        **crud_user.cache_usuarios.estadisticas(),
+    }
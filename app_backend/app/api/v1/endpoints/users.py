@@ -76,6 +76,7 @@ def change_password_me(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    crud.crud_user.invalidar_cache_usuario(current_user.username)
     return current_user
 
 @router.get("/", response_model=List[schemas.User], dependencies=[Depends(deps.get_current_admin_user)])
@@ -194,6 +195,7 @@ def enable_two_factor_auth(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    crud.crud_user.invalidar_cache_usuario(current_user.username)
     return current_user
 
 @router.post("/me/2fa/disable", response_model=schemas.User)
@@ -213,4 +215,5 @@ def disable_two_factor_auth(
     db.add(current_user)
     db.commit()
     db.refresh(current_user)
+    crud.crud_user.invalidar_cache_usuario(current_user.username)
     return current_user
@@ -1,12 +1,15 @@
 # app/api/v1/endpoints/vendedores.py
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query, UploadFile, File
 from sqlalchemy.orm import Session
-from typing import List, Any, Optional
+from typing import List, Any, Optional, Literal
 import pandas as pd
-import io
 
 from app import crud, schemas
 from app.api import deps
+from app.api.etag import cabeceras_etag, coincide_etag, etag_de_version, no_modificado
+from app.core import import_jobs
+from app.core.csv_stream import leer_csv_por_bloques
+from app.models.vendedor import Vendedor
 from app.models.user import User as UserModel
 
 router = APIRouter()
@@ -37,15 +40,23 @@ def read_clientes_asignados_por_vendedor(
 # --- NUEVA RUTA PARA LISTA SIMPLIFICADA ---
 @router.get("/simple", response_model=List[schemas.vendedor.VendedorSimple])
 def read_vendedores_simple(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
     """
     Obtiene una lista simplificada de todos los vendedores (id, nombre_completo).
     Ideal para usar en dropdowns en el frontend sin paginación.
+    Responde 304 si el If-None-Match coincide con la versión actual de la tabla vendedores.
     """
-    vendedores, _ = crud.crud_vendedor.get_vendedores(db, skip=0, limit=10000) # Limite alto para traer todos
-    return vendedores
+    # La versión se lee antes que los datos: si cambian entre medio, el ETag queda viejo y el
+    # cliente vuelve a pedir la lista (nunca se guarda una lista vieja con un ETag nuevo)
+    etag = etag_de_version("vendedores-simple", crud.crud_tabla_version.get_version(db, Vendedor.__tablename__))
+    if coincide_etag(request, etag):
+        return no_modificado(etag)
+    response.headers.update(cabeceras_etag(etag))
+    return crud.crud_vendedor.get_vendedores_simple(db)
 
 @router.post("/", response_model=schemas.vendedor.Vendedor, status_code=status.HTTP_201_CREATED)
 def create_vendedor_endpoint(
@@ -71,10 +82,21 @@ def read_vendedores_endpoint(
     # Aumentar el límite para permitir que el frontend cargue todos los vendedores para un dropdown.
     limit: int = Query(100, ge=1, le=2000), # Límite aumentado a 2000
     search: Optional[str] = Query(None),
+    search_mode: Literal["contains", "trigram"] = Query(
+        "contains", description="'contains': coincidencia parcial exacta. 'trigram': búsqueda indexada por trigramas, ordenada por relevancia."
+    ),
+    after: Optional[str] = Query(None, description="Cursor 'next_cursor' de la página anterior. Si se envía, se ignora 'skip'."),
+    include_total: bool = Query(True, description="Si es False no se recalcula el total (útil al paginar por cursor)."),
     current_user: UserModel = Depends(deps.get_current_user)
 ) -> Any:
-    vendedores_items, total_count = crud.crud_vendedor.get_vendedores(db, skip=skip, limit=limit, search=search)
-    return {"items": vendedores_items, "total_count": total_count}
+    try:
+        vendedores_items, total_count, next_cursor = crud.crud_vendedor.get_vendedores(
+            db, skip=skip, limit=limit, search=search, after=after, include_total=include_total,
+            search_mode=search_mode
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": vendedores_items, "total_count": total_count, "next_cursor": next_cursor}
 
 @router.get("/{vendedor_id}", response_model=schemas.vendedor.Vendedor)
 def read_vendedor_by_id_endpoint(
@@ -165,7 +187,7 @@ def remove_cliente_de_vendedor_endpoint(
     return deleted_asignacion
 
 # --- NUEVO ENDPOINT PARA CARGA CSV ---
-@router.post("/upload-csv/", response_model=List[schemas.vendedor.Vendedor])
+@router.post("/upload-csv/", response_model=schemas.importacion.ResultadoImportacion)
 def upload_vendedores_from_csv(
     *,
     db: Session = Depends(deps.get_db),
@@ -175,31 +197,51 @@ def upload_vendedores_from_csv(
     """
     Crea o actualiza vendedores desde un archivo CSV.
     Columnas requeridas: 'nombre_completo', 'rut', 'sueldo_base'.
+    El archivo se procesa por bloques, sin cargarlo completo en memoria.
     """
     if not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="El archivo debe ser un CSV.")
 
     try:
-        content = file.file.read()
-        buffer = io.BytesIO(content)
-        df = pd.read_csv(buffer)
+        csv_columns, bloques = leer_csv_por_bloques(file.file)
 
         required_columns = {'nombre_completo', 'rut', 'sueldo_base'}
-        if not required_columns.issubset(df.columns):
+        if not required_columns.issubset(csv_columns):
             raise HTTPException(
                 status_code=400,
                 detail=f"El CSV debe contener las columnas: {', '.join(required_columns)}"
             )
 
-        vendedores_procesados, errores = crud.crud_vendedor.process_vendedores_csv(db=db, df=df)
+        resultado = crud.crud_vendedor.process_vendedores_csv(db=db, bloques=bloques)
         
-        if errores:
+        if resultado.errors:
              raise HTTPException(
                 status_code=422,
-                detail={"message": "Se encontraron errores en el CSV.", "errors": errores}
+                detail={"message": "Se encontraron errores en el CSV.", **resultado.model_dump()}
             )
             
-        return vendedores_procesados
+        return resultado
 
+    except HTTPException:
+        raise
+    except pd.errors.EmptyDataError:
+        raise HTTPException(status_code=400, detail="CSV vacío o sin cabeceras.")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error al procesar el archivo: {str(e)}")
+
+@router.post("/upload-csv/background", response_model=schemas.import_job.ImportJob, status_code=status.HTTP_202_ACCEPTED)
+def upload_vendedores_csv_background(
+    *,
+    db: Session = Depends(deps.get_db),
+    file: UploadFile = File(...),
+    current_user: UserModel = Depends(deps.get_current_admin_user)
+) -> Any:
+    """
+    Encola la carga del CSV en segundo plano y retorna el trabajo de inmediato.
+    El avance se consulta en GET /jobs/{job_id}.
+    """
+    if not file.filename.endswith(".csv"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="El archivo debe ser un CSV.")
+    return import_jobs.encolar_importacion(
+        db, tipo="vendedores", archivo=file.file, filename=file.filename, created_by_id=current_user.id
+    )
@@ -0,0 +1,32 @@
+# app/core/busqueda.py
+import re
+import unicodedata
+from typing import List, Optional, Set
+
+# Largo de los n-gramas del índice de búsqueda (trigramas)
+LARGO_NGRAMA = 3
+
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+def normalizar_texto(texto: Optional[str]) -> str:
+    """Minúsculas, sin tildes y con cualquier signo convertido en espacio ('Peñalolén S.A.' -> 'penalolen s a')."""
+    if not texto:
+        return ""
+    sin_tildes = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return _NO_ALFANUMERICO.sub(" ", sin_tildes.lower()).strip()
+
+def trigramas(*textos: Optional[str]) -> Set[str]:
+    """
+    Trigramas de cada palabra de los textos. Las palabras de menos de 3 caracteres no aportan
+    trigramas (una búsqueda solo con palabras cortas no puede usar el índice).
+    """
+    resultado: Set[str] = set()
+    for texto in textos:
+        for palabra in normalizar_texto(texto).split():
+            for i in range(len(palabra) - LARGO_NGRAMA + 1):
+                resultado.add(palabra[i:i + LARGO_NGRAMA])
+    return resultado
+
+def trigramas_consulta(termino: str) -> List[str]:
+    """Trigramas de un término de búsqueda, ordenados (vacío si es demasiado corto)."""
+    return sorted(trigramas(termino))
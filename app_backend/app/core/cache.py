@@ -0,0 +1,71 @@
+# app/core/cache.py
+"""
+Caché en memoria del proceso con TTL y desalojo LRU. Cada worker de uvicorn tiene la
+suya: una invalidación solo afecta al worker que la hace; en los demás la entrada
+caduca por TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+class CacheTTL:
+    def __init__(self, max_entradas: int, ttl_segundos: float) -> None:
+        self.max_entradas = max_entradas
+        self.ttl_segundos = ttl_segundos
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict() # clave -> (expira_en, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expiradas = 0
+        self.desalojadas = 0
+        self.invalidaciones = 0
+
+    def get(self, clave: Hashable) -> Optional[Any]:
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return None
+            expira_en, valor = entrada
+            if expira_en <= time.monotonic():
+                del self._datos[clave]
+                self.expiradas += 1
+                self.misses += 1
+                return None
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return valor
+
+    def set(self, clave: Hashable, valor: Any) -> None:
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl_segundos, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.max_entradas:
+                self._datos.popitem(last=False)
+                self.desalojadas += 1
+
+    def invalidar(self, *claves: Hashable) -> None:
+        with self._lock:
+            for clave in claves:
+                if self._datos.pop(clave, None) is not None:
+                    self.invalidaciones += 1
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._lock:
+            consultas = self.hits + self.misses
+            return {
+                "entradas": len(self._datos),
+                "max_entradas": self.max_entradas,
+                "ttl_segundos": self.ttl_segundos,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / consultas, 4) if consultas else None,
+                "expiradas": self.expiradas,
+                "desalojadas": self.desalojadas,
+                "invalidaciones": self.invalidaciones,
+            }
@@ -1,15 +1,238 @@
 # app/core/calculations.py
 from sqlalchemy.orm import Session, joinedload # Asegúrate de que joinedload esté importado
+from sqlalchemy import func, case, and_, or_
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+from types import SimpleNamespace
 from datetime import date
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Tuple
 
-from app.models.vendedor import Vendedor
+from app.models.vendedor import Vendedor, VendedorClientePorcentaje
 from app.models.factura import Factura
 # Importa el modelo Cliente si no está ya importado
 from app.models.cliente import Cliente 
+from app.models.bono_ledger import BonoLedger
 from app.schemas.bono import BonoVendedorResult
+from app.core.config import settings
+from app.crud import crud_bono_ledger
+from app.db.session import SessionLocal
+
+MODO_AGREGADO = "agregado"
+MODO_POR_VENDEDOR = "por_vendedor"
+MODO_PARALELO = "paralelo"
+
+# Tramos de vendedores del modo paralelo. Las consultas pasan la mayor parte del tiempo en la
+# base (el driver libera el GIL), así que threads bastan; el pool acota las conexiones que usa
+_executor_bonos = ThreadPoolExecutor(max_workers=settings.BONO_PARALLEL_WORKERS, thread_name_prefix="bonos")
+
+# Tramo de vendedores (id desde, id hasta), ambos incluidos
+Tramo = Tuple[int, int]
 
 def calcular_bonos_por_periodo(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    vendedor_id: Optional[int] = None,
+    modo: str = MODO_AGREGADO,
+    incluir_detalle: bool = True
+) -> List[BonoVendedorResult]:
+    """
+    Calcula el bono de cada vendedor con facturas en el período.
+
+    - modo "agregado": una sola consulta SUM/GROUP BY para todos los vendedores
+      y, solo si se pide, una segunda consulta con el detalle por factura.
+      Los meses cerrados se leen del ledger precalculado (bono_ledger) y solo
+      el resto del rango se agrega desde facturas.
+    - modo "por_vendedor": motor original, una consulta de facturas por vendedor.
+    - modo "paralelo": el modo agregado por tramos de vendedores, en paralelo, cada tramo
+      con su propia sesión; pensado para los cierres de uno o más años.
+    """
+    if modo == MODO_POR_VENDEDOR:
+        return _calcular_bonos_por_vendedor(db, start_date, end_date, vendedor_id)
+    if modo == MODO_PARALELO and not vendedor_id:
+        return _calcular_bonos_paralelo(db, start_date, end_date, incluir_detalle)
+    return _calcular_bonos_agregado(db, start_date, end_date, vendedor_id, incluir_detalle)
+
+def _filtrar_periodo(query, start_date: date, end_date: date, vendedor_id: Optional[int], tramo: Optional[Tramo] = None):
+    query = query.filter(
+        Factura.fecha_emision >= start_date,
+        Factura.fecha_emision <= end_date
+    )
+    if vendedor_id:
+        query = query.filter(Factura.vendedor_id == vendedor_id)
+    if tramo:
+        query = query.filter(Factura.vendedor_id.between(*tramo))
+    return query
+
+def _tramos_vendedores(db: Session, particiones: int) -> List[Tramo]:
+    """Reparte los ids de vendedor en `particiones` rangos contiguos con la misma cantidad de vendedores."""
+    ids = [v_id for (v_id,) in db.query(Vendedor.id).order_by(Vendedor.id)]
+    particiones = min(particiones, len(ids))
+    return [
+        (ids[i * len(ids) // particiones], ids[(i + 1) * len(ids) // particiones - 1])
+        for i in range(particiones)
+    ]
+
+def _calcular_bonos_paralelo(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    incluir_detalle: bool
+) -> List[BonoVendedorResult]:
+    """
+    Cada tramo es el modo agregado filtrado a un rango de vendedores: los totales de un vendedor
+    salen de las mismas filas y en el mismo orden que en una sola consulta, así que el resultado
+    es idéntico al del modo agregado. Se usan más tramos que threads para que la actividad
+    despareja entre vendedores no deje threads ociosos. Los tramos llegan ordenados por id, igual
+    que el resultado en serie.
+    """
+    # Los meses del ledger que falten se materializan antes, en esta sesión: así los tramos solo
+    # leen el ledger y no compiten por materializar el mismo periodo
+    if settings.BONO_LEDGER_ENABLED:
+        crud_bono_ledger.rango_materializado(db, start_date, end_date)
+    tramos = _tramos_vendedores(db, settings.BONO_PARALLEL_WORKERS * settings.BONO_PARALLEL_PARTITIONS_PER_WORKER)
+
+    def calcular_tramo(tramo: Tramo) -> List[BonoVendedorResult]:
+        db_tramo = SessionLocal()
+        try:
+            return _calcular_bonos_agregado(db_tramo, start_date, end_date, None, incluir_detalle, tramo=tramo)
+        finally:
+            db_tramo.close()
+
+    # copy_context: las consultas de los tramos cuentan en la medición de la petición (app.core.perfil)
+    futuros = [_executor_bonos.submit(contextvars.copy_context().run, calcular_tramo, tramo) for tramo in tramos]
+    return [resultado for futuro in futuros for resultado in futuro.result()]
+
+def _calcular_bonos_agregado(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    vendedor_id: Optional[int],
+    incluir_detalle: bool,
+    tramo: Optional[Tramo] = None
+) -> List[BonoVendedorResult]:
+    honorarios = func.coalesce(Factura.honorarios_generados, 0.0)
+    gastos = func.coalesce(Factura.gastos_generados, 0.0)
+    neto = honorarios - gastos
+    # Equivalente portable de GREATEST(neto, 0): SQLite no tiene GREATEST.
+    neto_positivo = case((neto > 0, neto), else_=0.0)
+    porcentaje = func.coalesce(VendedorClientePorcentaje.porcentaje_bono, 0.0)
+    # El porcentaje se obtiene por (vendedor_id, cliente_id) de la propia factura
+    join_porcentaje = and_(
+        VendedorClientePorcentaje.vendedor_id == Factura.vendedor_id,
+        VendedorClientePorcentaje.cliente_id == Factura.cliente_id
+    )
+
+    # Meses cerrados completos dentro del rango: se leen del ledger
+    rango_ledger = None
+    if settings.BONO_LEDGER_ENABLED:
+        rango_ledger = crud_bono_ledger.rango_materializado(db, start_date, end_date)
+
+    query_totales = db.query(
+        Vendedor.id.label("vendedor_id"),
+        Vendedor.nombre_completo,
+        Vendedor.rut,
+        func.sum(honorarios).label("total_honorarios"),
+        func.sum(gastos).label("total_gastos"),
+        func.sum(neto_positivo * porcentaje).label("bono_calculado")
+    ).select_from(Factura).join(
+        Vendedor, Factura.vendedor_id == Vendedor.id
+    ).outerjoin(VendedorClientePorcentaje, join_porcentaje)
+
+    query_totales = _filtrar_periodo(query_totales, start_date, end_date, vendedor_id, tramo)
+    if rango_ledger:
+        desde, hasta, _ = rango_ledger
+        query_totales = query_totales.filter(or_(Factura.fecha_emision < desde, Factura.fecha_emision >= hasta))
+    totales = query_totales.group_by(
+        Vendedor.id, Vendedor.nombre_completo, Vendedor.rut
+    ).order_by(Vendedor.id).all()
+
+    if rango_ledger:
+        totales = _sumar_totales_ledger(db, totales, rango_ledger[2], vendedor_id, tramo)
+
+    if not totales:
+        return []
+
+    detalle_por_vendedor: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    if incluir_detalle:
+        # El detalle sale calculado de la consulta, con las claves que devuelve la API: cada fila
+        # pasa a dict sin leer columnas por atributo (vendedor_id, la primera, solo agrupa)
+        query_detalle = db.query(
+            Factura.vendedor_id,
+            Factura.id.label("factura_id"),
+            Factura.numero_orden,
+            func.coalesce(Cliente.razon_social, "N/A").label("razon_social_cliente"),
+            honorarios.label("honorarios"),
+            gastos.label("gastos"),
+            neto.label("neto"),
+            porcentaje.label("porcentaje_aplicado"),
+            (neto_positivo * porcentaje).label("bono_generado")
+        ).select_from(Factura).outerjoin(
+            Cliente, Factura.cliente_id == Cliente.id
+        ).outerjoin(VendedorClientePorcentaje, join_porcentaje)
+
+        query_detalle = _filtrar_periodo(query_detalle, start_date, end_date, vendedor_id, tramo)
+        claves = None
+        for fila in query_detalle.order_by(Factura.vendedor_id, Factura.id):
+            if claves is None:
+                claves = fila._fields[1:]
+            detalle_por_vendedor[fila[0]].append(dict(zip(claves, fila[1:])))
+
+    return [
+        BonoVendedorResult(
+            vendedor_id=fila.vendedor_id,
+            nombre_vendedor=fila.nombre_completo,
+            rut_vendedor=fila.rut,
+            total_honorarios=fila.total_honorarios or 0.0,
+            total_gastos=fila.total_gastos or 0.0,
+            total_neto=(fila.total_honorarios or 0.0) - (fila.total_gastos or 0.0),
+            bono_calculado=fila.bono_calculado or 0.0,
+            detalle_facturas=detalle_por_vendedor.get(fila.vendedor_id, [])
+        )
+        for fila in totales
+    ]
+
+def _sumar_totales_ledger(
+    db: Session,
+    totales: List[Any],
+    periodos: List[int],
+    vendedor_id: Optional[int],
+    tramo: Optional[Tramo] = None
+) -> List[SimpleNamespace]:
+    """Suma a los totales leídos de facturas los de los periodos del ledger (ordenado por vendedor)."""
+    query_ledger = db.query(
+        Vendedor.id.label("vendedor_id"),
+        Vendedor.nombre_completo,
+        Vendedor.rut,
+        func.sum(BonoLedger.honorarios).label("total_honorarios"),
+        func.sum(BonoLedger.gastos).label("total_gastos"),
+        func.sum(BonoLedger.bono).label("bono_calculado")
+    ).select_from(BonoLedger).join(
+        Vendedor, BonoLedger.vendedor_id == Vendedor.id
+    ).filter(BonoLedger.periodo.in_(periodos))
+    if vendedor_id:
+        query_ledger = query_ledger.filter(BonoLedger.vendedor_id == vendedor_id)
+    if tramo:
+        query_ledger = query_ledger.filter(BonoLedger.vendedor_id.between(*tramo))
+    filas_ledger = query_ledger.group_by(Vendedor.id, Vendedor.nombre_completo, Vendedor.rut).all()
+
+    combinados: Dict[int, Dict[str, Any]] = {}
+    for fila in list(totales) + filas_ledger:
+        actual = combinados.setdefault(fila.vendedor_id, {
+            "vendedor_id": fila.vendedor_id,
+            "nombre_completo": fila.nombre_completo,
+            "rut": fila.rut,
+            "total_honorarios": 0.0,
+            "total_gastos": 0.0,
+            "bono_calculado": 0.0,
+        })
+        actual["total_honorarios"] += fila.total_honorarios or 0.0
+        actual["total_gastos"] += fila.total_gastos or 0.0
+        actual["bono_calculado"] += fila.bono_calculado or 0.0
+    return [SimpleNamespace(**combinados[v_id]) for v_id in sorted(combinados)]
+
+def _calcular_bonos_por_vendedor(
     db: Session,
     start_date: date,
     end_date: date,
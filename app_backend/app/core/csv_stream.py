@@ -0,0 +1,33 @@
+# app/core/csv_stream.py
+from itertools import chain
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+
+def leer_csv_por_bloques(
+    archivo: BinaryIO, chunksize: Optional[int] = None
+) -> Tuple[List[str], Iterator[pd.DataFrame]]:
+    """
+    Lee un CSV de forma incremental desde un archivo binario (p. ej. UploadFile.file).
+    Devuelve las columnas (normalizadas a minúsculas) y un iterador de DataFrames de
+    a lo más `chunksize` filas, de modo que la memoria depende del bloque y no del archivo.
+    Todas las columnas se leen como texto; la conversión de tipos la hace cada importador.
+    Lanza pd.errors.EmptyDataError si el archivo está vacío.
+    """
+    lector = pd.read_csv(
+        archivo,
+        dtype=str,
+        encoding="utf-8-sig",
+        chunksize=chunksize or settings.CSV_CHUNK_SIZE,
+    )
+    primer_bloque = next(lector)
+    columnas = [str(col).strip().lower() for col in primer_bloque.columns]
+
+    def _bloques() -> Iterator[pd.DataFrame]:
+        for bloque in chain([primer_bloque], lector):
+            bloque.columns = columnas
+            yield bloque
+
+    return columnas, _bloques()
@@ -0,0 +1,113 @@
+# app/core/exportacion.py
+"""
+Escritura incremental del reporte de facturación en CSV o XLSX para StreamingResponse.
+
+Reciben un iterador de filas (crud_reporte.iterar_reporte_facturacion) y producen bloques de
+bytes; nunca tienen el reporte completo en memoria. El XLSX necesita el paquete opcional
+xlsxwriter (se importa al exportar).
+"""
+import csv
+import importlib.util
+import io
+import tempfile
+from typing import Any, Iterable, Iterator, Optional
+
+from app.core.config import settings
+
+MEDIA_TYPE_CSV = "text/csv; charset=utf-8"
+MEDIA_TYPE_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# (encabezado, atributo de la fila), en el orden del archivo
+COLUMNAS_REPORTE = (
+    ("Fecha", "fecha_emision"),
+    ("N° Orden", "numero_orden"),
+    ("N° Caso", "numero_caso"),
+    ("Vendedor", "vendedor_nombre"),
+    ("RUT Vendedor", "vendedor_rut"),
+    ("Cliente", "cliente_razon_social"),
+    ("RUT Cliente", "cliente_rut"),
+    ("Honorarios", "honorarios_generados"),
+    ("Gastos", "gastos_generados"),
+    ("% Bono Aplicado", "porcentaje_bono_aplicado"),
+    ("Bono por Factura", "bono_calculado"),
+)
+
+# Filas de una hoja de Excel, encabezado incluido
+MAX_FILAS_HOJA_XLSX = 1_048_576
+
+# Tamaño de los bloques en que se envía el XLSX ya escrito
+_BLOQUE_ARCHIVO = 64 * 1024
+
+def xlsx_disponible() -> bool:
+    return importlib.util.find_spec("xlsxwriter") is not None
+
+def _valores(fila: Any) -> list:
+    return [getattr(fila, atributo) for _, atributo in COLUMNAS_REPORTE]
+
+def csv_por_bloques(filas: Iterable[Any], filas_por_bloque: Optional[int] = None) -> Iterator[bytes]:
+    """
+    CSV en UTF-8 con BOM (Excel lo abre con tildes correctas, y las cargas lo leen con utf-8-sig).
+    Se entrega un bloque cada `filas_por_bloque` filas; el primero lleva solo el encabezado,
+    para que la descarga empiece antes de la primera consulta.
+    """
+    filas_por_bloque = filas_por_bloque or settings.EXPORT_CHUNK_SIZE
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow([encabezado for encabezado, _ in COLUMNAS_REPORTE])
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+
+    pendientes = 0
+    buffer.seek(0)
+    buffer.truncate()
+    for fila in filas:
+        escritor.writerow(_valores(fila))
+        pendientes += 1
+        if pendientes == filas_por_bloque:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pendientes = 0
+    if pendientes:
+        yield buffer.getvalue().encode("utf-8")
+
+def xlsx_por_bloques(filas: Iterable[Any]) -> Iterator[bytes]:
+    """
+    XLSX escrito con xlsxwriter en modo constant_memory (cada fila se baja a un temporal al
+    pasar a la siguiente) sobre un archivo temporal en disco, que luego se envía por bloques.
+    Un .xlsx es un zip con el índice al final, así que el primer byte sale cuando termina de
+    escribirse; la memoria sigue sin depender de la cantidad de filas. Sobre el límite de
+    filas de Excel se continúa en otra hoja.
+    Lanza ImportError si xlsxwriter no está instalado (ver xlsx_disponible).
+    """
+    import xlsxwriter
+
+    with tempfile.TemporaryFile() as archivo:
+        libro = xlsxwriter.Workbook(archivo, {"constant_memory": True, "default_date_format": "yyyy-mm-dd"})
+        formato_encabezado = libro.add_format({"bold": True})
+        formato_monto = libro.add_format({"num_format": "#,##0"})
+        formato_porcentaje = libro.add_format({"num_format": "0.00"})
+        formatos = {"honorarios_generados": formato_monto, "gastos_generados": formato_monto,
+                    "bono_calculado": formato_monto, "porcentaje_bono_aplicado": formato_porcentaje}
+
+        def nueva_hoja(numero: int):
+            hoja = libro.add_worksheet("Facturación" if numero == 1 else f"Facturación ({numero})")
+            hoja.write_row(0, 0, [encabezado for encabezado, _ in COLUMNAS_REPORTE], formato_encabezado)
+            for columna, (_, atributo) in enumerate(COLUMNAS_REPORTE):
+                hoja.set_column(columna, columna, 14, formatos.get(atributo))
+            return hoja
+
+        numero_hoja = 1
+        hoja = nueva_hoja(numero_hoja)
+        fila_hoja = 1
+        for fila in filas:
+            if fila_hoja == MAX_FILAS_HOJA_XLSX:
+                numero_hoja += 1
+                hoja = nueva_hoja(numero_hoja)
+                fila_hoja = 1
+            hoja.write_row(fila_hoja, 0, _valores(fila))
+            fila_hoja += 1
+        libro.close()
+
+        archivo.seek(0)
+        while bloque := archivo.read(_BLOQUE_ARCHIVO):
+            yield bloque
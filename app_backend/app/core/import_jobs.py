@@ -0,0 +1,272 @@
+# app/core/import_jobs.py
+"""
+Ejecución en segundo plano de las cargas masivas de CSV.
+
+El upload se copia a un archivo temporal en disco, se registra un ImportJob y el
+trabajo se ejecuta en un pool de threads local (sin broker externo). El progreso
+se guarda en la tabla import_jobs al terminar cada bloque y se consulta en /jobs/{id}.
+
+Como el pool vive en el proceso, un reinicio o deploy corta los trabajos en curso: cada
+trabajo registra el proceso que lo ejecuta (ImportJob.worker) y, al arrancar, la app marca
+como fallidos los de procesos que ya terminaron y borra sus archivos temporales
+(recuperar_trabajos_interrumpidos, llamado desde app/main.py).
+"""
+import os
+import shutil
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Dict, Optional, Set, Tuple
+from uuid import uuid4
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.csv_stream import leer_csv_por_bloques
+from app.crud import crud_cliente, crud_factura, crud_import_job, crud_vendedor
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.schemas.importacion import ResultadoImportacion
+
+IMPORTADORES: Dict[str, Callable[..., ResultadoImportacion]] = {
+    "facturas": crud_factura.process_facturas_csv,
+    "clientes": crud_cliente.process_clientes_csv,
+    "vendedores": crud_vendedor.process_vendedores_csv,
+}
+
+COLUMNAS_REQUERIDAS: Dict[str, Set[str]] = {
+    "facturas": {"numero_orden", "honorarios_generados", "gastos_generados", "vendedor_rut", "cliente_rut"},
+    "clientes": {"razon_social", "rut"},
+    "vendedores": {"nombre_completo", "rut", "sueldo_base"},
+}
+
+_executor = ThreadPoolExecutor(max_workers=settings.IMPORT_JOB_WORKERS, thread_name_prefix="import-job")
+
+# host:pid:arranque. El sufijo distingue a este proceso de uno anterior con el mismo pid
+# (en un contenedor reiniciado la app suele volver a tener el mismo)
+IDENTIFICADOR_PROCESO = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+_DIRECTORIO_TEMPORAL = os.path.join(tempfile.gettempdir(), "import_jobs")
+
+def ruta_temporal(job_id: str) -> str:
+    return os.path.join(_DIRECTORIO_TEMPORAL, f"{job_id}.csv")
+
+def _eliminar_archivo(ruta: str) -> None:
+    try:
+        os.remove(ruta)
+    except FileNotFoundError:
+        pass
+
+# Último progreso de los trabajos que corren en este proceso: job_id -> (filas_procesadas, resultado parcial)
+_progreso_en_vivo: Dict[str, Tuple[int, ResultadoImportacion]] = {}
+_progreso_lock = threading.Lock()
+
+def aplicar_progreso_en_vivo(db_job: ImportJob) -> ImportJob:
+    """
+    Completa un ImportJob leído de la base con el progreso en memoria, si el trabajo
+    se está ejecutando en este proceso (sin escribir en la sesión).
+    """
+    with _progreso_lock:
+        progreso = _progreso_en_vivo.get(db_job.id)
+    if progreso and db_job.status == ImportJobStatus.RUNNING:
+        filas_procesadas, resultado = progreso
+        if filas_procesadas > (db_job.rows_processed or 0):
+            datos = {c.name: getattr(db_job, c.name) for c in ImportJob.__table__.columns}
+            db_job = ImportJob(**datos)
+            db_job.rows_processed = filas_procesadas
+            db_job.created_count = resultado.created_count
+            db_job.updated_count = resultado.updated_count
+            db_job.skipped_count = resultado.skipped_count
+            db_job.error_count = len(resultado.errors)
+            db_job.errors = [e.model_dump() for e in resultado.errors[:crud_import_job.MAX_ERRORES_GUARDADOS]]
+    return db_job
+
+def encolar_importacion(
+    db: Session, *, tipo: str, archivo: BinaryIO, filename: Optional[str], created_by_id: Optional[int]
+) -> ImportJob:
+    """
+    Copia el archivo subido a disco (el UploadFile se cierra al terminar la request),
+    crea el registro del trabajo y lo envía al pool. Retorna de inmediato.
+    """
+    # El registro va primero: así todo archivo temporal tiene un trabajo que dice quién lo usa
+    db_job = crud_import_job.create_import_job(
+        db, tipo=tipo, filename=filename, created_by_id=created_by_id, worker=IDENTIFICADOR_PROCESO
+    )
+    ruta = ruta_temporal(db_job.id)
+    try:
+        os.makedirs(_DIRECTORIO_TEMPORAL, exist_ok=True)
+        with open(ruta, "wb") as destino:
+            shutil.copyfileobj(archivo, destino)
+    except OSError as e:
+        _eliminar_archivo(ruta)
+        crud_import_job.finish_import_job(
+            db, db_job=db_job, status=ImportJobStatus.FAILED, message=f"No se pudo guardar el archivo subido: {e}"
+        )
+        raise
+    _executor.submit(_ejecutar_importacion, db_job.id, tipo, ruta)
+    return db_job
+
+def _ejecutar_importacion(job_id: str, tipo: str, ruta: str) -> None:
+    # Sesiones separadas: el progreso se confirma aunque la importación siga en su propia transacción
+    db_import = SessionLocal()
+    db_jobs = SessionLocal()
+    try:
+        db_job = crud_import_job.get_import_job(db_jobs, job_id)
+        crud_import_job.mark_import_job_running(db_jobs, db_job=db_job)
+
+        def on_progress(filas_procesadas: int, resultado: ResultadoImportacion) -> None:
+            with _progreso_lock:
+                _progreso_en_vivo[job_id] = (filas_procesadas, resultado.model_copy())
+            # En SQLite la transacción de la importación retiene el único lock de escritura:
+            # el progreso se expone solo desde memoria hasta que el trabajo termina.
+            if db_jobs.get_bind().dialect.name != "sqlite":
+                crud_import_job.update_import_job_progress(
+                    db_jobs, db_job=db_job, rows_processed=filas_procesadas, resultado=resultado
+                )
+
+        try:
+            with open(ruta, "rb") as archivo:
+                columnas, bloques = leer_csv_por_bloques(archivo)
+                faltantes = COLUMNAS_REQUERIDAS[tipo] - set(columnas)
+                if tipo == "facturas" and not {"fecha_emision", "fecha_venta"} & set(columnas):
+                    faltantes.add("fecha_emision")
+                if faltantes:
+                    crud_import_job.finish_import_job(
+                        db_jobs, db_job=db_job, status=ImportJobStatus.FAILED,
+                        message=f"Faltan columnas requeridas en el CSV: {', '.join(sorted(faltantes))}"
+                    )
+                    return
+                resultado = IMPORTADORES[tipo](db_import, bloques=bloques, on_progress=on_progress)
+        except pd.errors.EmptyDataError:
+            crud_import_job.finish_import_job(
+                db_jobs, db_job=db_job, status=ImportJobStatus.FAILED, message="CSV vacío o sin cabeceras."
+            )
+            return
+
+        with _progreso_lock:
+            filas_procesadas, _ = _progreso_en_vivo.get(job_id, (0, None))
+        crud_import_job.update_import_job_progress(
+            db_jobs, db_job=db_job, rows_processed=filas_procesadas, resultado=resultado
+        )
+        # Facturas y vendedores son todo o nada: con errores no se guardó ninguna fila
+        fallido = tipo in ("facturas", "vendedores") and bool(resultado.errors)
+        crud_import_job.finish_import_job(
+            db_jobs, db_job=db_job,
+            status=ImportJobStatus.FAILED if fallido else ImportJobStatus.COMPLETED,
+            message="Se encontraron errores en el CSV; no se importó ninguna fila." if fallido else None
+        )
+    except Exception as e:
+        print(f"ERROR en trabajo de importación {job_id}: {e}")
+        db_import.rollback()
+        db_jobs.rollback()
+        db_job = crud_import_job.get_import_job(db_jobs, job_id)
+        if db_job:
+            crud_import_job.finish_import_job(
+                db_jobs, db_job=db_job, status=ImportJobStatus.FAILED, message=f"Error inesperado: {str(e)}"
+            )
+    finally:
+        with _progreso_lock:
+            _progreso_en_vivo.pop(job_id, None)
+        db_import.close()
+        db_jobs.close()
+        _eliminar_archivo(ruta)
+
+# --- Recuperación al arrancar ---
+def _proceso_vivo_windows(pid: int) -> Optional[bool]:
+    # os.kill(pid, 0) en Windows no consulta: envía CTRL_C_EVENT. Se usa OpenProcess
+    import ctypes
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(0x1000, False, pid) # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        error = ctypes.get_last_error()
+        if error == 87: # ERROR_INVALID_PARAMETER: no hay proceso con ese pid
+            return False
+        return True if error == 5 else None # ERROR_ACCESS_DENIED: existe, de otro usuario
+    try:
+        codigo = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo)):
+            return None
+        return codigo.value == 259 # STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+def _proceso_vivo(pid: int) -> Optional[bool]:
+    """Si hay un proceso con ese pid en este host; None si no se pudo averiguar."""
+    if os.name == "nt":
+        try:
+            return _proceso_vivo_windows(pid)
+        except (AttributeError, OSError):
+            return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+def _trabajo_huerfano(db_job: ImportJob, limite_antiguedad: datetime) -> bool:
+    """
+    Si el proceso que registró el trabajo ya no existe. Cuando no se puede saber (otro host, o
+    no se pudo consultar el pid) solo se da por huérfano si es más antiguo que el límite.
+    """
+    if not db_job.worker:
+        return True # Registrado antes de que existiera la columna: ningún proceso vivo lo ejecuta
+    host, pid, _ = db_job.worker.rsplit(":", 2)
+    if host == socket.gethostname():
+        if int(pid) == os.getpid():
+            return db_job.worker != IDENTIFICADOR_PROCESO
+        vivo = _proceso_vivo(int(pid))
+        if vivo is not None:
+            return not vivo
+    creado = db_job.created_at
+    if creado is None:
+        return False
+    creado = creado if creado.tzinfo else creado.replace(tzinfo=timezone.utc)
+    return creado < limite_antiguedad
+
+def _mensaje_interrumpido(tipo: str) -> str:
+    mensaje = "El servidor se reinició antes de que terminara la carga; vuelva a subir el archivo."
+    if tipo == "clientes":
+        # Clientes confirma bloque a bloque; facturas y vendedores son todo o nada
+        return mensaje + " Los bloques ya procesados quedaron guardados (las filas repetidas se omiten)."
+    return mensaje + " No se importó ninguna fila."
+
+def recuperar_trabajos_interrumpidos() -> int:
+    """
+    Marca como fallidos los trabajos pendientes o en curso cuyo proceso terminó y borra sus
+    archivos temporales, junto con los que quedaron de trabajos ya terminados. Retorna cuántos
+    trabajos marcó.
+    """
+    limite_antiguedad = datetime.now(timezone.utc) - timedelta(hours=settings.IMPORT_JOB_STALE_HOURS)
+    db = SessionLocal()
+    try:
+        recuperados = 0
+        for db_job in crud_import_job.get_unfinished_import_jobs(db):
+            if _trabajo_huerfano(db_job, limite_antiguedad):
+                crud_import_job.finish_import_job(
+                    db, db_job=db_job, status=ImportJobStatus.FAILED, message=_mensaje_interrumpido(db_job.tipo)
+                )
+                recuperados += 1
+
+        # El registro se crea antes que el archivo: uno sin trabajo pendiente o en curso sobró.
+        # Se consulta archivo por archivo porque otro worker de este host puede estar encolando
+        nombres = os.listdir(_DIRECTORIO_TEMPORAL) if os.path.isdir(_DIRECTORIO_TEMPORAL) else []
+        for nombre in nombres:
+            job_id, extension = os.path.splitext(nombre)
+            if extension != ".csv":
+                continue
+            db_job = crud_import_job.get_import_job(db, job_id)
+            if db_job is None or db_job.status in (ImportJobStatus.COMPLETED, ImportJobStatus.FAILED):
+                _eliminar_archivo(os.path.join(_DIRECTORIO_TEMPORAL, nombre))
+        return recuperados
+    finally:
+        db.close()
@@ -0,0 +1,189 @@
+# app/core/perfil.py
+"""
+Perfilado por petición: tiempo total, tiempo en la base y cantidad de sentencias SQL.
+
+- instrumentar_engine() agrega listeners before/after_cursor_execute a un Engine; cada sentencia
+  suma su duración a la medición de la petición en curso (un ContextVar, que también llega a
+  los threads del threadpool donde corren los endpoints síncronos).
+- MiddlewarePerfil (ASGI puro, ver app/main.py) abre la medición, agrega la cabecera
+  Server-Timing (db, app = total - db, total) y escribe una línea JSON en el logger "app.perfil".
+- Con PROFILING_DUMP_THRESHOLD_MS, un muestreador de pilas (sys._current_frames) acompaña a
+  cada petición y, si supera el umbral, se guarda en PROFILING_DUMP_DIR en formato de pilas
+  colapsadas (speedscope, flamegraph.pl). Muestrea todos los threads con código de app/:
+  con peticiones concurrentes el volcado puede incluir otras (se indica cuántas había).
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.perfil")
+
+_DIRECTORIO_APP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PROFUNDIDAD_MAXIMA = 128
+
+class MedicionPeticion:
+    __slots__ = ("inicio", "db_ms", "consultas", "_lock")
+
+    def __init__(self) -> None:
+        self.inicio = time.perf_counter()
+        self.db_ms = 0.0
+        self.consultas = 0
+        # Una petición puede consultar desde varios threads (modo paralelo del cálculo de bonos);
+        # db_ms suma el tiempo de todos, así que entonces puede superar al total
+        self._lock = threading.Lock()
+
+    def transcurrido_ms(self) -> float:
+        return (time.perf_counter() - self.inicio) * 1000
+
+_medicion_actual: ContextVar[Optional[MedicionPeticion]] = ContextVar("medicion_peticion", default=None)
+
+def medicion_actual() -> Optional[MedicionPeticion]:
+    return _medicion_actual.get()
+
+# --- Listeners del Engine ---
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None:
+        context._perfil_inicio = time.perf_counter()
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany) -> None:
+    medicion = _medicion_actual.get()
+    inicio = getattr(context, "_perfil_inicio", None)
+    if medicion is not None and inicio is not None:
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+        with medicion._lock:
+            medicion.db_ms += duracion_ms
+            medicion.consultas += 1
+
+def instrumentar_engine(engine: Engine) -> None:
+    """Registra los listeners (para un AsyncEngine se pasa su sync_engine)."""
+    if not event.contains(engine, "after_cursor_execute", _despues_de_ejecutar):
+        event.listen(engine, "before_cursor_execute", _antes_de_ejecutar)
+        event.listen(engine, "after_cursor_execute", _despues_de_ejecutar)
+
+# --- Muestreador de pilas para las peticiones lentas ---
+class MuestreadorPilas(threading.Thread):
+    """Cuenta, cada `intervalo_s`, las pilas de los threads que están ejecutando código de app/."""
+
+    def __init__(self, intervalo_s: float) -> None:
+        super().__init__(name="perfil-muestreador", daemon=True)
+        self.intervalo_s = intervalo_s
+        self.muestras: Counter = Counter()
+        self._detener = threading.Event()
+
+    def run(self) -> None:
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo_s):
+            for ident, frame in sys._current_frames().items():
+                if ident == propio:
+                    continue
+                pila, en_app = [], False
+                while frame is not None and len(pila) < _PROFUNDIDAD_MAXIMA:
+                    codigo = frame.f_code
+                    en_app = en_app or codigo.co_filename.startswith(_DIRECTORIO_APP)
+                    pila.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                if en_app:
+                    self.muestras[";".join(reversed(pila))] += 1
+
+    def detener(self) -> Counter:
+        self._detener.set()
+        self.join()
+        return self.muestras
+
+def _volcar_perfil(muestras: Counter, metodo: str, ruta: str, registro: dict) -> Optional[str]:
+    os.makedirs(settings.PROFILING_DUMP_DIR, exist_ok=True)
+    nombre = f"{datetime.now():%Y%m%d-%H%M%S-%f}_{metodo}_{re.sub(r'[^A-Za-z0-9]+', '_', ruta).strip('_')}.txt"
+    ruta_archivo = os.path.join(settings.PROFILING_DUMP_DIR, nombre)
+    with open(ruta_archivo, "w", encoding="utf-8") as archivo:
+        archivo.write(f"# {json.dumps(registro, ensure_ascii=False)}\n")
+        for pila, cantidad in muestras.most_common():
+            archivo.write(f"{pila} {cantidad}\n")
+    return ruta_archivo
+
+# --- Middleware ---
+def _plantilla_ruta(scope) -> str:
+    """'/api/v1/vendedores/12' -> '/api/v1/vendedores/{vendedor_id}', para agrupar el log por endpoint."""
+    # scope["route"] lo deja el router, con la ruta relativa al router que la incluye
+    plantilla = getattr(scope.get("route"), "path", None)
+    ruta = scope["path"].rstrip("/")
+    if not plantilla:
+        return scope["path"]
+    segmentos = plantilla.rstrip("/").count("/")
+    return (ruta.rsplit("/", segmentos)[0] if segmentos else ruta) + plantilla
+
+_peticiones_activas = 0
+
+class MiddlewarePerfil:
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        global _peticiones_activas
+        _peticiones_activas += 1
+        concurrentes = _peticiones_activas - 1
+        medicion = MedicionPeticion()
+        token = _medicion_actual.set(medicion)
+        umbral = settings.PROFILING_DUMP_THRESHOLD_MS
+        muestreador = None
+        if umbral is not None:
+            muestreador = MuestreadorPilas(settings.PROFILING_SAMPLE_INTERVAL_MS / 1000)
+            muestreador.start()
+        estado = 500
+
+        async def enviar(mensaje) -> None:
+            nonlocal estado
+            if mensaje["type"] == "http.response.start":
+                # En respuestas por streaming los tiempos son hasta el primer byte
+                estado = mensaje["status"]
+                total = medicion.transcurrido_ms()
+                MutableHeaders(scope=mensaje).append("Server-Timing", (
+                    f'db;dur={medicion.db_ms:.1f};desc="{medicion.consultas} consultas", '
+                    f"app;dur={max(0.0, total - medicion.db_ms):.1f}, total;dur={total:.1f}"
+                ))
+            await send(mensaje)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicion_actual.reset(token)
+            _peticiones_activas -= 1
+            total = medicion.transcurrido_ms()
+            ruta = _plantilla_ruta(scope)
+            registro = {
+                "metodo": scope["method"], "ruta": ruta, "estado": estado,
+                "total_ms": round(total, 1), "db_ms": round(medicion.db_ms, 1),
+                "app_ms": round(max(0.0, total - medicion.db_ms), 1), "consultas": medicion.consultas,
+            }
+            if muestreador is not None:
+                muestras = muestreador.detener()
+                if total >= umbral:
+                    registro["concurrentes"] = concurrentes
+                    registro["perfil"] = _volcar_perfil(muestras, scope["method"], ruta, registro)
+            logger.info(json.dumps(registro, ensure_ascii=False))
+
+def configurar_log() -> None:
+    """El logger "app.perfil" escribe en stderr, independiente de la configuración de uvicorn."""
+    if not logger.handlers:
+        manejador = logging.StreamHandler()
+        manejador.setFormatter(logging.Formatter("%(asctime)s %(name)s %(message)s"))
+        logger.addHandler(manejador)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
@@ -0,0 +1,36 @@
+# app/core/rut.py
+import re
+from typing import Optional
+
+import pandas as pd
+
+_ESPACIOS = re.compile(r"\s+")
+_NO_NORMALIZADO = re.compile(r"[\s.\-]+")
+
+def limpiar_rut(rut: Optional[str]) -> Optional[str]:
+    """
+    Forma canónica con la que se guarda y compara un RUT: sin espacios y en mayúsculas
+    ('12345678-k ' -> '12345678-K'). Devuelve None si el RUT queda vacío.
+    """
+    if rut is None:
+        return None
+    limpio = _ESPACIOS.sub("", str(rut)).upper()
+    return limpio or None
+
+def limpiar_rut_series(ruts: pd.Series) -> pd.Series:
+    """Versión vectorizada de limpiar_rut para columnas de un DataFrame (vacíos -> '')."""
+    return ruts.fillna("").astype(str).str.replace(r"\s+", "", regex=True).str.upper()
+
+def normalizar_rut(rut: Optional[str]) -> Optional[str]:
+    """
+    Clave de búsqueda del RUT: sin puntos, guiones ni espacios y en mayúsculas
+    ('12.345.678-k' -> '12345678K'). Es lo que se guarda en las columnas rut_normalizado.
+    """
+    if rut is None:
+        return None
+    normalizado = _NO_NORMALIZADO.sub("", str(rut)).upper()
+    return normalizado or None
+
+def normalizar_rut_series(ruts: pd.Series) -> pd.Series:
+    """Versión vectorizada de normalizar_rut (vacíos -> '')."""
+    return ruts.fillna("").astype(str).str.replace(r"[\s.\-]+", "", regex=True).str.upper()
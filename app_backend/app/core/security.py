@@ -1,4 +1,6 @@
 # app/core/security.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Any
 from passlib.context import CryptContext
@@ -8,6 +10,10 @@ import pyotp # Para 2FA TOTP
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt es CPU puro (~0,2 s por verificación) y libera el GIL: desde código async se ejecuta
+# en este pool acotado para no bloquear el event loop ni ocupar todo el threadpool de la app
+_hash_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY # Asegúrate que esta es una cadena
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
@@ -19,6 +25,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password para endpoints async: corre en el pool de hashing, fuera del event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_hash_executor, verify_password, plain_password, hashed_password)
+
 def create_access_token(subject: Any, expires_delta: Optional[timedelta] = None) -> str:
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
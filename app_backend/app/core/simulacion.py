@@ -0,0 +1,172 @@
+# app/core/simulacion.py
+"""
+Simulación de bonos con otras tablas de porcentajes (POST /bonos/simular), sin escribir nada.
+
+El bono de un vendedor es la suma, por cada cliente, de porcentaje x Σ max(neto, 0) de sus
+facturas, así que basta con cargar una vez las celdas (vendedor, cliente) del periodo con su
+neto positivo, el porcentaje vigente y los datos del cliente que usan las reglas (ramo y
+ubicación). Solo las celdas con asignación: las reglas cambian asignaciones existentes y las
+demás no generan bono en ningún escenario. Los meses cerrados salen del ledger, igual que en
+calculations.
+
+Después todos los escenarios se evalúan juntos con NumPy: una matriz escenarios x celdas de
+porcentajes, el bono por celda es esa matriz por el neto positivo y el total por vendedor una
+suma por tramos (np.add.reduceat sobre las celdas ordenadas por vendedor).
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, case, func, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud import crud_bono_ledger
+from app.models.bono_ledger import BonoLedger
+from app.models.cliente import Cliente
+from app.models.factura import Factura
+from app.models.vendedor import Vendedor, VendedorClientePorcentaje
+from app.schemas.bono import EscenarioBono, ReglaPorcentaje
+
+_COLUMNAS_CELDAS = ["vendedor_id", "cliente_id", "neto_positivo", "porcentaje", "ramo", "ubicacion"]
+
+def _consulta_celdas(db: Session, modelo, vendedor_col, cliente_col, neto_positivo):
+    """SELECT de celdas (vendedor, cliente) asignadas, con el porcentaje vigente y el ramo/ubicación del cliente."""
+    return db.query(
+        vendedor_col, cliente_col, func.sum(neto_positivo),
+        VendedorClientePorcentaje.porcentaje_bono, Cliente.ramo, Cliente.ubicacion
+    ).select_from(modelo).join(VendedorClientePorcentaje, and_(
+        VendedorClientePorcentaje.vendedor_id == vendedor_col,
+        VendedorClientePorcentaje.cliente_id == cliente_col
+    )).outerjoin(Cliente, Cliente.id == cliente_col).group_by(
+        vendedor_col, cliente_col, VendedorClientePorcentaje.porcentaje_bono, Cliente.ramo, Cliente.ubicacion
+    )
+
+def cargar_celdas(db: Session, start_date: date, end_date: date, vendedor_id: Optional[int] = None) -> pd.DataFrame:
+    """Una fila por asignación (vendedor, cliente) con facturas en el periodo, ordenadas por vendedor."""
+    rango_ledger = None
+    if settings.BONO_LEDGER_ENABLED:
+        rango_ledger = crud_bono_ledger.rango_materializado(db, start_date, end_date)
+
+    neto = func.coalesce(Factura.honorarios_generados, 0.0) - func.coalesce(Factura.gastos_generados, 0.0)
+    query_facturas = _consulta_celdas(
+        db, Factura, Factura.vendedor_id, Factura.cliente_id, case((neto > 0, neto), else_=0.0)
+    ).filter(Factura.fecha_emision >= start_date, Factura.fecha_emision <= end_date)
+    if vendedor_id:
+        query_facturas = query_facturas.filter(Factura.vendedor_id == vendedor_id)
+    if rango_ledger:
+        desde, hasta, periodos = rango_ledger
+        query_facturas = query_facturas.filter(or_(Factura.fecha_emision < desde, Factura.fecha_emision >= hasta))
+    filas = query_facturas.all()
+
+    if rango_ledger:
+        query_ledger = _consulta_celdas(
+            db, BonoLedger, BonoLedger.vendedor_id, BonoLedger.cliente_id, BonoLedger.neto_positivo
+        ).filter(BonoLedger.periodo.in_(periodos))
+        if vendedor_id:
+            query_ledger = query_ledger.filter(BonoLedger.vendedor_id == vendedor_id)
+        filas += query_ledger.all()
+
+    celdas = pd.DataFrame(filas, columns=_COLUMNAS_CELDAS)
+    if celdas.empty:
+        return pd.DataFrame(columns=_COLUMNAS_CELDAS)
+    # Una celda puede venir de facturas y del ledger: se suman (los demás campos son iguales)
+    celdas = celdas.groupby(["vendedor_id", "cliente_id"], sort=True, as_index=False).agg(
+        neto_positivo=("neto_positivo", "sum"), porcentaje=("porcentaje", "first"),
+        ramo=("ramo", "first"), ubicacion=("ubicacion", "first")
+    )
+    celdas["neto_positivo"] = celdas["neto_positivo"].astype(float)
+    return celdas
+
+def _codigos(valores: pd.Series) -> tuple:
+    """(código entero por celda, {valor normalizado: código}) para comparar texto sin distinguir mayúsculas."""
+    codigos, unicos = pd.factorize(valores.str.strip().str.casefold())
+    return codigos, {valor: i for i, valor in enumerate(unicos)}
+
+def matriz_porcentajes(celdas: pd.DataFrame, escenarios: List[EscenarioBono]) -> np.ndarray:
+    """Porcentajes (escenarios x celdas): los vigentes con las reglas de cada escenario aplicadas en orden."""
+    vigentes = celdas["porcentaje"].to_numpy(dtype=float)
+    porcentajes = np.tile(vigentes, (len(escenarios), 1))
+    vendedores = celdas["vendedor_id"].to_numpy()
+    clientes = celdas["cliente_id"].to_numpy()
+    codigos = {columna: _codigos(celdas[columna]) for columna in ("ramo", "ubicacion")}
+
+    def mascara(regla: ReglaPorcentaje) -> np.ndarray:
+        resultado = np.ones(len(celdas), dtype=bool)
+        for columna in ("ramo", "ubicacion"):
+            valor = getattr(regla, columna)
+            if valor is not None:
+                codigos_celdas, por_valor = codigos[columna]
+                resultado &= codigos_celdas == por_valor.get(valor.strip().casefold(), -2)
+        if regla.vendedor_ids is not None:
+            resultado &= np.isin(vendedores, regla.vendedor_ids)
+        if regla.cliente_ids is not None:
+            resultado &= np.isin(clientes, regla.cliente_ids)
+        return resultado
+
+    for fila, escenario in zip(porcentajes, escenarios):
+        for regla in escenario.reglas:
+            seleccion = mascara(regla)
+            if regla.porcentaje is not None:
+                fila[seleccion] = regla.porcentaje
+            else:
+                fila[seleccion] = np.minimum(fila[seleccion] * regla.factor, 1.0)
+    return porcentajes
+
+def simular_bonos(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    escenarios: List[EscenarioBono],
+    vendedor_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Bono actual y simulado para cada escenario (mismo orden que `escenarios`), por cada vendedor
+    con facturas de clientes asignados en el periodo.
+    """
+    celdas = cargar_celdas(db, start_date, end_date, vendedor_id)
+    if celdas.empty:
+        return [
+            {"nombre": e.nombre, "bono_total_actual": 0.0, "bono_total_simulado": 0.0,
+             "diferencia_total": 0.0, "asignaciones_afectadas": 0, "resultados": []}
+            for e in escenarios
+        ]
+
+    neto_positivo = celdas["neto_positivo"].to_numpy(dtype=float)
+    vigentes = celdas["porcentaje"].to_numpy(dtype=float)
+    simulados = matriz_porcentajes(celdas, escenarios)
+
+    # Tramos de celdas de cada vendedor (las celdas vienen ordenadas por vendedor)
+    vendedores = celdas["vendedor_id"].to_numpy()
+    inicios = np.flatnonzero(np.r_[True, vendedores[1:] != vendedores[:-1]])
+    ids_vendedores = vendedores[inicios].tolist()
+    bono_actual = np.add.reduceat(vigentes * neto_positivo, inicios)
+    bono_simulado = np.add.reduceat(simulados * neto_positivo, inicios, axis=1)
+    diferencias = bono_simulado - bono_actual
+    afectadas = (simulados != vigentes).sum(axis=1)
+
+    datos_vendedores = dict(
+        (fila.id, fila) for fila in
+        db.query(Vendedor.id, Vendedor.nombre_completo, Vendedor.rut).filter(Vendedor.id.in_(ids_vendedores))
+    )
+    base = [
+        {"vendedor_id": v_id, "nombre_vendedor": datos_vendedores[v_id].nombre_completo,
+         "rut_vendedor": datos_vendedores[v_id].rut, "bono_actual": actual}
+        for v_id, actual in zip(ids_vendedores, bono_actual.tolist())
+    ]
+    total_actual = float(bono_actual.sum())
+    return [
+        {
+            "nombre": escenario.nombre,
+            "bono_total_actual": total_actual,
+            "bono_total_simulado": float(simulado.sum()),
+            "diferencia_total": float(diferencia.sum()),
+            "asignaciones_afectadas": int(n_afectadas),
+            "resultados": [
+                {**vendedor, "bono_simulado": s, "diferencia": d}
+                for vendedor, s, d in zip(base, simulado.tolist(), diferencia.tolist())
+            ],
+        }
+        for escenario, simulado, diferencia, n_afectadas in zip(escenarios, bono_simulado, diferencias, afectadas)
+    ]
@@ -21,4 +21,9 @@ from .crud_vendedor import (
 
 from . import crud_factura
 from .crud_factura import get_factura, get_facturas, create_factura # <--- 23 jun 25
-from .crud_reporte import get_reporte_facturacion # <--- 23 jun 25
\ No newline at end of file
+from .crud_reporte import get_reporte_facturacion # <--- 23 jun 25
+from . import crud_import_job
+from . import crud_bono_ledger
+from . import crud_busqueda
+from . import crud_tabla_version
+from . import crud_async
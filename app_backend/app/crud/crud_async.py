@@ -0,0 +1,65 @@
+# app/crud/crud_async.py
+"""
+Variantes async de las lecturas más usadas (listado de facturas, reporte de facturación y
+cálculo de bonos) para el stack AsyncSession de las rutas /async.
+
+No duplican las consultas: ejecutan las funciones síncronas con AsyncSession.run_sync, y la
+E/S con la base pasa por el driver async (aiomysql / aiosqlite) sin ocupar un thread del pool.
+El resultado se convierte a schemas dentro de run_sync, porque la serialización posterior no
+puede disparar lazy loads fuera de la sesión.
+"""
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Se importa el módulo (no sus nombres): app.core.calculations importa app.crud y el ciclo
+# fallaría si calculations se carga antes que app.crud
+from app.core import calculations
+from app.crud import crud_factura, crud_reporte
+from app.db.session import SessionLocal
+from app.schemas.bono import BonoVendedorResult
+from app.schemas.factura import Factura as FacturaSchema, FacturasResponse
+
+async def get_facturas(db: AsyncSession, **filtros: Any) -> FacturasResponse:
+    """crud_factura.get_facturas con los mismos filtros; lanza ValueError si el cursor no es válido."""
+    def _listar(sesion: Session) -> FacturasResponse:
+        items, total_count, next_cursor = crud_factura.get_facturas(sesion, **filtros)
+        return FacturasResponse(
+            items=[FacturaSchema.model_validate(item) for item in items],
+            total_count=total_count,
+            next_cursor=next_cursor
+        )
+    return await db.run_sync(_listar)
+
+async def get_reporte_facturacion_enriquecido(db: AsyncSession, **filtros: Any) -> Dict[str, Any]:
+    """crud_reporte.get_reporte_facturacion_enriquecido con los mismos filtros."""
+    return await db.run_sync(lambda sesion: crud_reporte.get_reporte_facturacion_enriquecido(sesion, **filtros))
+
+async def calcular_bonos_por_periodo(
+    db: AsyncSession,
+    start_date: date,
+    end_date: date,
+    vendedor_id: Optional[int] = None,
+    modo: Optional[str] = None,
+    incluir_detalle: bool = True
+) -> List[BonoVendedorResult]:
+    """
+    app.core.calculations.calcular_bonos_por_periodo sobre una AsyncSession. El modo paralelo
+    abre sesiones síncronas por tramo y espera a sus threads: no puede correr dentro de run_sync
+    (que ejecuta en el thread del event loop), así que va al threadpool con una Session propia.
+    """
+    if modo == calculations.MODO_PARALELO:
+        def _calcular_en_thread() -> List[BonoVendedorResult]:
+            with SessionLocal() as sesion:
+                return calculations.calcular_bonos_por_periodo(
+                    sesion, start_date, end_date, vendedor_id=vendedor_id,
+                    modo=modo, incluir_detalle=incluir_detalle
+                )
+        return await run_in_threadpool(_calcular_en_thread)
+    return await db.run_sync(lambda sesion: calculations.calcular_bonos_por_periodo(
+        sesion, start_date, end_date, vendedor_id=vendedor_id,
+        modo=modo or calculations.MODO_AGREGADO, incluir_detalle=incluir_detalle
+    ))
@@ -0,0 +1,170 @@
+# app/crud/crud_bono_ledger.py
+import logging
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, and_, insert, select, literal
+from sqlalchemy.exc import IntegrityError
+from typing import Iterable, List, Optional, Set, Tuple
+from datetime import date, datetime, time, timedelta
+
+from app.models.bono_ledger import BonoLedger, BonoLedgerPeriodo
+from app.models.factura import Factura
+from app.models.vendedor import VendedorClientePorcentaje
+
+logger = logging.getLogger(__name__)
+
+# Celda del ledger: (periodo, vendedor_id, cliente_id)
+Celda = Tuple[int, int, int]
+
+_COLUMNAS_LEDGER = [
+    BonoLedger.periodo, BonoLedger.vendedor_id, BonoLedger.cliente_id,
+    BonoLedger.honorarios, BonoLedger.gastos, BonoLedger.neto,
+    BonoLedger.neto_positivo, BonoLedger.bono, BonoLedger.num_facturas
+]
+
+# --- Periodos ---
+def periodo_de(fecha: date) -> int:
+    """202403 para cualquier fecha de marzo de 2024."""
+    return fecha.year * 100 + fecha.month
+
+def _inicio_mes_siguiente(fecha: date) -> date:
+    return date(fecha.year + 1, 1, 1) if fecha.month == 12 else date(fecha.year, fecha.month + 1, 1)
+
+def rango_periodo(periodo: int) -> Tuple[date, date]:
+    """[primer día del mes, primer día del mes siguiente) del periodo."""
+    inicio = date(periodo // 100, periodo % 100, 1)
+    return inicio, _inicio_mes_siguiente(inicio)
+
+def dividir_rango(start_date: date, end_date: date) -> Optional[Tuple[date, date, List[int]]]:
+    """
+    Meses cerrados (anteriores al mes en curso) que el filtro
+    `start_date <= fecha_emision <= end_date` cubre completos.
+    Devuelve (desde, hasta, periodos): los periodos ocupan [desde, hasta) y el resto del
+    rango se debe leer de facturas. None si no hay ningún mes completo.
+    """
+    if isinstance(start_date, datetime):
+        # Un inicio con hora posterior a las 00:00 no cubre completo ese día
+        inicio_dia = start_date.time() == time.min
+        start_date = start_date.date() if inicio_dia else start_date.date() + timedelta(days=1)
+    if isinstance(end_date, datetime):
+        end_date = end_date.date()
+
+    desde = date(start_date.year, start_date.month, 1)
+    if desde < start_date:
+        desde = _inicio_mes_siguiente(desde)
+    limite = min(end_date, date.today().replace(day=1))
+
+    periodos = []
+    hasta = desde
+    while _inicio_mes_siguiente(hasta) <= limite:
+        periodos.append(periodo_de(hasta))
+        hasta = _inicio_mes_siguiente(hasta)
+    if not periodos:
+        return None
+    return desde, hasta, periodos
+
+# --- Agregación desde facturas ---
+def _select_celdas(periodo: int, *filtros):
+    """SELECT con los totales por (vendedor, cliente) de las facturas del periodo."""
+    desde, hasta = rango_periodo(periodo)
+    honorarios = func.coalesce(Factura.honorarios_generados, 0.0)
+    gastos = func.coalesce(Factura.gastos_generados, 0.0)
+    neto = honorarios - gastos
+    neto_positivo = case((neto > 0, neto), else_=0.0)
+    porcentaje = func.coalesce(VendedorClientePorcentaje.porcentaje_bono, 0.0)
+
+    return select(
+        literal(periodo), Factura.vendedor_id, Factura.cliente_id,
+        func.sum(honorarios), func.sum(gastos), func.sum(neto),
+        func.sum(neto_positivo), func.sum(neto_positivo * porcentaje), func.count(Factura.id)
+    ).select_from(Factura).outerjoin(VendedorClientePorcentaje, and_(
+        VendedorClientePorcentaje.vendedor_id == Factura.vendedor_id,
+        VendedorClientePorcentaje.cliente_id == Factura.cliente_id
+    )).where(
+        Factura.fecha_emision >= desde,
+        Factura.fecha_emision < hasta,
+        *filtros
+    ).group_by(Factura.vendedor_id, Factura.cliente_id)
+
+def materializar_periodo(db: Session, periodo: int) -> None:
+    """Reconstruye el ledger de un periodo con un INSERT ... SELECT (sin commit)."""
+    db.query(BonoLedger).filter(BonoLedger.periodo == periodo).delete(synchronize_session=False)
+    db.query(BonoLedgerPeriodo).filter(BonoLedgerPeriodo.periodo == periodo).delete(synchronize_session=False)
+    db.execute(insert(BonoLedger).from_select(_COLUMNAS_LEDGER, _select_celdas(periodo)))
+    db.add(BonoLedgerPeriodo(periodo=periodo))
+    db.flush()
+
+def periodos_materializados(db: Session, periodos: Iterable[int]) -> Set[int]:
+    periodos = list(set(periodos))
+    if not periodos:
+        return set()
+    return {p for (p,) in db.query(BonoLedgerPeriodo.periodo).filter(BonoLedgerPeriodo.periodo.in_(periodos))}
+
+def rango_materializado(db: Session, start_date: date, end_date: date) -> Optional[Tuple[date, date, List[int]]]:
+    """
+    Igual que dividir_rango, pero además materializa los periodos que falten: las lecturas
+    (cálculo de bonos, reporte, simulación) escriben en el ledger la primera vez que incluyen
+    un mes cerrado. Eso se hace y se confirma en una sesión propia y corta; la sesión de quien
+    llama nunca hace commit.
+
+    Devuelve None, y quien llama lee todo de facturas, si no hay meses cerrados en el rango, si
+    otra petición materializaba el mismo periodo o si se materializó algo y la sesión de quien
+    llama ya tenía una transacción abierta (con REPEATABLE READ no vería las filas nuevas).
+    """
+    rango = dividir_rango(start_date, end_date)
+    if rango is None:
+        return None
+    periodos = rango[2]
+    transaccion_previa = db.in_transaction()
+    with Session(bind=db.get_bind()) as db_ledger:
+        faltantes = sorted(set(periodos) - periodos_materializados(db_ledger, periodos))
+        if not faltantes:
+            return rango
+        try:
+            for periodo in faltantes:
+                materializar_periodo(db_ledger, periodo)
+            db_ledger.commit()
+        except IntegrityError:
+            db_ledger.rollback()
+            logger.warning("Otra petición materializaba los periodos %s del ledger; esta lee de facturas", faltantes)
+            return None
+    if transaccion_previa:
+        logger.info("Periodos %s materializados; esta petición lee de facturas (su transacción es anterior)", faltantes)
+        return None
+    return rango
+
+# --- Mantenimiento incremental (el llamador hace flush antes y commit después) ---
+def celda_de_factura(factura: Factura) -> Optional[Celda]:
+    if factura.fecha_emision is None or factura.vendedor_id is None or factura.cliente_id is None:
+        return None
+    return periodo_de(factura.fecha_emision), factura.vendedor_id, factura.cliente_id
+
+def recalcular_celdas(db: Session, celdas: Iterable[Optional[Celda]]) -> None:
+    """Vuelve a agregar desde facturas las celdas indicadas de los periodos ya materializados."""
+    celdas = {c for c in celdas if c is not None}
+    materializados = periodos_materializados(db, (c[0] for c in celdas))
+    for periodo, vendedor_id, cliente_id in celdas:
+        if periodo not in materializados:
+            continue
+        db.query(BonoLedger).filter(
+            BonoLedger.periodo == periodo,
+            BonoLedger.vendedor_id == vendedor_id,
+            BonoLedger.cliente_id == cliente_id
+        ).delete(synchronize_session=False)
+        db.execute(insert(BonoLedger).from_select(_COLUMNAS_LEDGER, _select_celdas(
+            periodo, Factura.vendedor_id == vendedor_id, Factura.cliente_id == cliente_id
+        )))
+
+def actualizar_porcentaje(db: Session, *, vendedor_id: int, cliente_id: int, porcentaje: float) -> None:
+    """Al cambiar el porcentaje de una asignación basta con recalcular bono = neto_positivo * porcentaje."""
+    db.query(BonoLedger).filter(
+        BonoLedger.vendedor_id == vendedor_id,
+        BonoLedger.cliente_id == cliente_id
+    ).update({BonoLedger.bono: BonoLedger.neto_positivo * porcentaje}, synchronize_session=False)
+
+def invalidar_periodos(db: Session, periodos: Iterable[int]) -> None:
+    """Descarta el ledger de los periodos (p. ej. tras una carga masiva); se rematerializan al leerlos."""
+    periodos = list(set(periodos))
+    if not periodos:
+        return
+    db.query(BonoLedger).filter(BonoLedger.periodo.in_(periodos)).delete(synchronize_session=False)
+    db.query(BonoLedgerPeriodo).filter(BonoLedgerPeriodo.periodo.in_(periodos)).delete(synchronize_session=False)
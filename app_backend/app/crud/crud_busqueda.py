@@ -0,0 +1,106 @@
+# app/crud/crud_busqueda.py
+import math
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case, or_, insert
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.busqueda import trigramas, trigramas_consulta
+from app.core.rut import normalizar_rut
+from app.models.busqueda import BusquedaTrigrama
+from app.models.cliente import Cliente
+from app.models.vendedor import Vendedor
+
+ENTIDAD_CLIENTE = "cliente"
+ENTIDAD_VENDEDOR = "vendedor"
+
+# Modos de búsqueda de los listados (?search_mode=)
+MODO_CONTAINS = "contains" # ILIKE '%termino%' (recorre la tabla)
+MODO_TRIGRAM = "trigram"   # índice de trigramas con ranking por relevancia
+
+# Fracción mínima de los trigramas del término que debe tener un registro para aparecer
+SIMILITUD_MINIMA = 0.6
+
+_LOTE = 1000
+
+# --- Mantenimiento del índice (sin commit: lo hace quien llama) ---
+def indexar(
+    db: Session, entidad: str, registros: Iterable[Tuple[int, Tuple[Optional[str], ...]]], reemplazar: bool = True
+) -> None:
+    """
+    Guarda los trigramas de cada (id, textos) entregado. Con reemplazar=False no se borran
+    los anteriores (registros recién insertados, que aún no tienen filas en el índice).
+    """
+    registros = list(registros)
+    if reemplazar:
+        ids = [entidad_id for entidad_id, _ in registros]
+        for inicio in range(0, len(ids), _LOTE):
+            db.query(BusquedaTrigrama).filter(
+                BusquedaTrigrama.entidad == entidad,
+                BusquedaTrigrama.entidad_id.in_(ids[inicio:inicio + _LOTE])
+            ).delete(synchronize_session=False)
+
+    filas = [
+        {"entidad": entidad, "trigrama": trigrama, "entidad_id": entidad_id}
+        for entidad_id, textos in registros
+        for trigrama in trigramas(*textos)
+    ]
+    for inicio in range(0, len(filas), _LOTE):
+        db.execute(insert(BusquedaTrigrama), filas[inicio:inicio + _LOTE])
+
+def desindexar(db: Session, entidad: str, entidad_id: int) -> None:
+    db.query(BusquedaTrigrama).filter(
+        BusquedaTrigrama.entidad == entidad,
+        BusquedaTrigrama.entidad_id == entidad_id
+    ).delete(synchronize_session=False)
+
+def indexar_clientes(db: Session, clientes: Iterable[Cliente], reemplazar: bool = True) -> None:
+    """Se indexan la razón social y el RUT normalizado."""
+    indexar(db, ENTIDAD_CLIENTE, ((c.id, (c.razon_social, c.rut_normalizado)) for c in clientes), reemplazar)
+
+def indexar_vendedores(db: Session, vendedores: Iterable[Vendedor]) -> None:
+    """Se indexan el nombre completo y el RUT normalizado."""
+    indexar(db, ENTIDAD_VENDEDOR, ((v.id, (v.nombre_completo, v.rut_normalizado)) for v in vendedores))
+
+def indexar_clientes_por_rut(db: Session, ruts_normalizados: List[str], reemplazar: bool = True) -> None:
+    """Indexa (o reindexa) los clientes con esos RUT; para las cargas masivas que no conocen los IDs."""
+    for inicio in range(0, len(ruts_normalizados), _LOTE):
+        indexar_clientes(db, db.query(Cliente.id, Cliente.razon_social, Cliente.rut_normalizado).filter(
+            Cliente.rut_normalizado.in_(ruts_normalizados[inicio:inicio + _LOTE])
+        ).all(), reemplazar)
+
+def indexar_vendedores_por_rut(db: Session, ruts_normalizados: List[str]) -> None:
+    for inicio in range(0, len(ruts_normalizados), _LOTE):
+        indexar_vendedores(db, db.query(Vendedor.id, Vendedor.nombre_completo, Vendedor.rut_normalizado).filter(
+            Vendedor.rut_normalizado.in_(ruts_normalizados[inicio:inicio + _LOTE])
+        ).all())
+
+# --- Consulta ---
+def subconsulta_coincidencias(db: Session, entidad: str, termino: str):
+    """
+    Subconsulta (entidad_id, coincidencias) con los registros que comparten al menos
+    SIMILITUD_MINIMA de los trigramas del término; coincidencias sirve para ordenar por relevancia.
+    Devuelve None si el término es demasiado corto para tener trigramas.
+    """
+    trigramas_termino = trigramas_consulta(termino)
+    if not trigramas_termino:
+        return None
+    minimo = max(1, math.ceil(len(trigramas_termino) * SIMILITUD_MINIMA))
+    coincidencias = func.count(BusquedaTrigrama.trigrama)
+    return db.query(
+        BusquedaTrigrama.entidad_id.label("entidad_id"),
+        coincidencias.label("coincidencias")
+    ).filter(
+        BusquedaTrigrama.entidad == entidad,
+        BusquedaTrigrama.trigrama.in_(trigramas_termino)
+    ).group_by(BusquedaTrigrama.entidad_id).having(coincidencias >= minimo).subquery()
+
+def orden_relevancia(coincidencias, termino: str, columna_nombre, columna_rut_normalizado) -> list:
+    """
+    ORDER BY de los resultados: más trigramas en común primero y, a igualdad, los que
+    contienen el término literal (p. ej. un RUT exacto frente a otro con los mismos dígitos).
+    """
+    contiene = or_(
+        func.lower(columna_nombre).like(f"%{termino.strip().lower()}%"),
+        columna_rut_normalizado.like(f"%{normalizar_rut(termino) or termino}%")
+    )
+    return [coincidencias.c.coincidencias.desc(), case((contiene, 1), else_=0).desc()]
@@ -1,16 +1,33 @@
 # app/crud/crud_cliente.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_ 
+from sqlalchemy import func, or_, and_
+from app.crud.paginacion import encode_cursor, decode_cursor, decode_cursor_id, decode_cursor_texto
+from app.crud import crud_busqueda, crud_tabla_version
+from app.core.rut import limpiar_rut, limpiar_rut_series, normalizar_rut, normalizar_rut_series
 from app.models.cliente import Cliente
 from app.schemas.cliente import ClienteCreate, ClienteUpdate 
-from typing import List, Optional, Union, Dict, Any, Tuple
+from typing import List, Optional, Union, Dict, Any, Tuple, Iterable, Callable
+import pandas as pd
+
+from app.schemas.importacion import ErrorFilaCSV, ResultadoImportacion
 
 def get_clientes(
-    db: Session, skip: int = 0, limit: int = 10, search: Optional[str] = None
-) -> Tuple[List[Cliente], int]: # Ahora devuelve una tupla: (items, total_count)
+    db: Session, skip: int = 0, limit: int = 10, search: Optional[str] = None,
+    after: Optional[str] = None, include_total: bool = True,
+    search_mode: str = crud_busqueda.MODO_CONTAINS
+) -> Tuple[List[Cliente], Optional[int], Optional[str]]: # (items, total_count, next_cursor)
     query = db.query(Cliente)
 
-    if search:
+    # search_mode "trigram": índice de trigramas ordenado por relevancia (términos < 3 letras usan "contains")
+    coincidencias = None
+    if search and search_mode == crud_busqueda.MODO_TRIGRAM:
+        if after:
+            raise ValueError("La paginación por cursor no está disponible con search_mode=trigram.")
+        coincidencias = crud_busqueda.subconsulta_coincidencias(db, crud_busqueda.ENTIDAD_CLIENTE, search)
+
+    if coincidencias is not None:
+        query = query.join(coincidencias, coincidencias.c.entidad_id == Cliente.id)
+    elif search:
         search_term = f"%{search.lower()}%" # Convertir a minúsculas para búsqueda insensible
         query = query.filter(
             or_(
@@ -19,26 +36,50 @@ def get_clientes(
             )
         )
 
-    total_count = query.count() # Contar ANTES de aplicar skip y limit para la paginación
+    # Contar ANTES de aplicar skip y limit para la paginación (opcional al paginar por cursor)
+    total_count = query.count() if include_total else None
+
+    if coincidencias is not None:
+        query = query.order_by(
+            *crud_busqueda.orden_relevancia(coincidencias, search, Cliente.razon_social, Cliente.rut_normalizado),
+            Cliente.razon_social, Cliente.id
+        )
+        return query.offset(skip).limit(limit).all(), total_count, None
+
+    query = query.order_by(Cliente.razon_social, Cliente.id)
+    if after:
+        # Paginación por clave (razon_social, id): un solo seek en el índice, sin OFFSET
+        razon_social_cursor, id_cursor = decode_cursor(after, 2)
+        razon_social_cursor, id_cursor = decode_cursor_texto(razon_social_cursor), decode_cursor_id(id_cursor)
+        query = query.filter(or_(
+            Cliente.razon_social > razon_social_cursor,
+            and_(Cliente.razon_social == razon_social_cursor, Cliente.id > id_cursor)
+        ))
+    else:
+        query = query.offset(skip)
 
-    items = query.order_by(Cliente.razon_social).offset(skip).limit(limit).all()
+    items = query.limit(limit).all()
+    next_cursor = encode_cursor(items[-1].razon_social, items[-1].id) if len(items) == limit else None
 
-    return items, total_count
+    return items, total_count, next_cursor
 
 def get_cliente(db: Session, cliente_id: int) -> Optional[Cliente]:  # ✅ Función faltante
     return db.query(Cliente).filter(Cliente.id == cliente_id).first()
 
 def get_cliente_by_rut(db: Session, rut: str) -> Optional[Cliente]:
-    return db.query(Cliente).filter(Cliente.rut == rut).first()
+    return db.query(Cliente).filter(Cliente.rut_normalizado == normalizar_rut(rut)).first()
 
 def create_cliente(db: Session, *, cliente_in: ClienteCreate) -> Cliente:
     db_cliente = Cliente(
         razon_social=cliente_in.razon_social,
-        rut=cliente_in.rut,
+        rut=limpiar_rut(cliente_in.rut),
         ramo=cliente_in.ramo,
         ubicacion=cliente_in.ubicacion
     )
     db.add(db_cliente)
+    db.flush()
+    crud_busqueda.indexar_clientes(db, [db_cliente])
+    crud_tabla_version.incrementar(db, Cliente.__tablename__)
     db.commit()
     db.refresh(db_cliente)
     return db_cliente
@@ -52,10 +93,16 @@ def update_cliente(
         update_data = cliente_in.model_dump(exclude_unset=True) # Para Pydantic v2
         # Para Pydantic v1 sería: update_data = cliente_in.dict(exclude_unset=True)
 
+    if update_data.get("rut"):
+        update_data = {**update_data, "rut": limpiar_rut(update_data["rut"])}
+
     for field, value in update_data.items():
         setattr(db_cliente, field, value)
 
     db.add(db_cliente)
+    if "razon_social" in update_data or "rut" in update_data:
+        crud_busqueda.indexar_clientes(db, [db_cliente])
+    crud_tabla_version.incrementar(db, Cliente.__tablename__)
     db.commit()
     db.refresh(db_cliente)
     return db_cliente
@@ -64,11 +111,111 @@ def remove_cliente(db: Session, *, cliente_id: int) -> Optional[Cliente]:
     db_cliente = db.query(Cliente).get(cliente_id) # .get() es más directo para PK
     if db_cliente:
         db.delete(db_cliente)
+        crud_busqueda.desindexar(db, crud_busqueda.ENTIDAD_CLIENTE, cliente_id)
+        crud_tabla_version.incrementar(db, Cliente.__tablename__)
         db.commit()
     return db_cliente # Retorna el objeto eliminado o None si no se encontró
 
-def get_clientes_simple(db: Session) -> List[Cliente]:
+def get_clientes_simple(db: Session) -> List[Any]:
     """
     Obtiene una lista simplificada de todos los clientes (ID y Razón Social) para los selectores.
+    Solo se leen esas dos columnas: filas livianas, sin instanciar objetos Cliente.
+    """
+    return db.query(Cliente.id, Cliente.razon_social).order_by(Cliente.razon_social, Cliente.id).all()
+
+# --- FUNCIÓN PARA PROCESAR CSV ---
+CLIENTES_BATCH_SIZE = 1000 # Filas por bulk_insert_mappings
+
+def _columna_opcional(df: pd.DataFrame, nombre: str) -> pd.Series:
+    """Columna de texto recortada; las celdas vacías o ausentes quedan como None."""
+    if nombre not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    columna = df[nombre].astype(object).where(df[nombre].notna(), "").astype(str).str.strip()
+    return columna.where(columna != "", None)
+
+def _validar_clientes_df(df: pd.DataFrame) -> Tuple[pd.DataFrame, List[ErrorFilaCSV]]:
     """
-    return db.query(Cliente).order_by(Cliente.razon_social).all()
\ No newline at end of file
+    Valida un bloque del CSV de forma vectorizada con las mismas reglas que ClienteCreate.
+    Devuelve las filas válidas (con el RUT ya limpio y la fila del archivo) y los errores.
+    """
+    rut = limpiar_rut_series(df["rut"]) if "rut" in df.columns else pd.Series("", index=df.index)
+    razon_social = _columna_opcional(df, "razon_social")
+    ramo = _columna_opcional(df, "ramo")
+    ubicacion = _columna_opcional(df, "ubicacion")
+
+    validaciones = [
+        (razon_social.isna(), "'razon_social' es obligatorio."),
+        (razon_social.str.len() > 255, "'razon_social' no puede superar 255 caracteres."),
+        ((rut.str.len() < 7) | (rut.str.len() > 12), "'rut' debe tener entre 7 y 12 caracteres."),
+        (ramo.str.len() > 100, "'ramo' no puede superar 100 caracteres."),
+        (ubicacion.str.len() > 255, "'ubicacion' no puede superar 255 caracteres."),
+    ]
+    errores: List[ErrorFilaCSV] = []
+    invalidas = pd.Series(False, index=df.index)
+    for mascara, mensaje in validaciones:
+        mascara = mascara.fillna(False).astype(bool)
+        invalidas |= mascara
+        for fila, rut_fila in zip(df.index[mascara.to_numpy()] + 2, rut[mascara]):
+            errores.append(ErrorFilaCSV(row=int(fila), rut=rut_fila or None, error=mensaje))
+    errores.sort(key=lambda e: e.row)
+
+    validas = pd.DataFrame({
+        "razon_social": razon_social, "rut": rut, "rut_normalizado": normalizar_rut_series(rut),
+        "ramo": ramo, "ubicacion": ubicacion
+    })[~invalidas]
+    return validas, errores
+
+def process_clientes_csv(
+    db: Session, *, bloques: Iterable[pd.DataFrame],
+    on_progress: Optional[Callable[[int, ResultadoImportacion], None]] = None
+) -> ResultadoImportacion:
+    """
+    Crea clientes desde un CSV leído por bloques (ver app.core.csv_stream).
+    Los RUT se comparan normalizados (sin puntos, guion ni espacios). Por bloque se hace una
+    sola consulta IN sobre rut_normalizado para detectar los ya registrados y una inserción masiva por lote.
+    Los RUT ya existentes o repetidos en el archivo se cuentan en skipped_count; las filas
+    inválidas se informan en errors y se omiten. Cada bloque se confirma por separado.
+    `on_progress(filas_procesadas, resultado_parcial)` se llama al terminar cada bloque.
+    """
+    resultado = ResultadoImportacion()
+    filas_procesadas = 0
+    ruts_vistos = set() # RUT ya procesados en bloques anteriores del mismo archivo
+    for bloque in bloques:
+        filas_procesadas += len(bloque)
+        validas, errores_bloque = _validar_clientes_df(bloque)
+        resultado.errors.extend(errores_bloque)
+
+        # Duplicados dentro del archivo: se conserva la primera aparición
+        repetidas = validas["rut_normalizado"].duplicated(keep="first") | validas["rut_normalizado"].isin(ruts_vistos)
+        nuevas = validas[~repetidas]
+        ruts_vistos.update(nuevas["rut_normalizado"])
+
+        ruts_existentes = set()
+        if not nuevas.empty:
+            ruts_existentes = {
+                rut for (rut,) in db.query(Cliente.rut_normalizado).filter(
+                    Cliente.rut_normalizado.in_(nuevas["rut_normalizado"].tolist())
+                )
+            }
+        nuevas = nuevas[~nuevas["rut_normalizado"].isin(ruts_existentes)]
+        resultado.skipped_count += len(validas) - len(nuevas)
+
+        registros = nuevas.astype(object).where(nuevas.notna(), None).to_dict("records")
+        try:
+            for inicio in range(0, len(registros), CLIENTES_BATCH_SIZE):
+                db.bulk_insert_mappings(Cliente, registros[inicio:inicio + CLIENTES_BATCH_SIZE])
+            crud_busqueda.indexar_clientes_por_rut(db, [r["rut_normalizado"] for r in registros], reemplazar=False)
+            if registros:
+                crud_tabla_version.incrementar(db, Cliente.__tablename__)
+            db.commit()
+            resultado.created_count += len(registros)
+        except Exception as e_bloque:
+            db.rollback()
+            primera_fila = int(bloque.index[0]) + 2 if len(bloque) else 0
+            resultado.errors.append(ErrorFilaCSV(
+                row=primera_fila, error=f"No se pudo guardar el bloque que comienza en esta fila: {e_bloque}"
+            ))
+
+        if on_progress:
+            on_progress(filas_procesadas, resultado)
+    return resultado
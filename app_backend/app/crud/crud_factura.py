@@ -1,19 +1,31 @@
 # app/crud/crud_factura.py
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, Iterable, Callable
 import pandas as pd
 from datetime import date
 
 from app.models.factura import Factura
-from app.models.vendedor import Vendedor
+from app.models.vendedor import Vendedor, VendedorClientePorcentaje
 from app.models.cliente import Cliente
 from app.schemas.factura import FacturaCreate, FacturaUpdate
-from sqlalchemy import func
+from app.schemas.importacion import ErrorFilaCSV, ResultadoImportacion
+from sqlalchemy import func, or_, and_
+from app.crud.paginacion import encode_cursor, decode_cursor, decode_cursor_fecha, decode_cursor_id
+from app.crud import crud_bono_ledger
+from app.core.rut import normalizar_rut_series
+
+# Todo lo que serializa schemas.factura.Factura, incluida la cartera del vendedor con el cliente
+# de cada asignación (sin esto se carga por separado para cada factura: N+1). La cartera va
+# con selectinload para no multiplicar las filas de la página
+_CARGA_FACTURA = (
+    joinedload(Factura.vendedor).selectinload(Vendedor.clientes_asignados).joinedload(VendedorClientePorcentaje.cliente),
+    joinedload(Factura.cliente),
+)
 
 def get_factura(db: Session, factura_id: int) -> Optional[Factura]:
-    return db.query(Factura).options(joinedload(Factura.vendedor), joinedload(Factura.cliente)).filter(Factura.id == factura_id).first()
+    return db.query(Factura).options(*_CARGA_FACTURA).filter(Factura.id == factura_id).first()
 
 def get_facturas(
     db: Session, 
@@ -22,10 +34,16 @@ def get_facturas(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     vendedor_id: Optional[int] = None,
-    cliente_id: Optional[int] = None
-) -> Tuple[List[Factura], int]:
-    
-    query = db.query(Factura).options(joinedload(Factura.vendedor), joinedload(Factura.cliente))
+    cliente_id: Optional[int] = None,
+    after: Optional[str] = None,
+    include_total: bool = True
+) -> Tuple[List[Factura], Optional[int], Optional[str]]:
+    """
+    Lista facturas ordenadas por (fecha_emision, id) descendente.
+    Si se entrega `after` (cursor de la página anterior) se pagina por clave en vez de OFFSET.
+    Devuelve (items, total_count, next_cursor); total_count es None si include_total es False.
+    """
+    query = db.query(Factura).options(*_CARGA_FACTURA)
 
     if start_date:
         query = query.filter(Factura.fecha_emision >= start_date)
@@ -36,13 +54,31 @@ def get_facturas(
     if cliente_id:
         query = query.filter(Factura.cliente_id == cliente_id)
 
-    total_count = query.with_entities(func.count(Factura.id)).scalar()
-    items = query.order_by(Factura.fecha_emision.desc()).offset(skip).limit(limit).all()
-    return items, total_count
+    total_count = query.with_entities(func.count(Factura.id)).scalar() if include_total else None
+
+    query = query.order_by(Factura.fecha_emision.desc(), Factura.id.desc())
+    if after:
+        fecha_cursor, id_cursor = decode_cursor(after, 2)
+        fecha_cursor, id_cursor = decode_cursor_fecha(fecha_cursor), decode_cursor_id(id_cursor)
+        # La cota fecha_emision <= cursor es redundante, pero permite iniciar el recorrido de
+        # ix_facturas_fecha_id en el cursor (el OR solo no se puede usar como rango)
+        query = query.filter(Factura.fecha_emision <= fecha_cursor, or_(
+            Factura.fecha_emision < fecha_cursor,
+            and_(Factura.fecha_emision == fecha_cursor, Factura.id < id_cursor)
+        ))
+    else:
+        query = query.offset(skip)
+
+    items = query.limit(limit).all()
+    next_cursor = encode_cursor(items[-1].fecha_emision, items[-1].id) if len(items) == limit else None
+    return items, total_count, next_cursor
 
 def create_factura(db: Session, *, factura_in: FacturaCreate) -> Factura:
     db_factura = Factura(**factura_in.model_dump())
     db.add(db_factura)
+    db.flush()
+    # Mantener el ledger de bonos en la misma transacción
+    crud_bono_ledger.recalcular_celdas(db, [crud_bono_ledger.celda_de_factura(db_factura)])
     db.commit()
     db.refresh(db_factura)
     return db_factura
@@ -53,10 +89,14 @@ def update_factura(db: Session, *, db_obj: Factura, obj_in: FacturaUpdate | Dict
     else:
         update_data = obj_in.model_dump(exclude_unset=True)
     
+    celda_anterior = crud_bono_ledger.celda_de_factura(db_obj)
     for field, value in update_data.items():
         setattr(db_obj, field, value)
         
     db.add(db_obj)
+    db.flush()
+    # La factura puede haber cambiado de mes, vendedor o cliente: se recalculan ambas celdas
+    crud_bono_ledger.recalcular_celdas(db, [celda_anterior, crud_bono_ledger.celda_de_factura(db_obj)])
     db.commit()
     db.refresh(db_obj)
     return db_obj
@@ -65,7 +105,10 @@ def delete_factura(db: Session, *, factura_id: int) -> Optional[Factura]:
     db_obj = db.query(Factura).filter(Factura.id == factura_id).first()
     if db_obj:
         try:
+            celda = crud_bono_ledger.celda_de_factura(db_obj)
             db.delete(db_obj)
+            db.flush()
+            crud_bono_ledger.recalcular_celdas(db, [celda])
             db.commit()
         except IntegrityError:
             db.rollback()
@@ -75,44 +118,126 @@ def delete_factura(db: Session, *, factura_id: int) -> Optional[Factura]:
             )
     return db_obj
 
-# ... Función process_facturas_csv 
+# ... Función process_facturas_csv
 
-def process_facturas_csv(db: Session, *, df: pd.DataFrame) -> Tuple[List[Factura], List[str]]:
-    facturas_procesadas = []
-    errores = []
-    vendedores_rut_map = {v.rut: v.id for v in db.query(Vendedor.id, Vendedor.rut).all()}
-    clientes_rut_map = {c.rut: c.id for c in db.query(Cliente.id, Cliente.rut).all()}
+FACTURAS_BATCH_SIZE = 1000 # Filas por INSERT (executemany) en la carga masiva
 
-    for index, row in df.iterrows():
-        try:
-            vendedor_rut = str(row['vendedor_rut']).strip()
-            cliente_rut = str(row['cliente_rut']).strip()
-            vendedor_id = vendedores_rut_map.get(vendedor_rut)
-            cliente_id = clientes_rut_map.get(cliente_rut)
-            
-            if not vendedor_id:
-                errores.append(f"Fila {index + 2}: Vendedor con RUT '{vendedor_rut}' no encontrado.")
-                continue
-            if not cliente_id:
-                errores.append(f"Fila {index + 2}: Cliente con RUT '{cliente_rut}' no encontrado.")
-                continue
-
-            factura_in = FacturaCreate(
-                numero_orden=str(row['numero_orden']),
-                numero_caso=str(row.get('numero_caso', '')),
-                honorarios_generados=float(str(row['honorarios_generados']).replace(',', '.')),
-                gastos_generados=float(str(row['gastos_generados']).replace(',', '.')),
-                fecha_venta=pd.to_datetime(row['fecha_venta']).date(),
-                vendedor_id=vendedor_id,
-                cliente_id=cliente_id
-            )
-            db_factura = create_factura(db, factura_in=factura_in)
-            facturas_procesadas.append(db_factura)
-        except Exception as e:
-            errores.append(f"Fila {index + 2}: Error - {str(e)}")
+def _columna_texto(df: pd.DataFrame, columna: str) -> pd.Series:
+    if columna not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[columna].fillna("").astype(str).str.strip()
+
+def _columna_numero(df: pd.DataFrame, columna: str) -> pd.Series:
+    return pd.to_numeric(_columna_texto(df, columna).str.replace(",", ".", regex=False), errors="coerce")
+
+def _columna_fecha(df: pd.DataFrame, columna: str) -> pd.Series:
+    texto = _columna_texto(df, columna)
+    fechas = pd.to_datetime(texto, errors="coerce")
+    # Reintento fila a fila solo para los formatos que la inferencia vectorizada no reconoció
+    pendientes = fechas.isna() & (texto != "")
+    if pendientes.any():
+        fechas.loc[pendientes] = pd.to_datetime(texto[pendientes], errors="coerce", format="mixed")
+    return fechas
+
+def _validar_facturas_df(
+    df: pd.DataFrame, vendedores_rut_map: Dict[str, int], clientes_rut_map: Dict[str, int]
+) -> Tuple[List[Dict[str, Any]], List[ErrorFilaCSV]]:
+    """
+    Valida todas las filas de una vez (operaciones vectorizadas de pandas).
+    Devuelve los mapeos listos para insertar y los errores por fila.
+    """
+    df = df.rename(columns=lambda c: str(c).strip().lower())
+    columna_fecha = "fecha_emision" if "fecha_emision" in df.columns else "fecha_venta"
+
+    vendedor_rut = _columna_texto(df, "vendedor_rut")
+    cliente_rut = _columna_texto(df, "cliente_rut")
+    # Los mapas están indexados por RUT normalizado: '12.345.678-9' y '12345678-9' coinciden
+    vendedor_id = normalizar_rut_series(vendedor_rut).map(vendedores_rut_map)
+    cliente_id = normalizar_rut_series(cliente_rut).map(clientes_rut_map)
+    honorarios = _columna_numero(df, "honorarios_generados")
+    gastos = _columna_numero(df, "gastos_generados")
+    fechas = _columna_fecha(df, columna_fecha)
+    filas = df.index + 2 # +1 por la cabecera y +1 porque las líneas parten en 1
+
+    validaciones = [
+        (vendedor_id.isna(), vendedor_rut, lambda rut: f"Vendedor con RUT '{rut}' no encontrado."),
+        (cliente_id.isna(), cliente_rut, lambda rut: f"Cliente con RUT '{rut}' no encontrado."),
+        (honorarios.isna() | (honorarios < 0), vendedor_rut, lambda _: "'honorarios_generados' debe ser un número mayor o igual a 0."),
+        (gastos.isna() | (gastos < 0), vendedor_rut, lambda _: "'gastos_generados' debe ser un número mayor o igual a 0."),
+        (fechas.isna(), vendedor_rut, lambda _: f"'{columna_fecha}' no es una fecha válida."),
+    ]
+
+    errores: List[ErrorFilaCSV] = []
+    filas_invalidas = pd.Series(False, index=df.index)
+    for mascara, ruts, mensaje in validaciones:
+        filas_invalidas |= mascara
+        for fila, rut in zip(filas[mascara.to_numpy()], ruts[mascara]):
+            errores.append(ErrorFilaCSV(row=int(fila), rut=rut or None, error=mensaje(rut)))
+    errores.sort(key=lambda e: e.row)
 
     if errores:
-        db.rollback()
         return [], errores
-    else:
-        return facturas_procesadas, []
\ No newline at end of file
+
+    numero_orden = _columna_texto(df, "numero_orden")
+    numero_caso = _columna_texto(df, "numero_caso")
+    mappings = [
+        {
+            "numero_orden": orden or None,
+            "numero_caso": caso or None,
+            "honorarios_generados": honorario,
+            "gastos_generados": gasto,
+            "fecha_emision": fecha,
+            "vendedor_id": int(v_id),
+            "cliente_id": int(c_id),
+        }
+        for orden, caso, honorario, gasto, fecha, v_id, c_id in zip(
+            numero_orden.tolist(), numero_caso.tolist(), honorarios.tolist(), gastos.tolist(),
+            fechas.dt.to_pydatetime().tolist(), vendedor_id.tolist(), cliente_id.tolist()
+        )
+    ]
+    return mappings, []
+
+def process_facturas_csv(
+    db: Session, *, bloques: Iterable[pd.DataFrame],
+    on_progress: Optional[Callable[[int, ResultadoImportacion], None]] = None
+) -> ResultadoImportacion:
+    """
+    Carga masiva de facturas por bloques (ver app.core.csv_stream):
+    1. Cada bloque se valida completo (vectorizado).
+    2. Mientras no haya errores, el bloque se inserta por lotes (executemany) dentro de la
+       transacción abierta, sin esperar al final del archivo.
+    Al terminar se hace un único commit; si algún bloque tuvo errores se hace rollback de todo.
+    `on_progress(filas_procesadas, resultado_parcial)` se llama al terminar cada bloque.
+    """
+    vendedores_rut_map = {v.rut_normalizado: v.id for v in db.query(Vendedor.id, Vendedor.rut_normalizado).all()}
+    clientes_rut_map = {c.rut_normalizado: c.id for c in db.query(Cliente.id, Cliente.rut_normalizado).all()}
+
+    errores: List[ErrorFilaCSV] = []
+    created_count = 0
+    filas_procesadas = 0
+    periodos_importados = set()
+    try:
+        for bloque in bloques:
+            filas_procesadas += len(bloque)
+            mappings, errores_bloque = _validar_facturas_df(bloque, vendedores_rut_map, clientes_rut_map)
+            errores.extend(errores_bloque)
+            # Si ya hubo errores se sigue validando para informarlos todos, pero ya no se inserta nada
+            if not errores:
+                for inicio in range(0, len(mappings), FACTURAS_BATCH_SIZE):
+                    db.bulk_insert_mappings(Factura, mappings[inicio:inicio + FACTURAS_BATCH_SIZE])
+                created_count += len(mappings)
+                periodos_importados.update(crud_bono_ledger.periodo_de(m["fecha_emision"]) for m in mappings)
+            if on_progress:
+                on_progress(filas_procesadas, ResultadoImportacion(created_count=created_count, errors=errores))
+
+        if errores:
+            db.rollback()
+            return ResultadoImportacion(errors=errores)
+        # Los periodos con facturas nuevas se rematerializan la próxima vez que se consulten
+        crud_bono_ledger.invalidar_periodos(db, periodos_importados)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return ResultadoImportacion(created_count=created_count)
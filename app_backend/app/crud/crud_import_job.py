@@ -0,0 +1,65 @@
+# app/crud/crud_import_job.py
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from typing import List, Optional
+from uuid import uuid4
+
+from app.models.import_job import ImportJob, ImportJobStatus
+from app.schemas.importacion import ResultadoImportacion
+
+MAX_ERRORES_GUARDADOS = 500 # El detalle de errores se trunca; error_count siempre tiene el total
+
+def get_import_job(db: Session, job_id: str) -> Optional[ImportJob]:
+    return db.query(ImportJob).filter(ImportJob.id == job_id).first()
+
+def get_unfinished_import_jobs(db: Session) -> List[ImportJob]:
+    """Trabajos pendientes o en curso, de cualquier proceso."""
+    return db.query(ImportJob).filter(
+        ImportJob.status.in_([ImportJobStatus.PENDING, ImportJobStatus.RUNNING])
+    ).all()
+
+def create_import_job(
+    db: Session, *, tipo: str, filename: Optional[str], created_by_id: Optional[int], worker: Optional[str] = None
+) -> ImportJob:
+    db_job = ImportJob(
+        id=uuid4().hex,
+        tipo=tipo,
+        filename=filename,
+        status=ImportJobStatus.PENDING,
+        created_by_id=created_by_id,
+        worker=worker
+    )
+    db.add(db_job)
+    db.commit()
+    db.refresh(db_job)
+    return db_job
+
+def mark_import_job_running(db: Session, *, db_job: ImportJob) -> ImportJob:
+    db_job.status = ImportJobStatus.RUNNING
+    db_job.started_at = datetime.now(timezone.utc)
+    db.add(db_job)
+    db.commit()
+    return db_job
+
+def update_import_job_progress(
+    db: Session, *, db_job: ImportJob, rows_processed: int, resultado: ResultadoImportacion
+) -> ImportJob:
+    db_job.rows_processed = rows_processed
+    db_job.created_count = resultado.created_count
+    db_job.updated_count = resultado.updated_count
+    db_job.skipped_count = resultado.skipped_count
+    db_job.error_count = len(resultado.errors)
+    db_job.errors = [e.model_dump() for e in resultado.errors[:MAX_ERRORES_GUARDADOS]]
+    db.add(db_job)
+    db.commit()
+    return db_job
+
+def finish_import_job(
+    db: Session, *, db_job: ImportJob, status: ImportJobStatus, message: Optional[str] = None
+) -> ImportJob:
+    db_job.status = status
+    db_job.message = message
+    db_job.finished_at = datetime.now(timezone.utc)
+    db.add(db_job)
+    db.commit()
+    return db_job
@@ -1,15 +1,18 @@
 # app/crud/crud_reporte.py
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, cast, Float
-from typing import List, Optional, Tuple, Any, Dict
+from sqlalchemy import func, or_, and_, case, cast, Float
+from typing import Iterator, List, Optional, Tuple, Any, Dict
 from datetime import date
-from collections import defaultdict
 
 from app.models.factura import Factura
-from app.models.vendedor import Vendedor
+from app.models.vendedor import Vendedor, VendedorClientePorcentaje
 from app.models.cliente import Cliente
+from app.models.bono_ledger import BonoLedger
+from app.core.config import settings
+from app.crud import crud_bono_ledger
+from app.core.rut import normalizar_rut
 
-def get_reporte_facturacion(
+def _consulta_reporte(
     db: Session,
     *,
     start_date: date,
@@ -17,12 +20,9 @@ def get_reporte_facturacion(
     numero_caso: Optional[str] = None,
     vendedor_id: Optional[int] = None,
     cliente_id: Optional[int] = None,
-    vendedor_rut: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100
-) -> Tuple[List[Any], int, float, List[Dict[str, Any]]]: # <-- Tipo de retorno actualizado
-
-    # Iniciar la consulta uniendo las tablas necesarias
+    vendedor_rut: Optional[str] = None
+):
+    """Consulta base del reporte (facturas con vendedor y cliente) con los filtros aplicados; devuelve (query, filtro_rut)."""
     query = db.query(
         Factura.id.label("factura_id"),
         Factura.numero_orden,
@@ -46,32 +46,182 @@ def get_reporte_facturacion(
         query = query.filter(Factura.vendedor_id == vendedor_id)
     if cliente_id:
         query = query.filter(Factura.cliente_id == cliente_id)
-    if vendedor_rut:
-        rut_limpio = vendedor_rut.replace(".", "").replace("-", "")
-        query = query.filter(func.replace(func.replace(Vendedor.rut, '.', ''), '-', '').ilike(f"%{rut_limpio}%"))
+    filtro_rut = None
+    rut_prefijo = normalizar_rut(vendedor_rut)
+    if rut_prefijo:
+        # Búsqueda por prefijo del RUT normalizado como rango [prefijo, prefijo') sobre el índice
+        rut_limite = rut_prefijo[:-1] + chr(ord(rut_prefijo[-1]) + 1)
+        filtro_rut = and_(Vendedor.rut_normalizado >= rut_prefijo, Vendedor.rut_normalizado < rut_limite)
+        query = query.filter(filtro_rut)
+    return query, filtro_rut
+
+def _con_bono(query):
+    """
+    Agrega el bono por factura calculado en SQL: el porcentaje de la asignación vendedor-cliente
+    llega por OUTER JOIN (0 si no hay) y se aplica sobre el margen positivo, con un orden estable.
+    """
+    porcentaje = func.coalesce(VendedorClientePorcentaje.porcentaje_bono, 0.0)
+    neto = func.coalesce(Factura.honorarios_generados, 0.0) - func.coalesce(Factura.gastos_generados, 0.0)
+    return query.outerjoin(
+        VendedorClientePorcentaje,
+        and_(
+            VendedorClientePorcentaje.vendedor_id == Factura.vendedor_id,
+            VendedorClientePorcentaje.cliente_id == Factura.cliente_id
+        )
+    ).add_columns(
+        (case((neto > 0, neto), else_=0.0) * porcentaje).label("bono_calculado"),
+        (porcentaje * 100).label("porcentaje_bono_aplicado")
+    ).order_by(
+        Factura.fecha_emision.desc(), Factura.id.desc()
+    )
+
+def get_reporte_facturacion(
+    db: Session,
+    *,
+    start_date: date,
+    end_date: date,
+    numero_caso: Optional[str] = None,
+    vendedor_id: Optional[int] = None,
+    cliente_id: Optional[int] = None,
+    vendedor_rut: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Tuple[List[Any], int, float, List[Dict[str, Any]]]: # <-- Tipo de retorno actualizado
+
+    query, filtro_rut = _consulta_reporte(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        numero_caso=numero_caso,
+        vendedor_id=vendedor_id,
+        cliente_id=cliente_id,
+        vendedor_rut=vendedor_rut
+    )
 
     # --- LÓGICA DE SUMATORIAS ---
-    # Ejecutar la consulta filtrada una vez para obtener todos los datos para los cálculos
-    all_filtered_results = query.all()
+    # Las sumatorias se calculan en la base de datos; nunca se carga el rango completo en memoria.
+
+    # Los meses cerrados completos se leen del ledger, salvo que se filtre por numero_caso
+    # (el ledger no guarda ese dato); el resto del rango se agrega desde facturas.
+    rango_ledger = None
+    if settings.BONO_LEDGER_ENABLED and not numero_caso:
+        rango_ledger = crud_bono_ledger.rango_materializado(db, start_date, end_date)
+
+    query_totales = query
+    if rango_ledger:
+        desde, hasta, _ = rango_ledger
+        query_totales = query.filter(or_(Factura.fecha_emision < desde, Factura.fecha_emision >= hasta))
 
-    # 1. Calcular la sumatoria total de honorarios
-    sumatoria_total_honorarios = sum(item.honorarios_generados for item in all_filtered_results)
+    # 1. Conteo y sumatoria por vendedor en una sola consulta (GROUP BY vendedor_id)
+    filas_vendedor = query_totales.with_entities(
+        Vendedor.id.label("vendedor_id"),
+        Vendedor.nombre_completo.label("vendedor_nombre"),
+        func.count(Factura.id).label("num_facturas"),
+        func.coalesce(func.sum(Factura.honorarios_generados), 0.0).label("total_honorarios")
+    ).group_by(Vendedor.id, Vendedor.nombre_completo).all()
+
+    if rango_ledger:
+        query_ledger = db.query(
+            Vendedor.id.label("vendedor_id"),
+            Vendedor.nombre_completo.label("vendedor_nombre"),
+            func.sum(BonoLedger.num_facturas).label("num_facturas"),
+            func.sum(BonoLedger.honorarios).label("total_honorarios")
+        ).select_from(BonoLedger).join(
+            Vendedor, BonoLedger.vendedor_id == Vendedor.id
+        ).filter(BonoLedger.periodo.in_(rango_ledger[2]))
+        if vendedor_id:
+            query_ledger = query_ledger.filter(BonoLedger.vendedor_id == vendedor_id)
+        if cliente_id:
+            query_ledger = query_ledger.filter(BonoLedger.cliente_id == cliente_id)
+        if filtro_rut is not None:
+            query_ledger = query_ledger.filter(filtro_rut)
+        filas_vendedor += query_ledger.group_by(Vendedor.id, Vendedor.nombre_completo).all()
 
-    # 2. Calcular las sumatorias por vendedor
-    sumatorias_vendedor_dict = defaultdict(lambda: {"vendedor_nombre": "", "total_honorarios": 0.0})
-    for item in all_filtered_results:
-        sumatorias_vendedor_dict[item.vendedor_id]["vendedor_nombre"] = item.vendedor_nombre
-        sumatorias_vendedor_dict[item.vendedor_id]["total_honorarios"] += item.honorarios_generados
+    por_vendedor: Dict[int, Dict[str, Any]] = {}
+    total_count = 0
+    sumatoria_total_honorarios = 0.0
+    for fila in filas_vendedor:
+        actual = por_vendedor.setdefault(fila.vendedor_id, {
+            "vendedor_id": fila.vendedor_id,
+            "vendedor_nombre": fila.vendedor_nombre,
+            "total_honorarios": 0.0
+        })
+        actual["total_honorarios"] += fila.total_honorarios or 0.0
+        total_count += int(fila.num_facturas or 0) # SUM de enteros llega como Decimal en MySQL
+        sumatoria_total_honorarios += fila.total_honorarios or 0.0
 
-    sumatorias_por_vendedor = [
-        {"vendedor_id": vid, **data} for vid, data in sumatorias_vendedor_dict.items()
-    ]
-    sumatorias_por_vendedor.sort(key=lambda x: x["total_honorarios"], reverse=True)
+    # 2. Sumatorias por vendedor, de mayor a menor
+    sumatorias_por_vendedor = sorted(por_vendedor.values(), key=lambda v: v["total_honorarios"], reverse=True)
 
     # --- FIN LÓGICA DE SUMATORIAS ---
 
-    # 3. Aplicar paginación a los resultados ya obtenidos
-    total_count = len(all_filtered_results)
-    paginated_items = all_filtered_results[skip : skip + limit]
+    # 3. Solo se trae la página pedida (LIMIT/OFFSET), ya con el bono por factura
+    paginated_items = _con_bono(query).offset(skip).limit(limit).all()
 
-    return paginated_items, total_count, sumatoria_total_honorarios, sumatorias_por_vendedor
\ No newline at end of file
+    return paginated_items, total_count, sumatoria_total_honorarios, sumatorias_por_vendedor
+
+def get_reporte_facturacion_enriquecido(
+    db: Session,
+    *,
+    start_date: date,
+    end_date: date,
+    numero_caso: Optional[str] = None,
+    vendedor_id: Optional[int] = None,
+    cliente_id: Optional[int] = None,
+    vendedor_rut: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Dict[str, Any]:
+    """
+    Reporte de facturación completo (forma de ReporteResponse): la página de facturas, ya con
+    nombres, RUT y bono por factura (una consulta), más las sumatorias.
+    Lo usan la ruta síncrona /reportes/facturacion y la async /async/reportes/facturacion.
+    """
+    items_db, total_count, sumatoria_total, sumatorias_vendedor = get_reporte_facturacion(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        numero_caso=numero_caso,
+        vendedor_id=vendedor_id,
+        cliente_id=cliente_id,
+        vendedor_rut=vendedor_rut,
+        skip=skip,
+        limit=limit
+    )
+    # Las filas van como dicts {etiqueta: valor}, listos para orjson (app.api.respuestas) o para
+    # que FastAPI los valide una sola vez contra ReporteResponse. Las claves se leen una vez:
+    # dict(zip(...)) es varias veces más rápido que Row._asdict() fila a fila
+    claves = items_db[0]._fields if items_db else ()
+    return {
+        "items": [dict(zip(claves, fila)) for fila in items_db],
+        "total_count": total_count,
+        "sumatoria_total_honorarios": sumatoria_total,
+        "sumatorias_por_vendedor": sumatorias_vendedor
+    }
+
+def iterar_reporte_facturacion(
+    db: Session,
+    *,
+    start_date: date,
+    end_date: date,
+    numero_caso: Optional[str] = None,
+    vendedor_id: Optional[int] = None,
+    cliente_id: Optional[int] = None,
+    vendedor_rut: Optional[str] = None,
+    lote: Optional[int] = None
+) -> Iterator[Any]:
+    """
+    Todas las filas del reporte (mismas columnas y orden que la página) con un cursor del
+    servidor: yield_per activa stream_results y las filas llegan de a `lote`, así la memoria
+    no depende del tamaño del rango. Para las exportaciones.
+    """
+    query, _ = _consulta_reporte(
+        db,
+        start_date=start_date,
+        end_date=end_date,
+        numero_caso=numero_caso,
+        vendedor_id=vendedor_id,
+        cliente_id=cliente_id,
+        vendedor_rut=vendedor_rut
+    )
+    yield from _con_bono(query).yield_per(lote or settings.EXPORT_CHUNK_SIZE)
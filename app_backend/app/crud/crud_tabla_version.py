@@ -0,0 +1,26 @@
+# app/crud/crud_tabla_version.py
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.tabla_version import TablaVersion
+
+def get_version(db: Session, tabla: str) -> int:
+    """Versión actual de la tabla (0 si nunca se registró un cambio)."""
+    version = db.query(TablaVersion.version).filter(TablaVersion.tabla == tabla).scalar()
+    return version or 0
+
+def incrementar(db: Session, tabla: str) -> None:
+    """Registra un cambio en la tabla (sin commit: se confirma junto con el cambio)."""
+    def _update() -> int:
+        return db.query(TablaVersion).filter(TablaVersion.tabla == tabla).update(
+            {TablaVersion.version: TablaVersion.version + 1}, synchronize_session=False
+        )
+
+    if _update():
+        return
+    # Primera escritura de la tabla: se crea la fila; si otra transacción la creó antes, se actualiza
+    try:
+        with db.begin_nested():
+            db.add(TablaVersion(tabla=tabla, version=1))
+    except IntegrityError:
+        _update()
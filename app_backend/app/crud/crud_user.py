@@ -1,5 +1,8 @@
 # app/crud/crud_user.py
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import CacheTTL
+from app.core.config import settings
 from app.models.user import User, ApprovalStatus, UserRole
 from app.schemas.user import UserCreate, UserUpdate
 from app.core.security import get_password_hash
@@ -15,6 +18,34 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     return db.query(User).filter(User.username == username).first()
 
+# --- Caché de usuarios autenticados ---
+# Se guardan los valores de las columnas, no el objeto ORM (que pertenece a una sesión)
+cache_usuarios = CacheTTL(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
+
+def get_user_by_username_cacheado(db: Session, username: str) -> Optional[User]:
+    """
+    get_user_by_username para autenticar cada petición. En un hit se reconstruye el User y
+    se incorpora a la sesión sin consultar (merge load=False), así los endpoints pueden
+    modificar current_user y hacer commit igual que con el objeto leído de la base.
+    """
+    if not settings.USER_CACHE_ENABLED:
+        return get_user_by_username(db, username=username)
+    columnas = cache_usuarios.get(username)
+    if columnas is not None:
+        usuario = User(**columnas)
+        make_transient_to_detached(usuario)
+        return db.merge(usuario, load=False)
+    usuario = get_user_by_username(db, username=username)
+    if usuario:
+        cache_usuarios.set(username, {
+            atributo.key: getattr(usuario, atributo.key) for atributo in inspect(User).column_attrs
+        })
+    return usuario
+
+def invalidar_cache_usuario(*usernames: str) -> None:
+    """Llamar después del commit de cualquier cambio en un usuario (estado, contraseña, 2FA...)."""
+    cache_usuarios.invalidar(*usernames)
+
 # --- FUNCIÓN CORREGIDA Y RENOMBRADA ---
 # Devuelve solo usuarios activos y aprobados para la gestión principal
 def get_active_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
@@ -51,6 +82,7 @@ def create_user(db: Session, *, user_in: UserCreate) -> User:
     return db_user
 
 def update_user(db: Session, *, db_user: User, user_in: Union[UserUpdate, Dict[str, Any]]) -> User:
+    username_anterior = db_user.username
     update_data = user_in if isinstance(user_in, dict) else user_in.model_dump(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
         hashed_password = get_password_hash(update_data["password"])
@@ -65,6 +97,7 @@ def update_user(db: Session, *, db_user: User, user_in: Union[UserUpdate, Dict[s
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    invalidar_cache_usuario(username_anterior, db_user.username)
     return db_user
 
 def approve_user(db: Session, *, db_user: User) -> User:
@@ -73,6 +106,7 @@ def approve_user(db: Session, *, db_user: User) -> User:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    invalidar_cache_usuario(db_user.username)
     return db_user
 
 def reject_user(db: Session, *, db_user: User) -> User:
@@ -81,6 +115,7 @@ def reject_user(db: Session, *, db_user: User) -> User:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    invalidar_cache_usuario(db_user.username)
     return db_user
 
 def is_superuser(user: User) -> bool:
@@ -1,25 +1,41 @@
 # app/crud/crud_vendedor.py
 from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, and_
 from app.models.vendedor import Vendedor, VendedorClientePorcentaje
 from app.models.cliente import Cliente
 from app.schemas.vendedor import VendedorCreate, VendedorUpdate, VendedorClientePorcentajeCreate, VendedorClientePorcentajeUpdate
-from typing import List, Optional, Tuple, Any, Dict, Union
+from typing import List, Optional, Tuple, Any, Dict, Union, Iterable, Callable
 import pandas as pd
 
+from app.crud.paginacion import encode_cursor, decode_cursor, decode_cursor_id, decode_cursor_texto
+from app.core.rut import normalizar_rut, normalizar_rut_series
+from app.crud import crud_bono_ledger, crud_busqueda, crud_tabla_version
+from app.schemas.importacion import ErrorFilaCSV, ResultadoImportacion
+
 # CRUD para Vendedor
 def get_vendedor(db: Session, vendedor_id: int) -> Optional[Vendedor]:
     return db.query(Vendedor).options(joinedload(Vendedor.clientes_asignados).joinedload(VendedorClientePorcentaje.cliente)).filter(Vendedor.id == vendedor_id).first()
 
 def get_vendedor_by_rut(db: Session, rut: str) -> Optional[Vendedor]:
-    return db.query(Vendedor).filter(Vendedor.rut == rut).first()
+    return db.query(Vendedor).filter(Vendedor.rut_normalizado == normalizar_rut(rut)).first()
 
 def get_vendedores(
-    db: Session, skip: int = 0, limit: int = 10, search: Optional[str] = None
-) -> Tuple[List[Vendedor], int]:
+    db: Session, skip: int = 0, limit: int = 10, search: Optional[str] = None,
+    after: Optional[str] = None, include_total: bool = True,
+    search_mode: str = crud_busqueda.MODO_CONTAINS
+) -> Tuple[List[Vendedor], Optional[int], Optional[str]]:
     query = db.query(Vendedor).options(joinedload(Vendedor.clientes_asignados).joinedload(VendedorClientePorcentaje.cliente))
 
-    if search:
+    # search_mode "trigram": índice de trigramas ordenado por relevancia (términos < 3 letras usan "contains")
+    coincidencias = None
+    if search and search_mode == crud_busqueda.MODO_TRIGRAM:
+        if after:
+            raise ValueError("La paginación por cursor no está disponible con search_mode=trigram.")
+        coincidencias = crud_busqueda.subconsulta_coincidencias(db, crud_busqueda.ENTIDAD_VENDEDOR, search)
+
+    if coincidencias is not None:
+        query = query.join(coincidencias, coincidencias.c.entidad_id == Vendedor.id)
+    elif search:
         search_term = f"%{search.lower()}%"
         query = query.filter(
             or_(
@@ -28,10 +44,32 @@ def get_vendedores(
             )
         )
 
-    total_count_query = query.with_entities(func.count(Vendedor.id))
-    total_count = total_count_query.scalar() or 0
-    items = query.order_by(Vendedor.nombre_completo).offset(skip).limit(limit).all()
-    return items, total_count
+    total_count = None
+    if include_total:
+        total_count_query = query.with_entities(func.count(Vendedor.id))
+        total_count = total_count_query.scalar() or 0
+
+    if coincidencias is not None:
+        query = query.order_by(
+            *crud_busqueda.orden_relevancia(coincidencias, search, Vendedor.nombre_completo, Vendedor.rut_normalizado),
+            Vendedor.nombre_completo, Vendedor.id
+        )
+        return query.offset(skip).limit(limit).all(), total_count, None
+
+    query = query.order_by(Vendedor.nombre_completo, Vendedor.id)
+    if after:
+        nombre_cursor, id_cursor = decode_cursor(after, 2)
+        nombre_cursor, id_cursor = decode_cursor_texto(nombre_cursor), decode_cursor_id(id_cursor)
+        query = query.filter(or_(
+            Vendedor.nombre_completo > nombre_cursor,
+            and_(Vendedor.nombre_completo == nombre_cursor, Vendedor.id > id_cursor)
+        ))
+    else:
+        query = query.offset(skip)
+
+    items = query.limit(limit).all()
+    next_cursor = encode_cursor(items[-1].nombre_completo, items[-1].id) if len(items) == limit else None
+    return items, total_count, next_cursor
 
 def create_vendedor(db: Session, *, vendedor_in: VendedorCreate) -> Vendedor:
     db_vendedor = Vendedor(
@@ -40,6 +78,9 @@ def create_vendedor(db: Session, *, vendedor_in: VendedorCreate) -> Vendedor:
         sueldo_base=vendedor_in.sueldo_base
     )
     db.add(db_vendedor)
+    db.flush()
+    crud_busqueda.indexar_vendedores(db, [db_vendedor])
+    crud_tabla_version.incrementar(db, Vendedor.__tablename__)
     db.commit()
     db.refresh(db_vendedor)
     return db_vendedor
@@ -51,6 +92,9 @@ def update_vendedor(
     for field, value in update_data.items():
         setattr(db_vendedor, field, value)
     db.add(db_vendedor)
+    if "nombre_completo" in update_data or "rut" in update_data:
+        crud_busqueda.indexar_vendedores(db, [db_vendedor])
+    crud_tabla_version.incrementar(db, Vendedor.__tablename__)
     db.commit()
     db.refresh(db_vendedor)
     return db_vendedor
@@ -59,9 +103,18 @@ def remove_vendedor(db: Session, *, vendedor_id: int) -> Optional[Vendedor]:
     db_vendedor = db.query(Vendedor).get(vendedor_id)
     if db_vendedor:
         db.delete(db_vendedor)
+        crud_busqueda.desindexar(db, crud_busqueda.ENTIDAD_VENDEDOR, vendedor_id)
+        crud_tabla_version.incrementar(db, Vendedor.__tablename__)
         db.commit()
     return db_vendedor
 
+def get_vendedores_simple(db: Session) -> List[Any]:
+    """
+    Lista (id, nombre_completo) de todos los vendedores para los selectores. Solo se leen
+    esas dos columnas: sin asignaciones, sin COUNT y sin instanciar objetos Vendedor.
+    """
+    return db.query(Vendedor.id, Vendedor.nombre_completo).order_by(Vendedor.nombre_completo, Vendedor.id).all()
+
 # --- CRUD PARA ASIGNACIONES ---
 def get_asignacion(db: Session, vendedor_id: int, cliente_id: int) -> Optional[VendedorClientePorcentaje]:
     return db.query(VendedorClientePorcentaje).options(
@@ -79,6 +132,9 @@ def add_cliente_a_vendedor(
         raise ValueError(f"El vendedor ya tiene una asignación para el cliente ID {asignacion_in.cliente_id}.")
     db_asignacion = VendedorClientePorcentaje(**asignacion_in.model_dump(), vendedor_id=vendedor.id)
     db.add(db_asignacion)
+    crud_bono_ledger.actualizar_porcentaje(
+        db, vendedor_id=vendedor.id, cliente_id=db_asignacion.cliente_id, porcentaje=db_asignacion.porcentaje_bono
+    )
     db.commit()
     db.refresh(db_asignacion)
     return db_asignacion
@@ -88,6 +144,10 @@ def update_porcentaje_cliente_vendedor(
 ) -> VendedorClientePorcentaje:
     db_asignacion.porcentaje_bono = asignacion_in.porcentaje_bono
     db.add(db_asignacion)
+    crud_bono_ledger.actualizar_porcentaje(
+        db, vendedor_id=db_asignacion.vendedor_id, cliente_id=db_asignacion.cliente_id,
+        porcentaje=db_asignacion.porcentaje_bono
+    )
     db.commit()
     db.refresh(db_asignacion)
     return db_asignacion
@@ -96,41 +156,138 @@ def remove_cliente_de_vendedor(db: Session, *, vendedor_id: int, cliente_id: int
     db_asignacion = get_asignacion(db, vendedor_id=vendedor_id, cliente_id=cliente_id)
     if db_asignacion:
         db.delete(db_asignacion)
+        # Sin asignación el porcentaje aplicable pasa a ser 0
+        crud_bono_ledger.actualizar_porcentaje(db, vendedor_id=vendedor_id, cliente_id=cliente_id, porcentaje=0.0)
         db.commit()
     return db_asignacion
 
 # --- FUNCIÓN PARA PROCESAR CSV ---
-def process_vendedores_csv(db: Session, *, df: pd.DataFrame) -> Tuple[List[Vendedor], List[str]]:
-    vendedores_procesados = []
-    errores = []
-    for index, row in df.iterrows():
-        try:
-            rut = str(row['rut']).strip()
-            nombre_completo = str(row['nombre_completo']).strip()
-            sueldo_base_str = str(row['sueldo_base']).strip()
-            if not rut or not nombre_completo or not sueldo_base_str:
-                errores.append(f"Fila {index + 2}: Datos faltantes.")
-                continue
-            try:
-                sueldo_base = float(sueldo_base_str.replace('.', '').replace(',', '.'))
-            except ValueError:
-                errores.append(f"Fila {index + 2} (RUT: {rut}): 'sueldo_base' no es un número válido.")
-                continue
-
-            db_vendedor = get_vendedor_by_rut(db, rut=rut)
-            if db_vendedor:
-                update_data = VendedorUpdate(nombre_completo=nombre_completo, sueldo_base=sueldo_base)
-                updated_vendedor = update_vendedor(db, db_vendedor=db_vendedor, vendedor_in=update_data)
-                vendedores_procesados.append(updated_vendedor)
-            else:
-                create_data = VendedorCreate(nombre_completo=nombre_completo, rut=rut, sueldo_base=sueldo_base)
-                new_vendedor = create_vendedor(db, vendedor_in=create_data)
-                vendedores_procesados.append(new_vendedor)
-        except Exception as e:
-            errores.append(f"Fila {index + 2} (RUT: {row.get('rut', 'N/A')}): Error inesperado - {str(e)}")
-
-    if errores:
-        db.rollback()
-        return [], errores
+VENDEDORES_BATCH_SIZE = 1000 # Filas por sentencia INSERT ... ON DUPLICATE KEY UPDATE
+
+def _validar_vendedores_df(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], List[ErrorFilaCSV]]:
+    """
+    Valida un bloque del CSV de forma vectorizada y devuelve las filas listas para el upsert.
+    Si un RUT se repite dentro del bloque (comparando el RUT normalizado) prevalece la última fila,
+    igual que al procesar en orden.
+    """
+    rut = df.get("rut", pd.Series("", index=df.index)).fillna("").astype(str).str.strip()
+    nombre = df.get("nombre_completo", pd.Series("", index=df.index)).fillna("").astype(str).str.strip()
+    sueldo_str = df.get("sueldo_base", pd.Series("", index=df.index)).fillna("").astype(str).str.strip()
+    sueldo = pd.to_numeric(
+        sueldo_str.str.replace(".", "", regex=False).str.replace(",", ".", regex=False), errors="coerce"
+    )
+    filas = df.index + 2
+
+    faltantes = (rut == "") | (nombre == "") | (sueldo_str == "")
+    validaciones = [
+        (faltantes, "Datos faltantes."),
+        (~faltantes & sueldo.isna(), "'sueldo_base' no es un número válido."),
+        (~faltantes & (sueldo < 0), "'sueldo_base' no puede ser negativo."),
+        (~faltantes & ((rut.str.len() < 7) | (rut.str.len() > 12)), "'rut' debe tener entre 7 y 12 caracteres."),
+        (~faltantes & ((nombre.str.len() < 3) | (nombre.str.len() > 255)), "'nombre_completo' debe tener entre 3 y 255 caracteres."),
+    ]
+    errores: List[ErrorFilaCSV] = []
+    invalidas = pd.Series(False, index=df.index)
+    for mascara, mensaje in validaciones:
+        invalidas |= mascara
+        for fila, rut_fila in zip(filas[mascara.to_numpy()], rut[mascara]):
+            errores.append(ErrorFilaCSV(row=int(fila), rut=rut_fila or None, error=mensaje))
+    errores.sort(key=lambda e: e.row)
+
+    validas = pd.DataFrame({
+        "rut": rut, "rut_normalizado": normalizar_rut_series(rut), "nombre_completo": nombre, "sueldo_base": sueldo
+    })[~invalidas]
+    validas = validas.drop_duplicates(subset="rut_normalizado", keep="last")
+    return validas.to_dict("records"), errores
+
+def _upsert_vendedores(db: Session, filas: List[Dict[str, Any]], ids_existentes: Dict[str, int]) -> None:
+    """
+    Inserta o actualiza (por RUT) un lote de vendedores con una sola sentencia.
+    MySQL usa INSERT ... ON DUPLICATE KEY UPDATE y SQLite/PostgreSQL INSERT ... ON CONFLICT;
+    otros motores usan bulk_insert_mappings/bulk_update_mappings con los IDs ya consultados.
+    """
+    dialecto = db.get_bind().dialect.name
+    if dialecto == "mysql":
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+        stmt = dialect_insert(Vendedor.__table__).values(filas)
+        stmt = stmt.on_duplicate_key_update(
+            nombre_completo=stmt.inserted.nombre_completo,
+            sueldo_base=stmt.inserted.sueldo_base,
+            updated_at=func.now()
+        )
+        db.execute(stmt)
+    elif dialecto in ("sqlite", "postgresql"):
+        if dialecto == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        stmt = dialect_insert(Vendedor.__table__).values(filas)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Vendedor.rut],
+            set_={
+                "nombre_completo": stmt.excluded.nombre_completo,
+                "sueldo_base": stmt.excluded.sueldo_base,
+                "updated_at": func.now(),
+            }
+        )
+        db.execute(stmt)
     else:
-        return vendedores_procesados, []
\ No newline at end of file
+        nuevos = [f for f in filas if f["rut"] not in ids_existentes]
+        existentes = [{**f, "id": ids_existentes[f["rut"]]} for f in filas if f["rut"] in ids_existentes]
+        if nuevos:
+            db.bulk_insert_mappings(Vendedor, nuevos)
+        if existentes:
+            db.bulk_update_mappings(Vendedor, existentes)
+
+def process_vendedores_csv(
+    db: Session, *, bloques: Iterable[pd.DataFrame],
+    on_progress: Optional[Callable[[int, ResultadoImportacion], None]] = None
+) -> ResultadoImportacion:
+    """
+    Crea o actualiza vendedores (por RUT) desde un CSV leído por bloques (ver app.core.csv_stream).
+    Por bloque: una consulta IN (por rut_normalizado) para saber qué RUT ya existen y una
+    sentencia de upsert por lote.
+    Todo ocurre en una transacción: si alguna fila tiene errores no se aplica ningún cambio.
+    `on_progress(filas_procesadas, resultado_parcial)` se llama al terminar cada bloque.
+    """
+    resultado = ResultadoImportacion()
+    filas_procesadas = 0
+    try:
+        for bloque in bloques:
+            filas_procesadas += len(bloque)
+            filas, errores_bloque = _validar_vendedores_df(bloque)
+            resultado.errors.extend(errores_bloque)
+
+            # Si ya hubo errores se sigue validando para informarlos todos, pero no se escribe nada
+            if not resultado.errors:
+                for inicio in range(0, len(filas), VENDEDORES_BATCH_SIZE):
+                    lote = filas[inicio:inicio + VENDEDORES_BATCH_SIZE]
+                    existentes = {
+                        v.rut_normalizado: v for v in db.query(Vendedor.id, Vendedor.rut, Vendedor.rut_normalizado).filter(
+                            Vendedor.rut_normalizado.in_([f["rut_normalizado"] for f in lote])
+                        )
+                    }
+                    # Se conserva el RUT ya guardado ('12.345.678-9' y '12345678-9' son el mismo
+                    # vendedor) para que el upsert por la clave única rut lo encuentre
+                    for f in lote:
+                        if f["rut_normalizado"] in existentes:
+                            f["rut"] = existentes[f["rut_normalizado"]].rut
+                    ids_existentes = {v.rut: v.id for v in existentes.values()}
+                    _upsert_vendedores(db, lote, ids_existentes)
+                    crud_busqueda.indexar_vendedores_por_rut(db, [f["rut_normalizado"] for f in lote])
+                    resultado.updated_count += len(ids_existentes)
+                    resultado.created_count += len(lote) - len(ids_existentes)
+            if on_progress:
+                on_progress(filas_procesadas, resultado)
+
+        if resultado.errors:
+            db.rollback()
+            return ResultadoImportacion(errors=resultado.errors)
+        if resultado.created_count or resultado.updated_count:
+            crud_tabla_version.incrementar(db, Vendedor.__tablename__)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return resultado
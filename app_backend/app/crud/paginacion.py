@@ -0,0 +1,45 @@
+# app/crud/paginacion.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+def encode_cursor(*valores: Any) -> str:
+    """
+    Codifica la clave de orden del último elemento de una página en un token opaco.
+    Las fechas se guardan en formato ISO.
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in valores]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, cantidad: int) -> List[Any]:
+    """
+    Decodifica un token generado por encode_cursor.
+    Lanza ValueError si el token no es válido o no tiene `cantidad` valores.
+    """
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + padding).decode("utf-8"))
+    except Exception:
+        raise ValueError("Cursor de paginación inválido.")
+    if not isinstance(valores, list) or len(valores) != cantidad:
+        raise ValueError("Cursor de paginación inválido.")
+    return valores
+
+def decode_cursor_fecha(valor: Any) -> datetime:
+    try:
+        return datetime.fromisoformat(valor)
+    except (TypeError, ValueError):
+        raise ValueError("Cursor de paginación inválido.")
+
+def decode_cursor_texto(valor: Any) -> str:
+    if not isinstance(valor, str):
+        raise ValueError("Cursor de paginación inválido.")
+    return valor
+
+def decode_cursor_id(valor: Any) -> int:
+    # bool es subclase de int: true/false en el token tampoco es un id
+    if not isinstance(valor, int) or isinstance(valor, bool):
+        raise ValueError("Cursor de paginación inválido.")
+    return valor
@@ -0,0 +1,154 @@
+# app/db/pool.py
+"""
+Pool de conexiones configurable (Settings.DB_POOL_*) e instrumentado.
+
+Los pools de los motores sync y async registran, por proceso, cuántas conexiones se
+piden, cuánto se espera por una conexión libre y cuánto tarda el checkout completo
+(incluido el pre-ping). Se consulta en GET /sistema/pool para dimensionar el pool
+según los workers de uvicorn: cada worker tiene su propio pool.
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+# Muestras recientes que se guardan para los percentiles
+MUESTRAS_LATENCIA = 1000
+
+class EstadisticasPool:
+    """Contadores y latencias recientes (ms) de un pool; seguro entre threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.conexiones_creadas = 0
+        self._esperas_ms: deque = deque(maxlen=MUESTRAS_LATENCIA)
+        self._checkouts_ms: deque = deque(maxlen=MUESTRAS_LATENCIA)
+
+    def registrar_espera(self, ms: float) -> None:
+        with self._lock:
+            self._esperas_ms.append(ms)
+
+    def registrar_checkout(self, ms: float, timeout: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if timeout:
+                self.timeouts += 1
+            else:
+                self._checkouts_ms.append(ms)
+
+    def registrar_conexion_creada(self) -> None:
+        with self._lock:
+            self.conexiones_creadas += 1
+
+    def resumen(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "conexiones_creadas": self.conexiones_creadas,
+                "espera_ms": _percentiles(list(self._esperas_ms)),
+                "checkout_ms": _percentiles(list(self._checkouts_ms)),
+            }
+
+def _percentiles(muestras: List[float]) -> Dict[str, Optional[float]]:
+    if not muestras:
+        return {"muestras": 0, "promedio": None, "p50": None, "p95": None, "max": None}
+    ordenadas = sorted(muestras)
+    def percentil(p: float) -> float:
+        return round(ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))], 3)
+    return {
+        "muestras": len(ordenadas),
+        "promedio": round(sum(ordenadas) / len(ordenadas), 3),
+        "p50": percentil(0.50),
+        "p95": percentil(0.95),
+        "max": round(ordenadas[-1], 3),
+    }
+
+class _InstrumentacionPool:
+    """
+    Mixin sobre QueuePool: la espera es el tiempo en _do_get (cola llena o conexión nueva);
+    el checkout es connect() completo, con pre-ping y eventos incluidos.
+    """
+    estadisticas: EstadisticasPool
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.estadisticas = EstadisticasPool()
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super().connect()
+        except exc.TimeoutError:
+            self.estadisticas.registrar_checkout((time.perf_counter() - inicio) * 1000, timeout=True)
+            raise
+        self.estadisticas.registrar_checkout((time.perf_counter() - inicio) * 1000)
+        return conexion
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.estadisticas.registrar_espera((time.perf_counter() - inicio) * 1000)
+
+    def _create_connection(self):
+        conexion = super()._create_connection()
+        self.estadisticas.registrar_conexion_creada()
+        return conexion
+
+    def recreate(self):
+        # dispose() reemplaza el pool por uno nuevo: se conservan las estadísticas acumuladas
+        nuevo = super().recreate()
+        nuevo.estadisticas = self.estadisticas
+        return nuevo
+
+class QueuePoolInstrumentado(_InstrumentacionPool, QueuePool):
+    pass
+
+class AsyncQueuePoolInstrumentado(_InstrumentacionPool, AsyncAdaptedQueuePool):
+    pass
+
+def opciones_pool(database_url: str, asincrono: bool = False) -> Dict[str, Any]:
+    """
+    Argumentos de create_engine / create_async_engine según Settings. SQLite en memoria
+    conserva su pool propio (una sola conexión), sin tamaño ni instrumentación.
+    """
+    opciones: Dict[str, Any] = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return opciones
+    opciones.update(
+        poolclass=AsyncQueuePoolInstrumentado if asincrono else QueuePoolInstrumentado,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return opciones
+
+def estado_pool(pool) -> Dict[str, Any]:
+    """Estado actual de un pool más sus estadísticas acumuladas (si está instrumentado)."""
+    estado: Dict[str, Any] = {"clase": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        estado.update(
+            tamano=pool.size(),
+            conexiones_libres=pool.checkedin(),
+            conexiones_en_uso=pool.checkedout(),
+            overflow=max(0, pool.overflow()), # negativo mientras no se use todo pool_size
+            max_overflow=pool._max_overflow,
+            timeout_s=pool.timeout(),
+            recycle_s=pool._recycle,
+            pre_ping=pool._pre_ping,
+        )
+    if isinstance(pool, _InstrumentacionPool):
+        estado.update(pool.estadisticas.resumen())
+    return estado
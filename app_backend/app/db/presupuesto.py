@@ -0,0 +1,74 @@
+# app/db/presupuesto.py
+"""
+Presupuesto de consultas: cuenta las sentencias que emite un Engine dentro de un bloque y
+detecta las que se repiten con el mismo SQL y distintos parámetros (el patrón N+1).
+
+    with presupuesto_consultas(engine, maximo=4, max_repeticiones=1) as registro:
+        client.get("/api/v1/facturas/?limit=100")
+    registro.total, registro.repetidas()
+
+Cuenta todo lo que pasa por el Engine (cualquier thread), así que está pensado para tests y
+scripts de verificación (check_query_budget.py), no para medir peticiones concurrentes: eso
+lo hace app.core.perfil. Si el bloque se pasa del presupuesto, al salir se lanza
+PresupuestoConsultasExcedido (un AssertionError, para que pytest lo muestre como fallo).
+"""
+import re
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class PresupuestoConsultasExcedido(AssertionError):
+    pass
+
+def _normalizar(statement: str) -> str:
+    # Los IN expandidos ("IN (?, ?, ?)") cuentan como la misma sentencia sin importar cuántos valores lleven
+    return re.sub(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)", "(...)", " ".join(statement.split()))
+
+class RegistroConsultas:
+    def __init__(self) -> None:
+        self.sentencias: Counter = Counter()
+
+    @property
+    def total(self) -> int:
+        return sum(self.sentencias.values())
+
+    def repetidas(self, minimo: int = 2) -> List[Tuple[str, int]]:
+        """Sentencias ejecutadas al menos `minimo` veces, de la más repetida a la menos."""
+        return [(sql, veces) for sql, veces in self.sentencias.most_common() if veces >= minimo]
+
+    def resumen(self, limite_sql: int = 160) -> str:
+        lineas = [f"{self.total} consultas, {len(self.sentencias)} distintas"]
+        lineas += [f"  {veces:4d} x {sql[:limite_sql]}" for sql, veces in self.repetidas()]
+        return "\n".join(lineas)
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.sentencias[_normalizar(statement)] += 1
+
+@contextmanager
+def presupuesto_consultas(
+    engine: Engine,
+    *,
+    maximo: Optional[int] = None,
+    max_repeticiones: Optional[int] = None
+) -> Iterator[RegistroConsultas]:
+    """
+    maximo: sentencias permitidas en total. max_repeticiones: veces que puede ejecutarse una
+    misma sentencia (1 = ninguna repetida). None = solo registrar, sin verificar.
+    Para un AsyncEngine se pasa su sync_engine.
+    """
+    registro = RegistroConsultas()
+    event.listen(engine, "before_cursor_execute", registro._registrar)
+    try:
+        yield registro
+    finally:
+        event.remove(engine, "before_cursor_execute", registro._registrar)
+
+    if maximo is not None and registro.total > maximo:
+        raise PresupuestoConsultasExcedido(f"Se esperaban como máximo {maximo} consultas: {registro.resumen()}")
+    if max_repeticiones is not None and registro.repetidas(max_repeticiones + 1):
+        raise PresupuestoConsultasExcedido(
+            f"Sentencias repetidas más de {max_repeticiones} vez/veces (¿N+1?): {registro.resumen()}"
+        )
@@ -2,8 +2,12 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.pool import opciones_pool
+from app.core.perfil import instrumentar_engine
 
-engine = create_engine(settings.DATABASE_URL, pool_pre_ping=True)
+engine = create_engine(settings.DATABASE_URL, **opciones_pool(settings.DATABASE_URL))
+if settings.PROFILING_ENABLED:
+    instrumentar_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Función para crear tablas (usada por Alembic o para configuración inicial si no usas Alembic al principio)
@@ -0,0 +1,50 @@
+# app/db/session_async.py
+"""
+Stack async opcional (AsyncSession) que usan las rutas /async.
+
+Necesita un driver async (aiomysql o asyncmy en MySQL, aiosqlite en SQLite) y greenlet.
+El motor se crea en el primer uso, así la aplicación arranca igual si no están instalados;
+en ese caso solo fallan las rutas /async.
+"""
+from typing import Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from app.core.config import settings
+from app.core.perfil import instrumentar_engine
+from app.db.pool import opciones_pool
+
+# Driver async que reemplaza al síncrono de DATABASE_URL cuando no se define ASYNC_DATABASE_URL
+DRIVERS_ASYNC = {"mysql": "aiomysql", "sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+def url_async(database_url: str) -> str:
+    """'mysql+pymysql://...' -> 'mysql+aiomysql://...' (se conserva el resto de la URL)."""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in DRIVERS_ASYNC:
+        raise ValueError(f"No hay driver async configurado para '{backend}'. Define ASYNC_DATABASE_URL.")
+    return url.set(drivername=f"{backend}+{DRIVERS_ASYNC[backend]}").render_as_string(hide_password=False)
+
+def get_async_engine() -> AsyncEngine:
+    global _engine
+    if _engine is None:
+        url = settings.ASYNC_DATABASE_URL or url_async(settings.DATABASE_URL)
+        _engine = create_async_engine(url, **opciones_pool(url, asincrono=True))
+        if settings.PROFILING_ENABLED:
+            instrumentar_engine(_engine.sync_engine)
+    return _engine
+
+def async_engine_actual() -> Optional[AsyncEngine]:
+    """El motor async si ya se creó (sin crearlo)."""
+    return _engine
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _sessionmaker
+    if _sessionmaker is None:
+        # expire_on_commit=False: los objetos siguen legibles después del commit sin E/S implícita
+        _sessionmaker = async_sessionmaker(get_async_engine(), autoflush=False, expire_on_commit=False)
+    return _sessionmaker
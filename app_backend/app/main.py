@@ -1,15 +1,31 @@
 # app_backend/app/main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1 import api_router as api_router_v1
+from app.core.perfil import MiddlewarePerfil, configurar_log
+from app.core import import_jobs
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Las cargas en segundo plano no sobreviven al proceso que las ejecuta: las que quedaron
+    # pendientes o en curso en uno que ya terminó se marcan como fallidas
+    try:
+        recuperados = import_jobs.recuperar_trabajos_interrumpidos()
+        if recuperados:
+            print(f"Trabajos de importación interrumpidos marcados como fallidos: {recuperados}")
+    except Exception as e:
+        print(f"ERROR al recuperar trabajos de importación interrumpidos: {e}")
+    yield
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # Configuración de CORS
@@ -19,10 +35,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["Authorization"],  # ✅ Permite leer el header de autenticación
+    expose_headers=["Authorization", "Server-Timing"],  # ✅ Permite leer el header de autenticación
 
 )
 
+# Server-Timing y log por petición; se agrega al final para quedar afuera de CORS y medir todo
+if settings.PROFILING_ENABLED:
+    configurar_log()
+    app.add_middleware(MiddlewarePerfil)
+
 app.include_router(api_router_v1, prefix=settings.API_V1_STR)
 
 @app.get("/")
@@ -0,0 +1,31 @@
+# app/models/bono_ledger.py
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, func
+from app.db.base_class import Base
+
+class BonoLedger(Base):
+    """
+    Totales precalculados de facturas por (periodo, vendedor, cliente).
+    periodo = año * 100 + mes (ej. 202403). Lo mantiene app.crud.crud_bono_ledger.
+    """
+    __tablename__ = "bono_ledger"
+
+    periodo = Column(Integer, primary_key=True)
+    vendedor_id = Column(Integer, ForeignKey("vendedores.id"), primary_key=True, index=True)
+    cliente_id = Column(Integer, ForeignKey("clientes.id"), primary_key=True, index=True)
+
+    honorarios = Column(Float, nullable=False, default=0.0)
+    gastos = Column(Float, nullable=False, default=0.0)
+    neto = Column(Float, nullable=False, default=0.0)
+    # Suma de max(neto, 0) por factura: el bono de la celda es neto_positivo * porcentaje
+    neto_positivo = Column(Float, nullable=False, default=0.0)
+    bono = Column(Float, nullable=False, default=0.0)
+    num_facturas = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class BonoLedgerPeriodo(Base):
+    """Periodos cuyo ledger ya fue materializado (un periodo sin fila aquí se lee de facturas)."""
+    __tablename__ = "bono_ledger_periodos"
+
+    periodo = Column(Integer, primary_key=True)
+    materializado_at = Column(DateTime(timezone=True), server_default=func.now())
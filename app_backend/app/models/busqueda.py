@@ -0,0 +1,20 @@
+# app/models/busqueda.py
+from sqlalchemy import Column, Integer, String, Index
+from app.db.base_class import Base
+
+class BusquedaTrigrama(Base):
+    """
+    Índice invertido de trigramas para buscar clientes y vendedores por nombre o RUT.
+    Una fila por (entidad, trigrama, entidad_id); lo mantiene app.crud.crud_busqueda.
+    """
+    __tablename__ = "busqueda_trigramas"
+
+    entidad = Column(String(20), primary_key=True) # "cliente" | "vendedor"
+    trigrama = Column(String(3), primary_key=True)
+    entidad_id = Column(Integer, primary_key=True)
+
+    # Para reindexar o borrar las filas de un registro. entidad_id va primero a propósito: así el
+    # índice no sirve para "entidad = ?" y las búsquedas usan siempre la PK (entidad, trigrama)
+    __table_args__ = (
+        Index("ix_busqueda_trigramas_entidad_id", "entidad_id", "entidad"),
+    )
@@ -1,6 +1,8 @@
 # app/models/cliente.py
 from sqlalchemy import Column, Integer, String, DateTime, func
+from sqlalchemy.orm import validates
 from app.db.base_class import Base # Asegúrate que Base esté correctamente importada
+from app.core.rut import normalizar_rut
 
 class Cliente(Base): # Nombre de clase en singular, la tabla será 'clientes'
     __tablename__ = "clientes" # Especificar explícitamente el nombre de la tabla
@@ -8,12 +10,19 @@ class Cliente(Base): # Nombre de clase en singular, la tabla será 'clientes'
     id = Column(Integer, primary_key=True, index=True)
     razon_social = Column(String(255), index=True, nullable=False)
     rut = Column(String(20), unique=True, index=True, nullable=False) # RUT del cliente
+    # RUT sin puntos ni guion, en mayúsculas: clave indexada para búsquedas exactas y por prefijo
+    rut_normalizado = Column(String(20), index=True, nullable=True)
     ramo = Column(String(100), nullable=True)
     ubicacion = Column(String(255), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    @validates("rut")
+    def _sincronizar_rut_normalizado(self, key, rut):
+        self.rut_normalizado = normalizar_rut(rut)
+        return rut
+
     # Aquí podrías añadir relaciones si es necesario, por ejemplo, con Vendedores o Facturas
     # Ejemplo:
     # facturas = relationship("Factura", back_populates="cliente")
\ No newline at end of file
@@ -1,5 +1,5 @@
 # app/models/factura.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, func
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index, func
 from sqlalchemy.orm import relationship
 from app.db.base_class import Base
 from app.models.vendedor import Vendedor
@@ -26,4 +26,11 @@ class Factura(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     vendedor = relationship("Vendedor")
-    cliente = relationship("Cliente")
\ No newline at end of file
+    cliente = relationship("Cliente")
+
+    # Índices para las consultas por rango de fecha (reportes, bonos, listado ordenado por fecha)
+    __table_args__ = (
+        Index("ix_facturas_vendedor_fecha", "vendedor_id", "fecha_emision"),
+        Index("ix_facturas_cliente_fecha", "cliente_id", "fecha_emision"),
+        Index("ix_facturas_fecha_id", "fecha_emision", "id"),
+    )
@@ -0,0 +1,46 @@
+# app/models/import_job.py
+from sqlalchemy import Column, Integer, String, Text, JSON, DateTime, ForeignKey, Enum as SQLAlchemyEnum
+from sqlalchemy.sql import func
+from datetime import datetime, timezone
+from typing import Optional
+from app.db.base_class import Base
+import enum
+
+class ImportJobStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(String(32), primary_key=True) # uuid4().hex
+    tipo = Column(String(20), nullable=False) # facturas | clientes | vendedores
+    filename = Column(String(255), nullable=True)
+    status = Column(SQLAlchemyEnum(ImportJobStatus), default=ImportJobStatus.PENDING, nullable=False)
+
+    # Progreso, actualizado al terminar cada bloque del CSV
+    rows_processed = Column(Integer, nullable=False, default=0)
+    created_count = Column(Integer, nullable=False, default=0)
+    updated_count = Column(Integer, nullable=False, default=0)
+    skipped_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    errors = Column(JSON, nullable=True) # Primeros errores por fila (ver crud_import_job.MAX_ERRORES_GUARDADOS)
+    message = Column(Text, nullable=True)
+
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    worker = Column(String(100), nullable=True) # host:pid:arranque del proceso que lo ejecuta (ver core.import_jobs)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    @property
+    def rows_per_second(self) -> Optional[float]:
+        if not self.started_at:
+            return None
+        inicio = self.started_at if self.started_at.tzinfo else self.started_at.replace(tzinfo=timezone.utc)
+        fin = self.finished_at or datetime.now(timezone.utc)
+        fin = fin if fin.tzinfo else fin.replace(tzinfo=timezone.utc)
+        segundos = (fin - inicio).total_seconds()
+        return round(self.rows_processed / segundos, 1) if segundos > 0 else None
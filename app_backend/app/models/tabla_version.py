@@ -0,0 +1,14 @@
+# app/models/tabla_version.py
+from sqlalchemy import Column, Integer, String, DateTime, func
+from app.db.base_class import Base
+
+class TablaVersion(Base):
+    """
+    Contador de cambios por tabla; lo incrementan las escrituras de app.crud en la misma
+    transacción. Sirve de ETag para respuestas que dependen de la tabla completa (/simple).
+    """
+    __tablename__ = "tabla_versiones"
+
+    tabla = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,7 +1,8 @@
 # app/models/vendedor.py
 from sqlalchemy import Column, Integer, String, Float, ForeignKey, UniqueConstraint, DateTime, func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.db.base_class import Base
+from app.core.rut import normalizar_rut
 # Necesitarás importar Cliente si la relación lo usa directamente, aunque aquí no es estrictamente necesario para la definición de la FK
 # from app.models.cliente import Cliente 
 
@@ -11,6 +12,8 @@ class Vendedor(Base):
     id = Column(Integer, primary_key=True, index=True)
     nombre_completo = Column(String(255), index=True, nullable=False)
     rut = Column(String(20), unique=True, index=True, nullable=False)
+    # RUT sin puntos ni guion, en mayúsculas: clave indexada para búsquedas exactas y por prefijo
+    rut_normalizado = Column(String(20), index=True, nullable=True)
     sueldo_base = Column(Float, nullable=False, default=0.0) # Sueldo base actual
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -19,6 +22,11 @@ class Vendedor(Base):
     # Relación con la tabla asociativa VendedorClientePorcentaje
     clientes_asignados = relationship("VendedorClientePorcentaje", back_populates="vendedor", cascade="all, delete-orphan")
 
+    @validates("rut")
+    def _sincronizar_rut_normalizado(self, key, rut):
+        self.rut_normalizado = normalizar_rut(rut)
+        return rut
+
 class VendedorClientePorcentaje(Base):
     __tablename__ = "vendedor_cliente_porcentajes"
 
@@ -16,6 +16,10 @@ from .vendedor import (
 from . import factura
 from .bono import BonoCalculationRequest, BonoVendedorResult, BonoCalculationResponse # <--- 23 jun 25
 from .reporte import ReporteFacturaItem, ReporteResponse, SumatoriaPorVendedor # <--- 23 jun 25
+from . import importacion
+from .importacion import ErrorFilaCSV, ResultadoImportacion
+from . import import_job
+from . import sistema
 
 class Token(BaseModel):
     access_token: str
@@ -1,6 +1,6 @@
 # app/schemas/bono.py
-from pydantic import BaseModel, Field
-from typing import Optional, List
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Literal
 from datetime import date
 
 # Schema para la solicitud de cálculo
@@ -8,6 +8,8 @@ class BonoCalculationRequest(BaseModel):
     start_date: date
     end_date: date
     vendedor_id: Optional[int] = Field(None, description="ID del vendedor para calcular. Si es None, se calculan todos.")
+    modo: Literal["agregado", "por_vendedor", "paralelo"] = Field("agregado", description="Motor de cálculo: 'agregado' (una consulta SUM/GROUP BY), 'por_vendedor' (motor original) o 'paralelo' (el agregado por tramos de vendedores en paralelo, para períodos largos).")
+    incluir_detalle: bool = Field(True, description="Si es False, no se consulta ni se devuelve el detalle por factura.")
 
 # Schema para el resultado de un vendedor
 class BonoVendedorResult(BaseModel):
@@ -24,4 +26,54 @@ class BonoVendedorResult(BaseModel):
 class BonoCalculationResponse(BaseModel):
     start_date: date
     end_date: date
-    resultados: List[BonoVendedorResult]
\ No newline at end of file
+    resultados: List[BonoVendedorResult]
+
+# --- Simulación de bonos con otros porcentajes (POST /bonos/simular) ---
+class ReglaPorcentaje(BaseModel):
+    """
+    Cambia el porcentaje de las asignaciones (vendedor, cliente) que cumplen todos los filtros
+    indicados (sin filtros, todas). Se fija un porcentaje nuevo o se multiplica el vigente.
+    """
+    ramo: Optional[str] = Field(None, description="Ramo del cliente (sin distinguir mayúsculas).")
+    ubicacion: Optional[str] = Field(None, description="Ubicación del cliente (sin distinguir mayúsculas).")
+    vendedor_ids: Optional[List[int]] = None
+    cliente_ids: Optional[List[int]] = None
+    porcentaje: Optional[float] = Field(None, ge=0, le=1, description="Porcentaje nuevo, p. ej. 0.12 para 12 %.")
+    factor: Optional[float] = Field(None, ge=0, description="Multiplica el porcentaje vigente, p. ej. 1.1.")
+
+    @model_validator(mode="after")
+    def _un_cambio(self) -> "ReglaPorcentaje":
+        if (self.porcentaje is None) == (self.factor is None):
+            raise ValueError("Cada regla debe indicar 'porcentaje' o 'factor' (solo uno).")
+        return self
+
+class EscenarioBono(BaseModel):
+    nombre: str
+    reglas: List[ReglaPorcentaje] = Field(..., min_length=1, description="Se aplican en orden; la última que calza gana.")
+
+class BonoSimulacionRequest(BaseModel):
+    start_date: date
+    end_date: date
+    vendedor_id: Optional[int] = None
+    escenarios: List[EscenarioBono] = Field(..., min_length=1, max_length=50)
+
+class BonoSimuladoVendedor(BaseModel):
+    vendedor_id: int
+    nombre_vendedor: str
+    rut_vendedor: str
+    bono_actual: float
+    bono_simulado: float
+    diferencia: float
+
+class EscenarioSimulado(BaseModel):
+    nombre: str
+    bono_total_actual: float
+    bono_total_simulado: float
+    diferencia_total: float
+    asignaciones_afectadas: int
+    resultados: List[BonoSimuladoVendedor]
+
+class BonoSimulacionResponse(BaseModel):
+    start_date: date
+    end_date: date
+    escenarios: List[EscenarioSimulado]
@@ -37,7 +37,8 @@ class Cliente(ClienteInDBBase):
 # Schema para la respuesta paginada de la tabla de clientes
 class ClientesResponse(BaseModel):
     items: List[Cliente]
-    total_count: int
+    total_count: Optional[int] = None # None cuando se pide include_total=false
+    next_cursor: Optional[str] = None # Token para pedir la página siguiente con ?after=
 
 # --- SCHEMA SIMPLIFICADO CORREGIDO ---
 class ClienteSimple(BaseModel):
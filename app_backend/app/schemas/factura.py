@@ -41,4 +41,5 @@ class Factura(FacturaBase): # Ya no hereda de InDBBase, se define explícitament
 
 class FacturasResponse(BaseModel):
     items: List[Factura]
-    total_count: int
\ No newline at end of file
+    total_count: Optional[int] = None # None cuando se pide include_total=false
+    next_cursor: Optional[str] = None # Token para pedir la página siguiente con ?after=
\ No newline at end of file
@@ -0,0 +1,26 @@
+# app/schemas/import_job.py
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+from app.models.import_job import ImportJobStatus
+from .importacion import ErrorFilaCSV
+
+class ImportJob(BaseModel):
+    id: str
+    tipo: str
+    filename: Optional[str] = None
+    status: ImportJobStatus
+    rows_processed: int = 0
+    created_count: int = 0
+    updated_count: int = 0
+    skipped_count: int = 0
+    error_count: int = 0
+    errors: Optional[List[ErrorFilaCSV]] = None
+    message: Optional[str] = None
+    rows_per_second: Optional[float] = None # Throughput desde que empezó el trabajo
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
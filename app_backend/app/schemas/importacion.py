@@ -0,0 +1,16 @@
+# app/schemas/importacion.py
+from pydantic import BaseModel
+from typing import List, Optional
+
+# Error de validación de una fila del CSV (fila = número de línea en el archivo, contando la cabecera)
+class ErrorFilaCSV(BaseModel):
+    row: int
+    rut: Optional[str] = None
+    error: str
+
+# Resultado de una carga masiva desde CSV
+class ResultadoImportacion(BaseModel):
+    created_count: int = 0
+    updated_count: int = 0
+    skipped_count: int = 0
+    errors: List[ErrorFilaCSV] = []
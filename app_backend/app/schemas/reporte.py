@@ -17,6 +17,9 @@ class ReporteFacturaItem(BaseModel):
     cliente_id: int
     cliente_razon_social: str
     cliente_rut: str
+    # Bono de la factura: max(honorarios - gastos, 0) * porcentaje de la asignación vendedor-cliente
+    bono_calculado: float = 0.0
+    porcentaje_bono_aplicado: float = 0.0 # En puntos porcentuales (10.0 = 10 %)
 
     class Config:
         from_attributes = True
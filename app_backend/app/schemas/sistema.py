@@ -0,0 +1,45 @@
+# app/schemas/sistema.py
+from pydantic import BaseModel
+from typing import Optional
+
+class PercentilesLatencia(BaseModel):
+    muestras: int = 0 # Últimas N mediciones (app.db.pool.MUESTRAS_LATENCIA)
+    promedio: Optional[float] = None
+    p50: Optional[float] = None
+    p95: Optional[float] = None
+    max: Optional[float] = None
+
+class EstadoPool(BaseModel):
+    clase: str
+    tamano: Optional[int] = None
+    conexiones_libres: Optional[int] = None
+    conexiones_en_uso: Optional[int] = None
+    overflow: Optional[int] = None
+    max_overflow: Optional[int] = None
+    timeout_s: Optional[float] = None
+    recycle_s: Optional[int] = None
+    pre_ping: Optional[bool] = None
+    # Acumulados desde que arrancó el proceso (solo pools instrumentados)
+    checkouts: Optional[int] = None
+    timeouts: Optional[int] = None
+    conexiones_creadas: Optional[int] = None
+    espera_ms: Optional[PercentilesLatencia] = None # Esperando una conexión libre (o creándola)
+    checkout_ms: Optional[PercentilesLatencia] = None # Checkout completo, con pre-ping
+
+class EstadoPools(BaseModel):
+    pid: int # Cada worker de uvicorn tiene sus propios pools: la respuesta es la del worker que atendió
+    sync: EstadoPool
+    asincrono: Optional[EstadoPool] = None # None si el stack /async aún no se usó en este worker
+
+class EstadoCache(BaseModel):
+    pid: int
+    habilitada: bool
+    entradas: int
+    max_entradas: int
+    ttl_segundos: float
+    hits: int
+    misses: int
+    hit_rate: Optional[float] = None # None mientras no haya consultas
+    expiradas: int
+    desalojadas: int
+    invalidaciones: int
@@ -49,7 +49,8 @@ class Vendedor(VendedorInDBBase):
 
 class VendedoresResponse(BaseModel):
     items: List[Vendedor]
-    total_count: int
+    total_count: Optional[int] = None # None cuando se pide include_total=false
+    next_cursor: Optional[str] = None # Token para pedir la página siguiente con ?after=
 
 # --- NUEVO SCHEMA AÑADIDO ---
 # Este es el schema para la lista simplificada que necesita el formulario.
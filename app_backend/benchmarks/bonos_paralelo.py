@@ -0,0 +1,103 @@
+# benchmarks/bonos_paralelo.py
+"""
+Escalamiento del modo "paralelo" de calcular_bonos_por_periodo con la cantidad de threads.
+
+Mide el cálculo de bonos de todos los vendedores sobre todo el rango sembrado (dos años, como
+un cierre anual largo): primero el modo "agregado" en serie y después el modo "paralelo" con
+cada cantidad de threads de --hilos. Verifica que cada ejecución en paralelo devuelva
+exactamente lo mismo que la serie y muestra la mediana y la aceleración.
+
+Por defecto usa una base SQLite temporal sembrada con benchmarks/datos.py y sin ledger (todo se
+agrega desde facturas); con --database-url mide sobre una base existente (p. ej. MySQL). La
+aceleración depende de los núcleos disponibles (se informa os.cpu_count()) y del motor: en
+MySQL las consultas corren en el servidor.
+
+Uso:
+    python benchmarks/bonos_paralelo.py [--facturas 300000] [--hilos 1,2,4,8] [--detalle]
+    python benchmarks/bonos_paralelo.py --database-url mysql+pymysql://... --desde 2024-01-01 --hasta 2025-12-31
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import datos
+from comun import APP_BACKEND, preparar_base
+
+def _medir(funcion, repeticiones: int) -> tuple:
+    """(mediana en ms, último resultado); la primera ejecución es de calentamiento."""
+    resultado = funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), resultado
+
+def _ejecutar(args) -> int:
+    from app.core import calculations
+    from app.core.config import settings
+    from app.db.session import SessionLocal
+
+    settings.BONO_LEDGER_ENABLED = args.ledger
+    hilos = [int(n) for n in args.hilos.split(",")]
+
+    def calcular(modo: str):
+        with SessionLocal() as db:
+            return [
+                resultado.model_dump() for resultado in calculations.calcular_bonos_por_periodo(
+                    db, args.desde, args.hasta, modo=modo, incluir_detalle=args.detalle
+                )
+            ]
+
+    print(f"Núcleos: {os.cpu_count()} | rango: {args.desde} a {args.hasta} | detalle: {args.detalle} | "
+          f"ledger: {args.ledger} | mediana de {args.repeticiones} ejecuciones")
+    ms_serie, esperado = _medir(lambda: calcular(calculations.MODO_AGREGADO), args.repeticiones)
+    print(f"{'serie (agregado)':20s} {ms_serie:9.1f} ms   {len(esperado)} vendedores")
+
+    distintos = False
+    for n in hilos:
+        # Cada medición con su pool, del tamaño indicado (el del módulo se crea al importar)
+        settings.BONO_PARALLEL_WORKERS = n
+        calculations._executor_bonos = ThreadPoolExecutor(max_workers=n, thread_name_prefix="bonos")
+        ms, resultado = _medir(lambda: calcular(calculations.MODO_PARALELO), args.repeticiones)
+        calculations._executor_bonos.shutdown()
+        iguales = resultado == esperado
+        distintos |= not iguales
+        print(f"{f'paralelo, {n} threads':20s} {ms:9.1f} ms   x{ms_serie / ms:4.2f}"
+              f"{'' if iguales else '   RESULTADOS DISTINTOS A LA SERIE'}")
+    return 1 if distintos else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendedores", type=int, default=300)
+    parser.add_argument("--clientes", type=int, default=3000)
+    parser.add_argument("--facturas", type=int, default=300000)
+    parser.add_argument("--hilos", default="1,2,4,8", help="Cantidades de threads a medir, separadas por coma")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--detalle", action="store_true", help="Incluir el detalle por factura")
+    parser.add_argument("--ledger", action="store_true", help="Leer los meses cerrados del ledger")
+    parser.add_argument("--database-url", help="Medir sobre esta base (con datos) en vez de una SQLite temporal")
+    parser.add_argument("--desde", type=date.fromisoformat, default=date(2024, 1, 1))
+    parser.add_argument("--hasta", type=date.fromisoformat, default=date(2025, 12, 31))
+    args = parser.parse_args()
+
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+        sys.path.insert(0, APP_BACKEND)
+        return _ejecutar(args)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = time.perf_counter()
+        preparar_base(os.path.join(directorio, "bench.db"), lambda db: datos.sembrar(
+            db, vendedores=args.vendedores, clientes=args.clientes, facturas=args.facturas
+        ))
+        print(f"Base sembrada en {time.perf_counter() - inicio:.1f} s")
+        return _ejecutar(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
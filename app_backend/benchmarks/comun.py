@@ -0,0 +1,92 @@
+# benchmarks/comun.py
+"""
+Utilidades compartidas por los benchmarks: base SQLite temporal con un usuario admin,
+API levantada con uvicorn en un subproceso y resumen de latencias.
+"""
+import contextlib
+import math
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Iterator, Optional
+
+APP_BACKEND = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+USUARIO = "bench_admin"
+PASSWORD = "BenchPassword123!"
+
+def preparar_base(ruta_db: str, sembrar: Optional[Callable] = None) -> None:
+    """
+    Crea el esquema y el usuario admin en una base SQLite nueva. Fija DATABASE_URL antes
+    de importar app; sembrar(db) puede cargar datos adicionales con la misma sesión.
+    """
+    os.environ["DATABASE_URL"] = f"sqlite:///{ruta_db}"
+    sys.path.insert(0, APP_BACKEND)
+
+    import app.main # noqa: F401 (registra todos los modelos que usa la API)
+    from app.core.security import get_password_hash
+    from app.db.base_class import Base
+    from app.db.session import SessionLocal, engine
+    from app.models.user import ApprovalStatus, User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(User(
+            email="bench@example.com", username=USUARIO, full_name="Bench Admin",
+            hashed_password=get_password_hash(PASSWORD), is_active=True,
+            role=UserRole.ADMIN, approval_status=ApprovalStatus.APPROVED
+        ))
+        if sembrar:
+            sembrar(db)
+        db.commit()
+    finally:
+        db.close()
+
+def _puerto_libre() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@contextlib.contextmanager
+def servidor(ruta_db: str, workers: int = 1) -> Iterator[str]:
+    """Levanta uvicorn sobre la base indicada y entrega la URL base; lo detiene al salir."""
+    puerto = _puerto_libre()
+    proceso = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(puerto), "--workers", str(workers), "--log-level", "warning"],
+        cwd=APP_BACKEND, env={**os.environ, "DATABASE_URL": f"sqlite:///{ruta_db}"},
+    )
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(("127.0.0.1", puerto), timeout=0.1).close()
+                break
+            except OSError:
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{puerto}"
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+async def login(cliente, username: str = USUARIO, password: str = PASSWORD) -> str:
+    """POST /auth/login con un httpx.AsyncClient; devuelve el access token."""
+    respuesta = await cliente.post("/api/v1/auth/login", data={"username": username, "password": password})
+    respuesta.raise_for_status()
+    return respuesta.json()["access_token"]
+
+def percentil(latencias_ms: list, p: float) -> float:
+    """Percentil por rango más cercano (p entre 0 y 1)."""
+    ordenadas = sorted(latencias_ms)
+    return ordenadas[max(0, math.ceil(len(ordenadas) * p) - 1)] if ordenadas else 0.0
+
+def p95(latencias_ms: list) -> float:
+    return percentil(latencias_ms, 0.95)
+
+def resumen(latencias_ms: list) -> str:
+    if not latencias_ms:
+        return "sin muestras"
+    return (f"n={len(latencias_ms):4d}  p50={statistics.median(latencias_ms):7.1f} ms  "
+            f"p95={p95(latencias_ms):7.1f} ms  max={max(latencias_ms):7.1f} ms")
@@ -0,0 +1,107 @@
+# benchmarks/concurrencia_event_loop.py
+"""
+Comprueba que un login o una carga masiva no bloquean las demás peticiones del worker.
+
+Levanta la API con uvicorn (un solo worker, en un subproceso) sobre una base SQLite
+temporal con un usuario admin, y mide la latencia de una petición ajena (GET /) en tres
+escenarios:
+  - reposo:        sin carga;
+  - logins:        una ráfaga de logins concurrentes (bcrypt);
+  - importación:   una carga de clientes por CSV (POST /clientes/upload-csv/).
+
+La versión chica, que corre con pytest sobre la app en proceso, es tests/test_concurrencia.py.
+
+Uso:
+    python benchmarks/concurrencia_event_loop.py [--logins 32] [--filas 20000] [--umbral-ms 100]
+
+Termina con código 1 si el p95 de GET / durante alguna carga supera --umbral-ms.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+from comun import login, p95, preparar_base, resumen, servidor
+
+def _csv_clientes(filas: int) -> bytes:
+    lineas = ["razon_social,rut,ramo,ubicacion"]
+    lineas.extend(f"Cliente Bench {i},{30000000 + i}-{i % 10},Retail,Santiago" for i in range(filas))
+    return ("\n".join(lineas) + "\n").encode()
+
+async def _sondear(cliente, termino: asyncio.Event, latencias_ms: list) -> None:
+    """GET / cada 10 ms hasta que termine la carga."""
+    while not termino.is_set():
+        inicio = time.perf_counter()
+        respuesta = await cliente.get("/")
+        latencias_ms.append((time.perf_counter() - inicio) * 1000)
+        respuesta.raise_for_status()
+        await asyncio.sleep(0.01)
+
+async def _medir(cliente, carga) -> tuple:
+    """Ejecuta la carga mientras se sondea GET /; devuelve (latencias, segundos de la carga)."""
+    latencias_ms: list = []
+    termino = asyncio.Event()
+    sonda = asyncio.create_task(_sondear(cliente, termino, latencias_ms))
+    inicio = time.perf_counter()
+    try:
+        await carga()
+    finally:
+        duracion = time.perf_counter() - inicio
+        termino.set()
+        await sonda
+    return latencias_ms, duracion
+
+async def _ejecutar(base_url: str, args) -> int:
+    import httpx
+
+    api = "/api/v1"
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as cliente:
+        token = await login(cliente)
+        contenido = _csv_clientes(args.filas)
+
+        async def reposo():
+            await asyncio.sleep(1)
+
+        async def rafaga_logins():
+            await asyncio.gather(*(login(cliente) for _ in range(args.logins)))
+
+        async def importacion():
+            respuesta = await cliente.post(
+                f"{api}/clientes/upload-csv/",
+                files={"file": ("clientes.csv", contenido, "text/csv")},
+                headers={"Authorization": f"Bearer {token}"},
+            )
+            respuesta.raise_for_status()
+
+        escenarios = (
+            ("reposo", reposo),
+            (f"logins ({args.logins})", rafaga_logins),
+            (f"importación ({args.filas} filas)", importacion),
+        )
+        fallo = False
+        for nombre, carga in escenarios:
+            latencias_ms, duracion = await _medir(cliente, carga)
+            print(f"{nombre:28s} carga={duracion:6.2f} s  GET / {resumen(latencias_ms)}")
+            if nombre != "reposo" and p95(latencias_ms) > args.umbral_ms:
+                fallo = True
+        if fallo:
+            print(f"\nGET / superó p95 > {args.umbral_ms} ms durante una carga: algo bloquea el event loop.")
+        return 1 if fallo else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32, help="Logins concurrentes de la ráfaga")
+    parser.add_argument("--filas", type=int, default=20000, help="Filas del CSV de clientes a importar")
+    parser.add_argument("--umbral-ms", type=float, default=100.0, help="p95 máximo aceptado para GET / bajo carga")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.db")
+        preparar_base(ruta_db)
+        with servidor(ruta_db) as base_url:
+            return asyncio.run(_ejecutar(base_url, args))
+
+if __name__ == "__main__":
+    sys.exit(main())
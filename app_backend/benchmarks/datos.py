@@ -0,0 +1,155 @@
+# benchmarks/datos.py
+"""
+Datos sintéticos reproducibles (misma semilla, mismos datos) para los benchmarks.
+
+  sembrar():   N vendedores, M clientes y K facturas insertados por lotes (Core insert).
+               Cada vendedor tiene una cartera de clientes asignados de tamaño variable
+               (algunos clientes compartidos), con porcentajes de bono entre 2 % y 15 %;
+               la actividad se concentra en pocos vendedores (pesos tipo Zipf) y la mayoría
+               de sus facturas van a su cartera, el resto a clientes sin asignación.
+  csv_*():     archivos CSV para los importadores, con RUT que no chocan con los sembrados.
+"""
+import io
+import random
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+LOTE_INSERCION = 5000
+INICIO_VENDEDORES = 10_000_000
+INICIO_CLIENTES = 50_000_000
+
+def dv_rut(numero: int) -> str:
+    """Dígito verificador (módulo 11) de un RUT chileno."""
+    suma, factor = 0, 2
+    while numero:
+        suma += (numero % 10) * factor
+        numero //= 10
+        factor = 2 if factor == 7 else factor + 1
+    resto = 11 - suma % 11
+    return {11: "0", 10: "K"}.get(resto, str(resto))
+
+def rut(numero: int) -> str:
+    return f"{numero}-{dv_rut(numero)}"
+
+def _insertar(db, modelo, filas: List[Dict]) -> None:
+    from sqlalchemy import insert
+
+    for inicio in range(0, len(filas), LOTE_INSERCION):
+        db.execute(insert(modelo), filas[inicio:inicio + LOTE_INSERCION])
+
+def sembrar(
+    db,
+    *,
+    vendedores: int,
+    clientes: int,
+    facturas: int,
+    semilla: int = 1,
+    desde: date = date(2024, 1, 1),
+    dias: int = 730,
+    cartera_media: Optional[int] = None,
+    fraccion_en_cartera: float = 0.85
+) -> Dict[str, int]:
+    """
+    Inserta los datos (sin commit: lo hace quien llama) y devuelve cuántas filas hay de cada tipo.
+    cartera_media es el tamaño medio de la cartera de un vendedor (por defecto, los clientes
+    repartidos entre los vendedores con un 30 % compartido, entre 3 y 60).
+    """
+    from app.models.cliente import Cliente
+    from app.models.factura import Factura
+    from app.models.vendedor import Vendedor, VendedorClientePorcentaje
+
+    azar = random.Random(semilla)
+    cartera_media = cartera_media or max(3, min(60, round(clientes * 1.3 / max(vendedores, 1))))
+
+    _insertar(db, Vendedor, [
+        {"nombre_completo": f"Vendedor Bench {i}", "rut": rut(INICIO_VENDEDORES + i),
+         "rut_normalizado": rut(INICIO_VENDEDORES + i).replace("-", ""),
+         "sueldo_base": azar.choice((650_000, 800_000, 1_000_000, 1_400_000))}
+        for i in range(1, vendedores + 1)
+    ])
+    _insertar(db, Cliente, [
+        {"razon_social": f"Cliente Bench {i} {azar.choice(('SpA', 'Ltda.', 'S.A.', 'EIRL'))}",
+         "rut": rut(INICIO_CLIENTES + i), "rut_normalizado": rut(INICIO_CLIENTES + i).replace("-", ""),
+         "ramo": azar.choice(("Retail", "Minería", "Salud", "Construcción", "Servicios")),
+         "ubicacion": azar.choice(("Santiago", "Valparaíso", "Concepción", "Antofagasta"))}
+        for i in range(1, clientes + 1)
+    ])
+
+    # Carteras: tamaño ~ exponencial alrededor de la media; porcentajes en pasos de 0,5 %
+    carteras: Dict[int, List[int]] = {}
+    asignaciones = []
+    for v in range(1, vendedores + 1):
+        tamano = max(1, min(clientes, round(azar.expovariate(1 / cartera_media))))
+        carteras[v] = azar.sample(range(1, clientes + 1), tamano)
+        asignaciones.extend(
+            {"vendedor_id": v, "cliente_id": c, "porcentaje_bono": azar.randint(4, 30) / 200}
+            for c in carteras[v]
+        )
+    _insertar(db, VendedorClientePorcentaje, asignaciones)
+
+    # Actividad tipo Zipf: el vendedor de rango r tiene peso 1 / r^0.8 (orden al azar)
+    rangos = list(range(1, vendedores + 1))
+    azar.shuffle(rangos)
+    pesos = [1 / r ** 0.8 for r in rangos]
+    ids_vendedores = list(range(1, vendedores + 1))
+    inicio = datetime(desde.year, desde.month, desde.day)
+
+    filas = []
+    for i, v in enumerate(azar.choices(ids_vendedores, weights=pesos, k=facturas), start=1):
+        if carteras[v] and azar.random() < fraccion_en_cartera:
+            c = azar.choice(carteras[v])
+        else:
+            c = azar.randint(1, clientes)
+        honorarios = round(azar.lognormvariate(12.5, 1.0)) # mediana ~270.000
+        # ~10 % de las facturas con gastos mayores que los honorarios (margen negativo, sin bono)
+        gastos = round(honorarios * (azar.uniform(1.0, 1.5) if azar.random() < 0.1 else azar.uniform(0, 0.7)))
+        filas.append({
+            "numero_orden": f"OC-{i}", "numero_caso": f"C-{i // 3}",
+            "fecha_emision": inicio + timedelta(days=azar.randrange(dias), hours=azar.randrange(9, 19)),
+            "honorarios_generados": honorarios, "gastos_generados": gastos,
+            "vendedor_id": v, "cliente_id": c,
+        })
+        if len(filas) == LOTE_INSERCION:
+            _insertar(db, Factura, filas)
+            filas = []
+    _insertar(db, Factura, filas)
+
+    return {"vendedores": vendedores, "clientes": clientes, "asignaciones": len(asignaciones), "facturas": facturas}
+
+def _csv(encabezado: Sequence[str], filas) -> bytes:
+    salida = io.StringIO()
+    salida.write(",".join(encabezado) + "\n")
+    for fila in filas:
+        salida.write(",".join(str(valor) for valor in fila) + "\n")
+    return salida.getvalue().encode()
+
+def csv_vendedores(n: int, desde: int) -> bytes:
+    """n vendedores nuevos con RUT desde INICIO_VENDEDORES + desde (fuera del rango sembrado)."""
+    return _csv(("rut", "nombre_completo", "sueldo_base"), (
+        (rut(INICIO_VENDEDORES + desde + i), f"Vendedor Importado {desde + i}", 900000)
+        for i in range(n)
+    ))
+
+def csv_clientes(n: int, desde: int) -> bytes:
+    return _csv(("razon_social", "rut", "ramo", "ubicacion"), (
+        (f"Cliente Importado {desde + i}", rut(INICIO_CLIENTES + desde + i), "Retail", "Santiago")
+        for i in range(n)
+    ))
+
+def csv_facturas(n: int, vendedores: int, clientes: int, semilla: int = 1) -> bytes:
+    """n facturas de vendedores y clientes sembrados (RUT con puntos, como los exporta un ERP)."""
+    azar = random.Random(semilla)
+
+    def con_puntos(numero: int) -> str:
+        return f"{numero:,}".replace(",", ".") + f"-{dv_rut(numero)}"
+
+    return _csv(
+        ("numero_orden", "numero_caso", "fecha_emision", "honorarios_generados", "gastos_generados", "vendedor_rut", "cliente_rut"),
+        (
+            (f"IMP-{semilla}-{i}", f"CI-{i // 3}", f"2025-{azar.randint(1, 12):02d}-{azar.randint(1, 28):02d}",
+             azar.randint(50_000, 2_000_000), azar.randint(0, 500_000),
+             con_puntos(INICIO_VENDEDORES + azar.randint(1, vendedores)),
+             con_puntos(INICIO_CLIENTES + azar.randint(1, clientes)))
+            for i in range(n)
+        )
+    )
@@ -0,0 +1,199 @@
+# benchmarks/serializacion_json.py
+"""
+Costo de armar y serializar las respuestas grandes, en ms por cada 10.000 filas.
+
+Las filas son Row de SQLAlchemy reales (consultas sobre SQLite en memoria con las columnas del
+reporte de facturación y del detalle de bonos); solo se mide lo que pasa después de la consulta:
+
+  reporte (GET /reportes/facturacion)
+    antes:          ReporteFacturaItem.model_validate por fila + validación contra el
+                    response_model + jsonable_encoder/json.dumps (FastAPI < 0.130 o con
+                    response_class propia) o dump_json de Pydantic (FastAPI actual);
+    una validación: filas -> dict, validadas una vez contra el response_model
+                    (ORJSON_RESPONSES_ENABLED=False);
+    orjson:         filas -> dict directo a app.api.respuestas (modo por defecto).
+
+  bonos (POST /bonos/calcular con detalle por factura)
+    antes:          detalle armado leyendo cada columna por atributo y calculando neto y bono
+                    en Python + BonoVendedorResult + response_model + serialización;
+    orjson:         detalle con neto y bono ya calculados en la consulta, filas -> dict
+                    + BonoVendedorResult + app.api.respuestas.
+
+Uso:
+    python benchmarks/serializacion_json.py [--filas 10000] [--repeticiones 7]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Callable, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+_SERIE = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < :filas)"
+
+def _consultar(n: int, sql: str, **tipos) -> List:
+    from sqlalchemy import create_engine, text
+
+    with create_engine("sqlite://").connect() as conexion:
+        return conexion.execute(text(f"{_SERIE} {sql}").columns(**tipos), {"filas": n}).all()
+
+def _filas_reporte(n: int) -> List:
+    """Mismas columnas (y etiquetas) que la página de crud_reporte.get_reporte_facturacion."""
+    from sqlalchemy import DateTime, Float, Integer, String
+
+    return _consultar(n, """
+        SELECT i AS factura_id,
+               'OC-' || i AS numero_orden,
+               'C-' || (i % 997) AS numero_caso,
+               datetime('2024-01-01', '+' || (i % 700) || ' days') AS fecha_emision,
+               (i % 1000) * 13.75 AS honorarios_generados,
+               (i % 300) * 7.5 AS gastos_generados,
+               i % 40 + 1 AS vendedor_id,
+               'Vendedor ' || (i % 40 + 1) AS vendedor_nombre,
+               '20.000.' || (i % 40 + 100) || '-1' AS vendedor_rut,
+               i % 500 + 1 AS cliente_id,
+               'Cliente Bench ' || (i % 500 + 1) || ' SpA' AS cliente_razon_social,
+               '76.000.' || (i % 500 + 100) || '-K' AS cliente_rut,
+               max((i % 1000) * 13.75 - (i % 300) * 7.5, 0) * (i % 7) * 0.01 AS bono_calculado,
+               (i % 7) AS porcentaje_bono_aplicado
+        FROM n
+    """, factura_id=Integer, numero_orden=String, numero_caso=String, fecha_emision=DateTime,
+        honorarios_generados=Float, gastos_generados=Float, vendedor_id=Integer,
+        vendedor_nombre=String, vendedor_rut=String, cliente_id=Integer,
+        cliente_razon_social=String, cliente_rut=String, bono_calculado=Float,
+        porcentaje_bono_aplicado=Float)
+
+def _filas_detalle(n: int) -> List:
+    """Mismas columnas que la consulta de detalle de calculations._calcular_bonos_agregado."""
+    from sqlalchemy import Float, Integer, String
+
+    return _consultar(n, """
+        SELECT vendedor_id, factura_id, numero_orden, razon_social_cliente, honorarios, gastos,
+               honorarios - gastos AS neto, porcentaje AS porcentaje_aplicado,
+               max(honorarios - gastos, 0) * porcentaje AS bono_generado
+        FROM (
+            SELECT i % 40 + 1 AS vendedor_id, i AS factura_id, 'OC-' || i AS numero_orden,
+                   'Cliente Bench ' || (i % 500 + 1) || ' SpA' AS razon_social_cliente,
+                   (i % 1000) * 13.75 AS honorarios, (i % 300) * 7.5 AS gastos,
+                   (i % 7) * 0.01 AS porcentaje
+            FROM n
+        ) ORDER BY vendedor_id, factura_id
+    """, vendedor_id=Integer, factura_id=Integer, numero_orden=String, razon_social_cliente=String,
+        honorarios=Float, gastos=Float, neto=Float, porcentaje_aplicado=Float, bono_generado=Float)
+
+def _medir(funcion: Callable[[], bytes], repeticiones: int) -> tuple:
+    """(mediana en ms, bytes de la respuesta); la primera ejecución es de calentamiento."""
+    tamano = len(funcion())
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tiempos), tamano
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=10000, help="Filas del reporte y facturas del detalle de bonos")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+
+    from app.api.respuestas import respuesta_json
+    from app.schemas.bono import BonoCalculationResponse, BonoVendedorResult
+    from app.schemas.reporte import ReporteFacturaItem, ReporteResponse
+
+    filas = _filas_reporte(args.filas)
+    detalle = _filas_detalle(args.filas)
+    # Lo que hace FastAPI con el response_model: validate_python(from_attributes) y luego serializar
+    adaptador_reporte = TypeAdapter(ReporteResponse)
+    adaptador_bonos = TypeAdapter(BonoCalculationResponse)
+    totales = {"total_count": len(filas), "sumatoria_total_honorarios": 1.0, "sumatorias_por_vendedor": []}
+    periodo = {"start_date": date(2024, 1, 1), "end_date": date(2025, 12, 31)}
+
+    def serializar(adaptador, contenido, dump_json: bool) -> bytes:
+        valor = adaptador.validate_python(contenido, from_attributes=True)
+        if dump_json:
+            return adaptador.dump_json(valor)
+        return json.dumps(jsonable_encoder(adaptador.dump_python(valor, mode="json"))).encode()
+
+    def como_dicts(filas_consulta) -> List[dict]:
+        claves = filas_consulta[0]._fields
+        return [dict(zip(claves, fila)) for fila in filas_consulta]
+
+    def reporte_antes(dump_json: bool) -> Callable[[], bytes]:
+        def ejecutar() -> bytes:
+            items = [ReporteFacturaItem.model_validate(fila) for fila in filas]
+            return serializar(adaptador_reporte, {"items": items, **totales}, dump_json)
+        return ejecutar
+
+    def reporte_una_validacion() -> bytes:
+        return serializar(adaptador_reporte, {"items": como_dicts(filas), **totales}, dump_json=True)
+
+    def reporte_orjson() -> bytes:
+        return respuesta_json({"items": como_dicts(filas), **totales}).body
+
+    def resultados(detalle_por_vendedor) -> List[BonoVendedorResult]:
+        return [
+            BonoVendedorResult(
+                vendedor_id=vendedor_id, nombre_vendedor=f"Vendedor {vendedor_id}", rut_vendedor="1-9",
+                total_honorarios=0.0, total_gastos=0.0, total_neto=0.0, bono_calculado=0.0,
+                detalle_facturas=facturas
+            )
+            for vendedor_id, facturas in sorted(detalle_por_vendedor.items())
+        ]
+
+    def bonos_antes(dump_json: bool) -> Callable[[], bytes]:
+        def ejecutar() -> bytes:
+            detalle_por_vendedor = defaultdict(list)
+            for fila in detalle:
+                neto_factura = fila.honorarios - fila.gastos
+                detalle_por_vendedor[fila.vendedor_id].append({
+                    "factura_id": fila.factura_id,
+                    "numero_orden": fila.numero_orden,
+                    "razon_social_cliente": fila.razon_social_cliente or "N/A",
+                    "honorarios": fila.honorarios,
+                    "gastos": fila.gastos,
+                    "neto": neto_factura,
+                    "porcentaje_aplicado": fila.porcentaje_aplicado,
+                    "bono_generado": max(0, neto_factura) * fila.porcentaje_aplicado,
+                })
+            return serializar(adaptador_bonos, {**periodo, "resultados": resultados(detalle_por_vendedor)}, dump_json)
+        return ejecutar
+
+    def bonos_orjson() -> bytes:
+        detalle_por_vendedor = defaultdict(list)
+        claves = detalle[0]._fields[1:]
+        for fila in detalle:
+            detalle_por_vendedor[fila[0]].append(dict(zip(claves, fila[1:])))
+        return respuesta_json({**periodo, "resultados": resultados(detalle_por_vendedor)}).body
+
+    casos = (
+        ("reporte  antes (json.dumps)", reporte_antes(dump_json=False)),
+        ("reporte  antes (dump_json)", reporte_antes(dump_json=True)),
+        ("reporte  una validación", reporte_una_validacion),
+        ("reporte  orjson", reporte_orjson),
+        ("bonos    antes (json.dumps)", bonos_antes(dump_json=False)),
+        ("bonos    antes (dump_json)", bonos_antes(dump_json=True)),
+        ("bonos    orjson", bonos_orjson),
+    )
+    # Todas las variantes de un mismo endpoint deben producir el mismo JSON
+    for grupo in ("reporte", "bonos"):
+        salidas = [json.loads(funcion()) for nombre, funcion in casos if nombre.startswith(grupo)]
+        assert all(salida == salidas[0] for salida in salidas), f"Las variantes de {grupo} no coinciden"
+
+    escala = 10000 / args.filas
+    print(f"{args.filas} filas, mediana de {args.repeticiones} ejecuciones (ms por 10.000 filas)")
+    for nombre, funcion in casos:
+        ms, tamano = _medir(funcion, args.repeticiones)
+        print(f"{nombre:30s} {ms * escala:8.1f} ms   {tamano / 1e6:5.2f} MB")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
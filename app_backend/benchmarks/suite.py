@@ -0,0 +1,319 @@
+# benchmarks/suite.py
+"""
+Suite de benchmarks de los caminos críticos, en proceso (sin servidor HTTP):
+
+  bonos.*        app.core.calculations.calcular_bonos_por_periodo (ambos motores)
+  reporte.*      crud_reporte.get_reporte_facturacion_enriquecido
+  facturas.*     crud_factura.get_facturas (OFFSET y cursor)
+  importacion.*  process_vendedores_csv / process_clientes_csv / process_facturas_csv
+
+Siembra una base con datos sintéticos reproducibles (benchmarks/datos.py): SQLite temporal por
+defecto, o la base de --database-url (p. ej. MySQL), que debe estar vacía salvo con --reutilizar.
+Por escenario informa percentiles de latencia, consultas SQL por ejecución y memoria Python
+máxima (tracemalloc, en una ejecución aparte para no alterar las latencias), y guarda todo en
+JSON junto con el commit, para comparar entre commits con --comparar.
+
+Uso:
+    python benchmarks/suite.py [--vendedores 50] [--clientes 2000] [--facturas 50000]
+                               [--repeticiones 20] [--escenarios bonos,reporte]
+                               [--database-url mysql+pymysql://...] [--reutilizar]
+                               [--salida resultados.json] [--comparar base.json] [--tolerancia 0.2]
+
+Con --comparar termina con código 1 si algún escenario empeoró más que --tolerancia en p95 o
+memoria, o hace más consultas que en la base de comparación.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import datos
+from comun import APP_BACKEND, percentil
+
+DIRECTORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resultados")
+
+class Escenario(NamedTuple):
+    nombre: str
+    funcion: Callable[[Any, Any], Any] # (db, entrada) -> resultado
+    repeticiones: int
+    preparar: Optional[Callable[[int], Any]] = None # iteración -> entrada, fuera de la medición
+
+class ContadorConsultas:
+    """Cuenta las sentencias que el motor envía a la base (un executemany cuenta como una)."""
+
+    def __init__(self, engine) -> None:
+        from sqlalchemy import event
+
+        self.total = 0
+        event.listen(engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args) -> None:
+        self.total += 1
+
+def _preparar_base(database_url: str, args) -> Dict[str, int]:
+    os.environ["DATABASE_URL"] = database_url
+    sys.path.insert(0, APP_BACKEND)
+
+    import app.main # noqa: F401 (registra todos los modelos)
+    from sqlalchemy import func
+    from app.crud import crud_bono_ledger
+    from app.db.base_class import Base
+    from app.db.session import SessionLocal, engine
+    from app.models.cliente import Cliente
+    from app.models.factura import Factura
+    from app.models.vendedor import Vendedor, VendedorClientePorcentaje
+
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if db.query(func.count(Factura.id)).scalar():
+            if not args.reutilizar:
+                raise SystemExit("La base ya tiene facturas: usa una base vacía o --reutilizar para medir sobre sus datos.")
+            return {
+                "vendedores": db.query(func.count(Vendedor.id)).scalar(),
+                "clientes": db.query(func.count(Cliente.id)).scalar(),
+                "asignaciones": db.query(func.count(VendedorClientePorcentaje.id)).scalar(),
+                "facturas": db.query(func.count(Factura.id)).scalar(),
+            }
+        inicio = time.perf_counter()
+        conteos = datos.sembrar(
+            db, vendedores=args.vendedores, clientes=args.clientes, facturas=args.facturas, semilla=args.semilla
+        )
+        if args.ledger:
+            # Meses cerrados completos del rango sembrado, como los deja el job del ledger
+            for periodo in crud_bono_ledger.dividir_rango(*_periodo_completo())[2]:
+                crud_bono_ledger.materializar_periodo(db, periodo)
+        db.commit()
+        print(f"Base sembrada en {time.perf_counter() - inicio:.1f} s: {conteos}")
+        return conteos
+
+def _periodo_completo():
+    return date(2024, 1, 1), date(2024, 1, 1) + timedelta(days=729)
+
+def _escenarios(args, conteos: Dict[str, int]) -> List[Escenario]:
+    from sqlalchemy import func
+    from app.core.calculations import calcular_bonos_por_periodo
+    from app.core.csv_stream import leer_csv_por_bloques
+    from app.crud import crud_cliente, crud_factura, crud_reporte, crud_vendedor
+    from app.db.session import SessionLocal
+    from app.models.factura import Factura
+
+    desde, hasta = _periodo_completo()
+    with SessionLocal() as db:
+        # El vendedor con más facturas y el mes central del rango: el caso "reporte de un vendedor"
+        vendedor_top = db.query(Factura.vendedor_id).group_by(Factura.vendedor_id).order_by(
+            func.count(Factura.id).desc()
+        ).limit(1).scalar()
+    mes_desde = date(2024, 12, 1)
+    mes_hasta = date(2024, 12, 31)
+    r = args.repeticiones
+    pocas = max(1, r // 5)
+
+    def bonos(modo: str, incluir_detalle: bool, vendedor_id: Optional[int] = None):
+        return lambda db, _: calcular_bonos_por_periodo(
+            db, desde, hasta, vendedor_id=vendedor_id, modo=modo, incluir_detalle=incluir_detalle
+        )
+
+    def reporte(**filtros):
+        return lambda db, _: crud_reporte.get_reporte_facturacion_enriquecido(db, **filtros)
+
+    def facturas_cursor(db, _):
+        cursor = None
+        for _pagina in range(10):
+            _, _, cursor = crud_factura.get_facturas(db, limit=100, after=cursor, include_total=False)
+        return cursor
+
+    def importar(procesar):
+        def ejecutar(db, contenido: bytes):
+            _, bloques = leer_csv_por_bloques(io.BytesIO(contenido))
+            resultado = procesar(db, bloques=bloques)
+            if resultado.errors:
+                raise RuntimeError(f"La importación del benchmark tuvo errores: {resultado.errors[:3]}")
+            return resultado
+        return ejecutar
+
+    # Cada repetición importa filas nuevas (RUT fuera de los rangos sembrados y de las demás repeticiones)
+    n = args.filas_csv
+    desde_csv = lambda i: 1_000_000 + i * n
+
+    return [
+        Escenario("bonos.agregado", bonos("agregado", False), r),
+        Escenario("bonos.agregado_con_detalle", bonos("agregado", True), pocas),
+        Escenario("bonos.agregado_un_vendedor", bonos("agregado", True, vendedor_top), r),
+        Escenario("bonos.por_vendedor", bonos("por_vendedor", True), max(1, r // 10)),
+        Escenario("reporte.primera_pagina", reporte(start_date=desde, end_date=hasta, limit=100), r),
+        Escenario("reporte.pagina_profunda", reporte(start_date=desde, end_date=hasta, skip=conteos["facturas"] // 2, limit=100), r),
+        Escenario("reporte.vendedor_mes", reporte(start_date=mes_desde, end_date=mes_hasta, vendedor_id=vendedor_top, limit=1000), r),
+        Escenario("facturas.primera_pagina", lambda db, _: crud_factura.get_facturas(db, limit=100), r),
+        Escenario("facturas.offset_profundo", lambda db, _: crud_factura.get_facturas(db, skip=conteos["facturas"] // 2, limit=100), r),
+        Escenario("facturas.cursor_10_paginas", facturas_cursor, r),
+        Escenario("importacion.vendedores", importar(crud_vendedor.process_vendedores_csv), pocas,
+                  lambda i: datos.csv_vendedores(n, desde_csv(i))),
+        Escenario("importacion.clientes", importar(crud_cliente.process_clientes_csv), pocas,
+                  lambda i: datos.csv_clientes(n, desde_csv(i))),
+        Escenario("importacion.facturas", importar(crud_factura.process_facturas_csv), pocas,
+                  lambda i: datos.csv_facturas(n, conteos["vendedores"], conteos["clientes"], semilla=i)),
+    ]
+
+def _medir(escenario: Escenario, contador: ContadorConsultas, iteracion: int) -> tuple:
+    """Una ejecución en una sesión nueva (como una petición): (ms, consultas)."""
+    from app.db.session import SessionLocal
+
+    entrada = escenario.preparar(iteracion) if escenario.preparar else None
+    with SessionLocal() as db:
+        contador.total = 0
+        inicio = time.perf_counter()
+        escenario.funcion(db, entrada)
+        return (time.perf_counter() - inicio) * 1000, contador.total
+
+def _ejecutar(escenario: Escenario, contador: ContadorConsultas) -> Dict[str, Any]:
+    _medir(escenario, contador, 0) # calentamiento (caché de sentencias, páginas de la base)
+    latencias, consultas = [], []
+    for iteracion in range(1, escenario.repeticiones + 1):
+        ms, total = _medir(escenario, contador, iteracion)
+        latencias.append(ms)
+        consultas.append(total)
+
+    tracemalloc.start()
+    _medir(escenario, contador, escenario.repeticiones + 1)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        "repeticiones": len(latencias),
+        "latencia_ms": {
+            "min": round(min(latencias), 3),
+            "p50": round(percentil(latencias, 0.50), 3),
+            "p95": round(percentil(latencias, 0.95), 3),
+            "p99": round(percentil(latencias, 0.99), 3),
+            "max": round(max(latencias), 3),
+            "promedio": round(statistics.fmean(latencias), 3),
+        },
+        "consultas": {"p50": percentil(consultas, 0.50), "max": max(consultas)},
+        "memoria_pico_mb": round(pico / 1e6, 3),
+    }
+
+def _commit() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=APP_BACKEND,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        cambios = subprocess.run(["git", "status", "--porcelain", "--", "app"], cwd=APP_BACKEND,
+                                 capture_output=True, text=True, check=True).stdout.strip()
+        return {"commit": commit, "cambios_sin_commit": bool(cambios)}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "cambios_sin_commit": None}
+
+def _metadatos(database_url: str, args, conteos: Dict[str, int]) -> Dict[str, Any]:
+    import sqlalchemy
+    from sqlalchemy.engine import make_url
+
+    return {
+        **_commit(),
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+        "base": make_url(database_url).render_as_string(hide_password=True),
+        "datos": conteos,
+        "parametros": {"semilla": args.semilla, "repeticiones": args.repeticiones,
+                       "filas_csv": args.filas_csv, "ledger": args.ledger},
+    }
+
+def _imprimir(resultados: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n{'escenario':32s} {'n':>3s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'consultas':>9s} {'mem MB':>8s}")
+    for nombre, r in resultados.items():
+        lat = r["latencia_ms"]
+        print(f"{nombre:32s} {r['repeticiones']:3d} {lat['p50']:9.1f} {lat['p95']:9.1f} {lat['p99']:9.1f} "
+              f"{r['consultas']['p50']:9.0f} {r['memoria_pico_mb']:8.2f}")
+
+def _comparar(actual: Dict[str, Any], base: Dict[str, Any], tolerancia: float) -> int:
+    """Imprime la variación por escenario frente a `base`; devuelve cuántos empeoraron."""
+    def variacion(nuevo: float, anterior: float) -> str:
+        return f"{(nuevo - anterior) / anterior * 100:+6.1f} %" if anterior else "   n/a  "
+
+    print(f"\nComparación con {base['metadatos'].get('commit')} ({base['metadatos'].get('fecha')}); "
+          f"tolerancia {tolerancia:.0%}")
+    if base["metadatos"].get("datos") != actual["metadatos"].get("datos"):
+        print("Aviso: las bases tienen distinta cantidad de datos; las latencias no son comparables.")
+    regresiones = 0
+    for nombre, r in actual["escenarios"].items():
+        anterior = base["escenarios"].get(nombre)
+        if not anterior:
+            continue
+        p95, p95_base = r["latencia_ms"]["p95"], anterior["latencia_ms"]["p95"]
+        mem, mem_base = r["memoria_pico_mb"], anterior["memoria_pico_mb"]
+        consultas, consultas_base = r["consultas"]["p50"], anterior["consultas"]["p50"]
+        motivos = []
+        if p95 > p95_base * (1 + tolerancia):
+            motivos.append("p95")
+        if mem > mem_base * (1 + tolerancia):
+            motivos.append("memoria")
+        if consultas > consultas_base:
+            motivos.append("consultas")
+        regresiones += bool(motivos)
+        print(f"{nombre:32s} p95 {variacion(p95, p95_base)}  mem {variacion(mem, mem_base)}  "
+              f"consultas {consultas_base:.0f} -> {consultas:.0f}"
+              + (f"   REGRESIÓN ({', '.join(motivos)})" if motivos else ""))
+    return regresiones
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vendedores", type=int, default=50)
+    parser.add_argument("--clientes", type=int, default=2000)
+    parser.add_argument("--facturas", type=int, default=50000)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=20, help="Ejecuciones medidas por escenario (las pesadas usan menos)")
+    parser.add_argument("--filas-csv", type=int, default=5000, help="Filas de cada CSV de los escenarios de importación")
+    parser.add_argument("--escenarios", default="", help="Prefijos separados por coma (p. ej. 'bonos,reporte'); por defecto todos")
+    parser.add_argument("--ledger", action="store_true", help="Materializar el ledger de bonos de los meses sembrados")
+    parser.add_argument("--database-url", help="Base a usar en vez de una SQLite temporal (debe estar vacía)")
+    parser.add_argument("--reutilizar", action="store_true", help="Medir sobre los datos que ya tiene --database-url")
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto benchmarks/resultados/<fecha>_<commit>.json)")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Empeoramiento aceptado de p95 y memoria (0.2 = 20 %%)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        database_url = args.database_url or f"sqlite:///{os.path.join(directorio, 'suite.db')}"
+        conteos = _preparar_base(database_url, args)
+
+        from app.db.session import engine
+
+        contador = ContadorConsultas(engine)
+        prefijos = tuple(p.strip() for p in args.escenarios.split(",") if p.strip())
+        resultados: Dict[str, Dict[str, Any]] = {}
+        for escenario in _escenarios(args, conteos):
+            if prefijos and not escenario.nombre.startswith(prefijos):
+                continue
+            print(f"  {escenario.nombre} ...", end="", flush=True)
+            resultados[escenario.nombre] = _ejecutar(escenario, contador)
+            print(f" p50 {resultados[escenario.nombre]['latencia_ms']['p50']:.1f} ms")
+        engine.dispose()
+
+    informe = {"metadatos": _metadatos(database_url, args, conteos), "escenarios": resultados}
+    _imprimir(resultados)
+
+    salida = args.salida
+    if not salida:
+        os.makedirs(DIRECTORIO_RESULTADOS, exist_ok=True)
+        salida = os.path.join(DIRECTORIO_RESULTADOS, f"{datetime.now():%Y%m%d-%H%M%S}_{informe['metadatos']['commit'] or 'sin-git'}.json")
+    with open(salida, "w", encoding="utf-8") as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            return 1 if _comparar(informe, json.load(archivo), args.tolerancia) else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# benchmarks/sync_vs_async.py
+"""
+Compara peticiones por segundo de las rutas síncronas (Session en el threadpool) con sus
+equivalentes /async (AsyncSession + aiosqlite) a alta concurrencia.
+
+Levanta la API con uvicorn (un worker) sobre una base SQLite temporal con facturas de prueba
+y, para cada ruta, mantiene --concurrencia peticiones en vuelo durante --segundos.
+
+Uso:
+    python benchmarks/sync_vs_async.py [--concurrencia 200] [--segundos 10] [--facturas 50000]
+
+Requiere las dependencias opcionales del stack async (greenlet, aiosqlite).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+import datos
+from comun import login, preparar_base, resumen, servidor
+
+# (nombre, ruta síncrona, ruta async, parámetros)
+RUTAS = (
+    ("facturas", "/api/v1/facturas/", "/api/v1/async/facturas/",
+     {"limit": 20, "vendedor_id": 7, "include_total": "false"}),
+    ("reporte", "/api/v1/reportes/facturacion", "/api/v1/async/reportes/facturacion",
+     {"start_date": "2025-06-01", "end_date": "2025-06-30", "vendedor_id": 7, "limit": 20}),
+)
+
+async def _carga(base_url: str, ruta: str, params: dict, headers: dict, concurrencia: int, segundos: float):
+    """Mantiene `concurrencia` peticiones en vuelo; devuelve (req/s, latencias, errores)."""
+    import httpx
+
+    latencias_ms: list = []
+    errores = 0
+    fin = time.perf_counter() + segundos
+
+    # Un cliente por medición: no se reutilizan conexiones keep-alive que el servidor ya cerró
+    limites = httpx.Limits(max_connections=concurrencia, max_keepalive_connections=concurrencia)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limites) as cliente:
+        async def trabajador():
+            nonlocal errores
+            while time.perf_counter() < fin:
+                inicio = time.perf_counter()
+                try:
+                    respuesta = await cliente.get(ruta, params=params, headers=headers)
+                    ok = respuesta.status_code == 200
+                except httpx.HTTPError: # timeouts incluidos: cuentan como error, no detienen la medición
+                    ok = False
+                latencias_ms.append((time.perf_counter() - inicio) * 1000)
+                if not ok:
+                    errores += 1
+
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabajador() for _ in range(concurrencia)))
+        return len(latencias_ms) / (time.perf_counter() - inicio), latencias_ms, errores
+
+async def _ejecutar(base_url: str, args) -> int:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url) as cliente:
+        headers = {"Authorization": f"Bearer {await login(cliente)}"}
+    for nombre, ruta_sync, ruta_async, params in RUTAS:
+        for etiqueta, ruta in (("sync", ruta_sync), ("async", ruta_async)):
+            # Calentamiento: conexiones del pool, ledger materializado y cachés del motor
+            await _carga(base_url, ruta, params, headers, 10, 1)
+            rps, latencias_ms, errores = await _carga(
+                base_url, ruta, params, headers, args.concurrencia, args.segundos
+            )
+            print(f"{nombre:9s} {etiqueta:5s} {rps:8.1f} req/s  errores={errores}  {resumen(latencias_ms)}")
+    return 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrencia", type=int, default=200, help="Peticiones en vuelo")
+    parser.add_argument("--segundos", type=float, default=10, help="Duración de cada medición")
+    parser.add_argument("--facturas", type=int, default=50000, help="Facturas de la base de prueba")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta_db = os.path.join(directorio, "bench.db")
+        preparar_base(ruta_db, lambda db: datos.sembrar(db, vendedores=50, clientes=200, facturas=args.facturas))
+        with servidor(ruta_db) as base_url:
+            return asyncio.run(_ejecutar(base_url, args))
+
+if __name__ == "__main__":
+    sys.exit(main())
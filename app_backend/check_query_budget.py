@@ -0,0 +1,122 @@
+# check_query_budget.py
+"""
+Verifica el presupuesto de consultas de los endpoints de lectura contra la base de DATABASE_URL.
+
+Cada caso pide el mismo endpoint con una respuesta chica y una grande (página de 5 y de 100
+filas, un mes y todo el rango, el vendedor con la cartera más chica y el de la más grande) y
+exige, con app.db.presupuesto:
+  - la misma cantidad de consultas en ambas (no depende de cuántas filas se devuelven),
+  - no más que el máximo del caso,
+  - ninguna sentencia repetida con otros parámetros (N+1).
+
+Las peticiones pasan por la API real (TestClient) con un usuario administrador ficticio; cada
+una se hace una vez antes de medir. El ledger de bonos se desactiva para no escribir en la base.
+
+Uso:
+    python check_query_budget.py
+
+Termina con código 1 si algún endpoint se pasa del presupuesto.
+"""
+import os
+import sys
+from datetime import date
+
+# Añadir app_backend al sys.path para importar 'app'
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+from app.db.presupuesto import presupuesto_consultas
+from app.api import deps
+from app.main import app
+from app.models.user import User, UserRole, ApprovalStatus
+from app.models.factura import Factura
+from app.models.vendedor import VendedorClientePorcentaje
+
+def _administrador() -> User:
+    return User(
+        id=0, username="check_query_budget", email="check@localhost", hashed_password="",
+        is_active=True, is_superuser=True, role=UserRole.ADMIN, approval_status=ApprovalStatus.APPROVED
+    )
+
+def _casos(db) -> list:
+    """(nombre, máximo de consultas, petición chica, petición grande); petición = (método, ruta, cuerpo)."""
+    primera, ultima = db.query(func.min(Factura.fecha_emision), func.max(Factura.fecha_emision)).one()
+    mes = primera.date().replace(day=1)
+    fin_mes = date.fromordinal(mes.replace(day=28).toordinal() + 4).replace(day=1)
+    rango_chico = {"start_date": mes.isoformat(), "end_date": fin_mes.isoformat()}
+    rango_grande = {"start_date": mes.isoformat(), "end_date": ultima.date().isoformat()}
+    carteras = (
+        db.query(VendedorClientePorcentaje.vendedor_id, func.count().label("n"))
+        .group_by(VendedorClientePorcentaje.vendedor_id).order_by("n").all()
+    )
+    v_chico, v_grande = (carteras[0][0], carteras[-1][0]) if carteras else (1, 1)
+    factura_id = db.query(func.min(Factura.id)).scalar()
+
+    def query(parametros: dict) -> str:
+        return "&".join(f"{clave}={valor}" for clave, valor in parametros.items())
+
+    api = settings.API_V1_STR
+    return [
+        ("listado de facturas", 3, ("GET", f"{api}/facturas/?limit=5", None), ("GET", f"{api}/facturas/?limit=100", None)),
+        ("factura por id", 2, ("GET", f"{api}/facturas/{factura_id}", None), ("GET", f"{api}/facturas/{factura_id}", None)),
+        ("listado de vendedores", 2, ("GET", f"{api}/vendedores/?limit=5", None), ("GET", f"{api}/vendedores/?limit=100", None)),
+        ("vendedor por id", 1, ("GET", f"{api}/vendedores/{v_chico}", None), ("GET", f"{api}/vendedores/{v_grande}", None)),
+        ("clientes asignados", 1, ("GET", f"{api}/vendedores/{v_chico}/clientes-asignados", None),
+         ("GET", f"{api}/vendedores/{v_grande}/clientes-asignados", None)),
+        ("listado de clientes", 2, ("GET", f"{api}/clientes/?limit=5", None), ("GET", f"{api}/clientes/?limit=100", None)),
+        ("reporte de facturación", 2, ("GET", f"{api}/reportes/facturacion?{query(rango_chico)}&limit=5", None),
+         ("GET", f"{api}/reportes/facturacion?{query(rango_grande)}&limit=100", None)),
+        ("cálculo de bonos", 2, ("POST", f"{api}/bonos/calcular", rango_chico), ("POST", f"{api}/bonos/calcular", rango_grande)),
+    ]
+
+def main() -> int:
+    # Sin ledger el cálculo de bonos y el reporte leen facturas directo (y no materializan meses)
+    settings.BONO_LEDGER_ENABLED = False
+    for dependencia in (deps.get_current_user, deps.get_current_active_superuser, deps.get_current_admin_user):
+        app.dependency_overrides[dependencia] = _administrador
+
+    db = SessionLocal()
+    try:
+        if db.query(Factura.id).first() is None:
+            print("La tabla facturas está vacía; no hay consultas que revisar.")
+            return 0
+        casos = _casos(db)
+    finally:
+        db.close()
+
+    hay_excesos = False
+    with TestClient(app) as client:
+        for nombre, maximo, *peticiones in casos:
+            conteos = []
+            for metodo, ruta, cuerpo in peticiones:
+                client.request(metodo, ruta, json=cuerpo) # Calentamiento (caché de usuarios, metadatos)
+                with presupuesto_consultas(engine) as registro:
+                    respuesta = client.request(metodo, ruta, json=cuerpo)
+                conteos.append(registro)
+                if respuesta.status_code >= 400:
+                    print(f"   {metodo} {ruta} respondió {respuesta.status_code}: {respuesta.text[:200]}")
+
+            chico, grande = conteos
+            problemas = []
+            if chico.total != grande.total:
+                problemas.append(f"{chico.total} consultas con la respuesta chica y {grande.total} con la grande")
+            if grande.total > maximo:
+                problemas.append(f"{grande.total} consultas (máximo {maximo})")
+            if grande.repetidas():
+                problemas.append("sentencias repetidas (¿N+1?)")
+            hay_excesos |= bool(problemas)
+            print(f"{'EXCEDE' if problemas else 'ok    '} {nombre}: {grande.total} consultas (máximo {maximo})")
+            for problema in problemas:
+                print(f"       {problema}")
+            if problemas:
+                print("       " + grande.resumen().replace("\n", "\n       "))
+
+    print("\nHay endpoints fuera de presupuesto." if hay_excesos else "\nTodos los endpoints están dentro del presupuesto.")
+    return 1 if hay_excesos else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
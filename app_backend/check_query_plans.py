@@ -0,0 +1,128 @@
+# check_query_plans.py
+"""
+Muestra el plan de ejecución (EXPLAIN) de las consultas sobre facturas que hacen el
+listado, el reporte de facturación y el cálculo de bonos, usando la base de DATABASE_URL.
+
+Las consultas no se escriben a mano: se ejecutan las funciones reales de app.crud y
+app.core.calculations y se captura el SQL que emiten. Se marca como FULL SCAN cualquier
+lectura de facturas que no use un índice (SQLite: "SCAN facturas"; MySQL: type = ALL).
+
+Uso:
+    python check_query_plans.py [--start 2024-01-01] [--end 2024-03-31] [--vendedor-id 1] [--cliente-id 1]
+
+Termina con código 1 si alguna consulta recorre facturas completa.
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+# Añadir app_backend al sys.path para importar 'app'
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from sqlalchemy import event, func
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine
+import app.models.user, app.models.import_job # noqa: F401 (registrar todos los modelos)
+from app.models.factura import Factura
+from app.core.calculations import calcular_bonos_por_periodo, MODO_PARALELO
+from app.crud import crud_factura, crud_reporte
+
+def _capturar(fn):
+    """Ejecuta fn() y devuelve los SELECT sobre facturas que emitió (sentencia, parámetros)."""
+    capturadas = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "facturas" in statement:
+            capturadas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    return capturadas
+
+def _explicar(conn, statement, parameters):
+    """Devuelve (líneas del plan, hay_full_scan) según el motor."""
+    if engine.dialect.name == "sqlite":
+        filas = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        lineas = [fila[-1] for fila in filas]
+        full_scan = any(l.startswith("SCAN facturas") and "INDEX" not in l for l in lineas)
+        return lineas, full_scan
+
+    resultado = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+    columnas = list(resultado.keys())
+    lineas, full_scan = [], False
+    for fila in resultado.fetchall():
+        datos = dict(zip(columnas, fila))
+        lineas.append(
+            f"table={datos.get('table')} type={datos.get('type')} key={datos.get('key')} "
+            f"rows={datos.get('rows')} extra={datos.get('Extra')}"
+        )
+        if datos.get("table") in ("facturas", "Factura", "facturas_1") and datos.get("type") == "ALL":
+            full_scan = True
+    return lineas, full_scan
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", type=date.fromisoformat, help="Inicio del rango (por defecto, primer mes con facturas)")
+    parser.add_argument("--end", type=date.fromisoformat, help="Fin del rango (por defecto, start + 90 días)")
+    parser.add_argument("--vendedor-id", type=int)
+    parser.add_argument("--cliente-id", type=int)
+    args = parser.parse_args()
+
+    # Solo se quieren ver las consultas sobre facturas: el ledger materializa (escribe) periodos
+    settings.BONO_LEDGER_ENABLED = False
+
+    db = SessionLocal()
+    try:
+        primera = db.query(Factura).order_by(Factura.fecha_emision).first()
+        if primera is None:
+            print("La tabla facturas está vacía; no hay planes que revisar.")
+            return 0
+        start = args.start or primera.fecha_emision.date().replace(day=1)
+        end = args.end or date.fromordinal(start.toordinal() + 90)
+        vendedor_id = args.vendedor_id or primera.vendedor_id
+        cliente_id = args.cliente_id or primera.cliente_id
+        total = db.query(func.count(Factura.id)).scalar()
+        print(f"Motor: {engine.dialect.name} | facturas: {total} | rango: {start} a {end} | "
+              f"vendedor_id={vendedor_id} cliente_id={cliente_id}\n")
+
+        casos = {
+            "listado de facturas (página 1)": lambda: crud_factura.get_facturas(db, skip=0, limit=50),
+            "listado de facturas (cursor)": lambda: crud_factura.get_facturas(
+                db, limit=50, after=crud_factura.get_facturas(db, limit=50, include_total=False)[2], include_total=False
+            ),
+            "reporte por rango": lambda: crud_reporte.get_reporte_facturacion(db, start_date=start, end_date=end),
+            "reporte por vendedor": lambda: crud_reporte.get_reporte_facturacion(
+                db, start_date=start, end_date=end, vendedor_id=vendedor_id
+            ),
+            "reporte por cliente": lambda: crud_reporte.get_reporte_facturacion(
+                db, start_date=start, end_date=end, cliente_id=cliente_id
+            ),
+            "bonos de todos los vendedores": lambda: calcular_bonos_por_periodo(db, start, end),
+            "bonos de un vendedor": lambda: calcular_bonos_por_periodo(db, start, end, vendedor_id=vendedor_id),
+            "bonos en paralelo (tramos de vendedores)": lambda: calcular_bonos_por_periodo(db, start, end, modo=MODO_PARALELO),
+        }
+
+        hay_full_scan = False
+        with engine.connect() as conn:
+            for nombre, fn in casos.items():
+                print(f"== {nombre}")
+                for statement, parameters in _capturar(fn):
+                    lineas, full_scan = _explicar(conn, statement, parameters)
+                    hay_full_scan |= full_scan
+                    print(f"  {'FULL SCAN' if full_scan else 'ok       '} {' '.join(statement.split())[:110]}...")
+                    for linea in lineas:
+                        print(f"      {linea}")
+                print()
+
+        print("Hay consultas que recorren facturas completa." if hay_full_scan else "Todas las consultas usan índices.")
+        return 1 if hay_full_scan else 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
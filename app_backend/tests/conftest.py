@@ -0,0 +1,100 @@
+# tests/conftest.py
+"""
+Fixtures compartidas: una base SQLite temporal sembrada con datos fijos, la API con un
+administrador ficticio (TestClient) y el presupuesto de consultas sobre el engine de la app.
+
+DATABASE_URL se fija antes de importar app, así los tests nunca escriben en la base del .env.
+"""
+import os
+import random
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from functools import partial
+
+import pytest
+
+_DIRECTORIO_DB = tempfile.mkdtemp(prefix="tests_compensaciones_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DIRECTORIO_DB, 'tests.db')}"
+
+from fastapi.testclient import TestClient # noqa: E402
+
+from app.api import deps # noqa: E402
+from app.db.base_class import Base # noqa: E402
+from app.db.presupuesto import presupuesto_consultas # noqa: E402
+from app.db.session import SessionLocal, engine # noqa: E402
+from app.main import app # noqa: E402 (registra todos los modelos que usa la API)
+from app.models.cliente import Cliente # noqa: E402
+from app.models.factura import Factura # noqa: E402
+from app.models.user import ApprovalStatus, User, UserRole # noqa: E402
+from app.models.vendedor import Vendedor, VendedorClientePorcentaje # noqa: E402
+
+VENDEDORES = 12
+CLIENTES = 40
+FACTURAS = 1500
+INICIO_FACTURAS = datetime(2024, 1, 1)
+DIAS_FACTURAS = 365
+
+def _administrador() -> User:
+    return User(
+        id=0, username="tests", email="tests@localhost", hashed_password="",
+        is_active=True, is_superuser=True, role=UserRole.ADMIN, approval_status=ApprovalStatus.APPROVED
+    )
+
+def _sembrar(db) -> None:
+    """Datos reproducibles: el vendedor i tiene una cartera de 1 + i % 6 clientes (de 1 a 6)."""
+    aleatorio = random.Random(1)
+    db.add_all(
+        Cliente(razon_social=f"Cliente {i:03d}", rut=f"{50_000_000 + i}-{i % 10}", ramo="Minería" if i % 4 == 0 else "Retail")
+        for i in range(CLIENTES)
+    )
+    db.add_all(
+        Vendedor(nombre_completo=f"Vendedor {i:03d}", rut=f"{10_000_000 + i}-{i % 10}", sueldo_base=1_000_000)
+        for i in range(VENDEDORES)
+    )
+    db.flush()
+    for vendedor_id in range(1, VENDEDORES + 1):
+        for cliente_id in aleatorio.sample(range(1, CLIENTES + 1), 1 + vendedor_id % 6):
+            db.add(VendedorClientePorcentaje(
+                vendedor_id=vendedor_id, cliente_id=cliente_id, porcentaje_bono=aleatorio.choice([0.05, 0.1, 0.12])
+            ))
+    for i in range(FACTURAS):
+        db.add(Factura(
+            numero_orden=f"OC-{i:05d}", numero_caso=f"C-{i % 200:03d}",
+            fecha_emision=INICIO_FACTURAS + timedelta(days=aleatorio.randrange(DIAS_FACTURAS), hours=aleatorio.randrange(24)),
+            honorarios_generados=aleatorio.randint(100_000, 2_000_000), gastos_generados=aleatorio.randint(0, 150_000),
+            vendedor_id=aleatorio.randint(1, VENDEDORES), cliente_id=aleatorio.randint(1, CLIENTES)
+        ))
+    db.commit()
+
+@pytest.fixture(scope="session")
+def db_sembrada():
+    """Crea el esquema y siembra los datos una vez por sesión de tests."""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        _sembrar(db)
+    finally:
+        db.close()
+    yield
+    engine.dispose()
+    shutil.rmtree(_DIRECTORIO_DB, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def client(db_sembrada):
+    """API con un administrador ficticio en vez del token."""
+    for dependencia in (deps.get_current_user, deps.get_current_active_superuser, deps.get_current_admin_user):
+        app.dependency_overrides[dependencia] = _administrador
+    with TestClient(app) as test_client:
+        yield test_client
+    app.dependency_overrides.clear()
+
+@pytest.fixture
+def presupuesto():
+    """
+    presupuesto_consultas sobre el engine de la app:
+
+        with presupuesto(maximo=3, max_repeticiones=1) as registro:
+            client.get(...)
+    """
+    return partial(presupuesto_consultas, engine)
@@ -0,0 +1,63 @@
+# tests/test_bono_ledger.py
+"""crud_bono_ledger.rango_materializado: materializa en una sesión propia, nunca en la de quien lee."""
+import logging
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app.crud import crud_bono_ledger
+from app.db.session import SessionLocal
+from app.models.bono_ledger import BonoLedgerPeriodo
+from app.models.factura import Factura
+
+DESDE, HASTA = date(2024, 5, 1), date(2024, 8, 1)
+PERIODOS = [202405, 202406, 202407]
+
+@pytest.fixture
+def db(db_sembrada):
+    """Sesión de lectura que cuenta sus commits; el ledger queda vacío antes y después."""
+    def vaciar_ledger():
+        with SessionLocal() as db_limpieza:
+            crud_bono_ledger.invalidar_periodos(db_limpieza, [p for (p,) in db_limpieza.query(BonoLedgerPeriodo.periodo)])
+            db_limpieza.commit()
+
+    vaciar_ledger()
+    sesion = SessionLocal()
+    sesion.commits = 0
+    def contar(_):
+        sesion.commits += 1
+    event.listen(sesion, "after_commit", contar)
+    try:
+        yield sesion
+    finally:
+        sesion.close()
+        vaciar_ledger()
+
+def _materializados() -> set:
+    with SessionLocal() as otra:
+        return crud_bono_ledger.periodos_materializados(otra, PERIODOS)
+
+def test_materializa_sin_commit_en_la_sesion_de_lectura(db):
+    assert crud_bono_ledger.rango_materializado(db, DESDE, HASTA) == (DESDE, date(2024, 8, 1), PERIODOS)
+    assert db.commits == 0
+    assert _materializados() == set(PERIODOS)
+
+def test_transaccion_previa_lee_de_facturas(db):
+    db.query(Factura.id).first() # La sesión ya tiene una transacción (y en MySQL, su snapshot)
+    assert crud_bono_ledger.rango_materializado(db, DESDE, HASTA) is None
+    assert db.commits == 0
+    assert _materializados() == set(PERIODOS) # La próxima lectura ya usa el ledger
+    db.rollback()
+    assert crud_bono_ledger.rango_materializado(db, DESDE, HASTA) is not None
+
+def test_materializacion_concurrente_se_informa(db, monkeypatch, caplog):
+    def en_conflicto(db_ledger, periodo):
+        raise IntegrityError("INSERT INTO bono_ledger_periodos", {}, Exception("UNIQUE constraint failed"))
+
+    monkeypatch.setattr(crud_bono_ledger, "materializar_periodo", en_conflicto)
+    with caplog.at_level(logging.WARNING, logger=crud_bono_ledger.logger.name):
+        assert crud_bono_ledger.rango_materializado(db, DESDE, HASTA) is None
+    assert "lee de facturas" in caplog.text
+    assert db.commits == 0
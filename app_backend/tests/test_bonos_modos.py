@@ -0,0 +1,85 @@
+# tests/test_bonos_modos.py
+"""
+Los tres motores del cálculo de bonos dan el mismo resultado: "paralelo" idéntico a
+"agregado" (mismas filas, mismo orden de suma) y ambos iguales a "por_vendedor" salvo el
+redondeo de sumar en otro orden (el ledger agrega por mes).
+
+El rango empieza y termina a mitad de mes (meses de borde que se leen de facturas), pasa por
+un mes que ya estaba en el ledger antes de calcular, por meses que se materializan durante el
+cálculo y llega hasta el mes en curso, que nunca se materializa.
+"""
+from datetime import date, datetime
+
+import pytest
+
+from app.core import calculations
+from app.core.config import settings
+from app.crud import crud_bono_ledger
+from app.db.session import SessionLocal
+from app.models.bono_ledger import BonoLedgerPeriodo
+from app.models.factura import Factura
+
+PERIODO_EN_LEDGER = 202403
+DESDE = date(2024, 2, 15)
+
+def _hasta() -> date:
+    # Fin del mes siguiente al actual: el mes en curso queda dentro del rango
+    hoy = date.today()
+    siguiente = hoy.replace(year=hoy.year + (hoy.month == 12), month=hoy.month % 12 + 1, day=1)
+    return siguiente.replace(day=28)
+
+@pytest.fixture(scope="module")
+def db_con_ledger(db_sembrada):
+    """Facturas del mes en curso y un mes materializado de antemano; se deshace al terminar."""
+    db = SessionLocal()
+    inicio_mes = date.today().replace(day=1)
+    nuevas = [
+        Factura(numero_orden=f"MES-ACTUAL-{i}", fecha_emision=datetime(inicio_mes.year, inicio_mes.month, 1, 9 + i),
+                honorarios_generados=500_000 + i * 1000, gastos_generados=20_000, vendedor_id=1 + i % 4, cliente_id=1 + i)
+        for i in range(8)
+    ]
+    db.add_all(nuevas)
+    crud_bono_ledger.materializar_periodo(db, PERIODO_EN_LEDGER)
+    db.commit()
+    try:
+        yield db
+    finally:
+        db.query(Factura).filter(Factura.id.in_([f.id for f in nuevas])).delete(synchronize_session=False)
+        periodos = [p for (p,) in db.query(BonoLedgerPeriodo.periodo)]
+        crud_bono_ledger.invalidar_periodos(db, periodos)
+        db.commit()
+        db.close()
+
+@pytest.fixture(autouse=True)
+def con_ledger(monkeypatch):
+    monkeypatch.setattr(settings, "BONO_LEDGER_ENABLED", True)
+
+def _calcular(db, modo: str, incluir_detalle: bool = False) -> list:
+    return [r.model_dump() for r in calculations.calcular_bonos_por_periodo(
+        db, DESDE, _hasta(), modo=modo, incluir_detalle=incluir_detalle
+    )]
+
+@pytest.mark.parametrize("particiones_por_worker", [1, 4])
+@pytest.mark.parametrize("incluir_detalle", [False, True])
+def test_paralelo_identico_a_agregado(db_con_ledger, monkeypatch, particiones_por_worker, incluir_detalle):
+    # Con 1 partición por worker cada tramo tiene varios vendedores; con 4, casi uno por tramo
+    monkeypatch.setattr(settings, "BONO_PARALLEL_PARTITIONS_PER_WORKER", particiones_por_worker)
+    agregado = _calcular(db_con_ledger, calculations.MODO_AGREGADO, incluir_detalle)
+    paralelo = _calcular(db_con_ledger, calculations.MODO_PARALELO, incluir_detalle)
+    assert len(agregado) > 4
+    assert paralelo == agregado
+
+def test_paralelo_igual_a_por_vendedor(db_con_ledger):
+    paralelo = _calcular(db_con_ledger, calculations.MODO_PARALELO)
+    por_vendedor = _calcular(db_con_ledger, calculations.MODO_POR_VENDEDOR)
+    campos = ("total_honorarios", "total_gastos", "total_neto", "bono_calculado")
+    assert [r["vendedor_id"] for r in paralelo] == [r["vendedor_id"] for r in por_vendedor]
+    for p, v in zip(paralelo, por_vendedor):
+        assert {c: p[c] for c in campos} == pytest.approx({c: v[c] for c in campos}, rel=1e-9)
+
+def test_rango_usa_el_ledger_y_deja_abiertos_los_bordes(db_con_ledger):
+    _calcular(db_con_ledger, calculations.MODO_PARALELO)
+    materializados = {p for (p,) in db_con_ledger.query(BonoLedgerPeriodo.periodo)}
+    mes_en_curso = crud_bono_ledger.periodo_de(date.today())
+    assert {PERIODO_EN_LEDGER, 202404, 202412} <= materializados
+    assert not {202402, mes_en_curso} & materializados
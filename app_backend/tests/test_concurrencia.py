@@ -0,0 +1,97 @@
+# tests/test_concurrencia.py
+"""
+Un login o una carga masiva no bloquean el event loop: mientras corren, una petición ajena
+(GET /) sigue respondiendo rápido. La versión más pesada, con uvicorn y más carga, es
+benchmarks/concurrencia_event_loop.py.
+
+La app corre en el mismo event loop que el test (httpx.ASGITransport), así que cualquier
+trabajo bloqueante en un endpoint async se ve directamente en la latencia de la sonda.
+"""
+import asyncio
+import time
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.user import ApprovalStatus, User, UserRole
+
+API = settings.API_V1_STR
+LOGINS = 16
+FILAS_CSV = 5000
+# Sin bloqueos la sonda no pasa de ~150 ms aun con un solo núcleo ocupado por bcrypt; con
+# bcrypt o la importación en el event loop se detiene uno o varios segundos
+LATENCIA_MAXIMA_MS = 500
+INTERVALO_SONDA_S = 0.01
+
+@pytest.fixture(scope="module")
+def credenciales(db_sembrada):
+    username, password = f"concurrencia_{uuid4().hex[:8]}", "Concurrencia123!"
+    db = SessionLocal()
+    try:
+        db.add(User(
+            email=f"{username}@example.com", username=username, full_name="Tests Concurrencia",
+            hashed_password=get_password_hash(password), is_active=True,
+            role=UserRole.ADMIN, approval_status=ApprovalStatus.APPROVED
+        ))
+        db.commit()
+    finally:
+        db.close()
+    return {"username": username, "password": password}
+
+async def _sondear(cliente, termino: asyncio.Event, latencias_ms: list) -> None:
+    """
+    GET / cada INTERVALO_SONDA_S. La latencia de cada vuelta incluye el retraso con que el loop
+    la retoma después del sleep: si el loop se bloquea entre dos peticiones, también se ve.
+    """
+    while not termino.is_set():
+        inicio = time.perf_counter()
+        respuesta = await cliente.get("/")
+        assert respuesta.status_code == 200
+        await asyncio.sleep(INTERVALO_SONDA_S)
+        latencias_ms.append((time.perf_counter() - inicio - INTERVALO_SONDA_S) * 1000)
+
+def _latencias_durante(carga) -> list:
+    """Ejecuta carga(cliente) mientras se sondea GET /; devuelve las latencias de la sonda."""
+    async def ejecutar():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as cliente:
+            latencias_ms: list = []
+            termino = asyncio.Event()
+            sonda = asyncio.create_task(_sondear(cliente, termino, latencias_ms))
+            try:
+                await carga(cliente)
+            finally:
+                termino.set()
+                await sonda
+            return latencias_ms
+
+    return asyncio.run(ejecutar())
+
+def test_rafaga_de_logins_no_bloquea(client, credenciales):
+    async def rafaga(cliente):
+        respuestas = await asyncio.gather(*(
+            cliente.post(f"{API}/auth/login", data=credenciales) for _ in range(LOGINS)
+        ))
+        assert all(r.status_code == 200 for r in respuestas), respuestas[0].text
+
+    latencias_ms = _latencias_durante(rafaga)
+    assert len(latencias_ms) >= 2
+    assert max(latencias_ms) < LATENCIA_MAXIMA_MS, [round(x) for x in sorted(latencias_ms)[-5:]]
+
+def test_importacion_csv_no_bloquea(client):
+    lineas = ["razon_social,rut,ramo,ubicacion"]
+    lineas += [f"Concurrencia {i},{60_000_000 + i}-{i % 10},Retail,Santiago" for i in range(FILAS_CSV)]
+    contenido = ("\n".join(lineas) + "\n").encode("utf-8")
+
+    async def importacion(cliente):
+        respuesta = await cliente.post(f"{API}/clientes/upload-csv/", files={"file": ("clientes.csv", contenido, "text/csv")})
+        assert respuesta.status_code == 200, respuesta.text
+        assert respuesta.json()["created_count"] == FILAS_CSV
+
+    latencias_ms = _latencias_durante(importacion)
+    assert len(latencias_ms) >= 2
+    assert max(latencias_ms) < LATENCIA_MAXIMA_MS, [round(x) for x in sorted(latencias_ms)[-5:]]
@@ -0,0 +1,63 @@
+# tests/test_import_jobs.py
+"""Cargas CSV en segundo plano (/upload-csv/background y /jobs/{id}) y su recuperación al arrancar."""
+import os
+import time
+
+from app.core import import_jobs
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob, ImportJobStatus
+
+API = settings.API_V1_STR
+
+def _subir_y_esperar(client, recurso: str, contenido: str) -> dict:
+    respuesta = client.post(f"{API}/{recurso}/upload-csv/background", files={"file": ("carga.csv", contenido.encode("utf-8"), "text/csv")})
+    assert respuesta.status_code == 202, respuesta.text
+    job_id = respuesta.json()["id"]
+    for _ in range(200):
+        job = client.get(f"{API}/jobs/{job_id}").json()
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"El trabajo {job_id} no terminó: {job}")
+
+def test_carga_en_segundo_plano_completa(client):
+    job = _subir_y_esperar(client, "clientes", "razon_social,rut\nCarga Uno,77000001-1\nCarga Dos,77000002-K\n")
+    assert job["status"] == "completed"
+    assert (job["rows_processed"], job["created_count"]) == (2, 2)
+    assert not os.path.exists(import_jobs.ruta_temporal(job["id"]))
+
+def test_vendedores_con_errores_falla_sin_guardar(client):
+    # Vendedores es todo o nada, igual que facturas: con una fila inválida el trabajo falla
+    job = _subir_y_esperar(client, "vendedores", "nombre_completo,rut,sueldo_base\nNueva Persona,15000001-1,1000\nSin Sueldo,15000002-2,abc\n")
+    assert job["status"] == "failed"
+    assert job["error_count"] == 1
+    assert job["created_count"] == 0
+
+def test_recupera_trabajos_de_procesos_terminados(client):
+    db = SessionLocal()
+    try:
+        db.add_all([
+            ImportJob(id="muerto", tipo="facturas", status=ImportJobStatus.RUNNING, worker="host-inexistente:1:x"),
+            ImportJob(id="propio", tipo="facturas", status=ImportJobStatus.PENDING, worker=import_jobs.IDENTIFICADOR_PROCESO),
+            ImportJob(id="anterior", tipo="clientes", status=ImportJobStatus.RUNNING,
+                      worker=f"{import_jobs.socket.gethostname()}:{os.getpid()}:reinicio"),
+        ])
+        db.commit()
+        os.makedirs(import_jobs._DIRECTORIO_TEMPORAL, exist_ok=True)
+        for job_id in ("anterior", "propio"):
+            open(import_jobs.ruta_temporal(job_id), "w").close()
+
+        assert import_jobs.recuperar_trabajos_interrumpidos() == 1
+
+        db.expire_all()
+        estados = {j.id: j.status for j in db.query(ImportJob).filter(ImportJob.id.in_(["muerto", "propio", "anterior"]))}
+        # "muerto" es de otro host y reciente: no se puede saber si sigue vivo
+        assert estados == {"muerto": ImportJobStatus.RUNNING, "propio": ImportJobStatus.PENDING, "anterior": ImportJobStatus.FAILED}
+        assert not os.path.exists(import_jobs.ruta_temporal("anterior"))
+        assert os.path.exists(import_jobs.ruta_temporal("propio"))
+    finally:
+        db.query(ImportJob).filter(ImportJob.id.in_(["muerto", "propio", "anterior"])).delete(synchronize_session=False)
+        db.commit()
+        db.close()
+        import_jobs._eliminar_archivo(import_jobs.ruta_temporal("propio"))
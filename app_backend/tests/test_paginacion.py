@@ -0,0 +1,27 @@
+# tests/test_paginacion.py
+"""Los cursores de paginación manipulados responden 400, no 500."""
+import base64
+import json
+
+import pytest
+
+from app.core.config import settings
+
+def _cursor(valores) -> str:
+    return base64.urlsafe_b64encode(json.dumps(valores).encode("utf-8")).decode("ascii").rstrip("=")
+
+CURSORES_INVALIDOS = ["no-es-base64!", _cursor({"a": 1}), _cursor([1]), _cursor([None, 3]), _cursor([{"a": 1}, 2]),
+                      _cursor(["x", "3"]), _cursor(["x", True]), _cursor(["x", 1.5])]
+
+@pytest.mark.parametrize("recurso", ["clientes", "vendedores", "facturas"])
+def test_cursor_valido_pagina(client, recurso):
+    primera = client.get(f"{settings.API_V1_STR}/{recurso}/?limit=5").json()
+    segunda = client.get(f"{settings.API_V1_STR}/{recurso}/?limit=5&after={primera['next_cursor']}")
+    assert segunda.status_code == 200
+    assert not {i["id"] for i in primera["items"]} & {i["id"] for i in segunda.json()["items"]}
+
+@pytest.mark.parametrize("cursor", CURSORES_INVALIDOS)
+@pytest.mark.parametrize("recurso", ["clientes", "vendedores", "facturas"])
+def test_cursor_invalido_responde_400(client, recurso, cursor):
+    respuesta = client.get(f"{settings.API_V1_STR}/{recurso}/?limit=5&after={cursor}")
+    assert respuesta.status_code == 400, respuesta.text
@@ -0,0 +1,62 @@
+# tests/test_presupuesto_consultas.py
+"""
+Presupuesto de consultas de los endpoints de lectura (los mismos casos que check_query_budget.py):
+la respuesta chica y la grande emiten las mismas consultas, sin pasarse del máximo y sin
+sentencias repetidas (N+1).
+"""
+import pytest
+
+from app.core.config import settings
+from app.crud import crud_factura
+from app.db.presupuesto import PresupuestoConsultasExcedido
+
+API = settings.API_V1_STR
+MES = {"start_date": "2024-01-01", "end_date": "2024-02-01"}
+ANIO = {"start_date": "2024-01-01", "end_date": "2024-12-31"}
+# Carteras sembradas en conftest: el vendedor 6 tiene 1 cliente asignado y el 5, seis
+VENDEDOR_CHICO, VENDEDOR_GRANDE = 6, 5
+
+CASOS = [
+    ("listado de facturas", 3, ("GET", f"{API}/facturas/?limit=5", None), ("GET", f"{API}/facturas/?limit=100", None)),
+    ("listado de vendedores", 2, ("GET", f"{API}/vendedores/?limit=2", None), ("GET", f"{API}/vendedores/?limit=100", None)),
+    ("vendedor por id", 1, ("GET", f"{API}/vendedores/{VENDEDOR_CHICO}", None), ("GET", f"{API}/vendedores/{VENDEDOR_GRANDE}", None)),
+    ("clientes asignados", 1, ("GET", f"{API}/vendedores/{VENDEDOR_CHICO}/clientes-asignados", None),
+     ("GET", f"{API}/vendedores/{VENDEDOR_GRANDE}/clientes-asignados", None)),
+    ("listado de clientes", 2, ("GET", f"{API}/clientes/?limit=5", None), ("GET", f"{API}/clientes/?limit=100", None)),
+    ("reporte de facturación", 2, ("GET", f"{API}/reportes/facturacion?start_date={MES['start_date']}&end_date={MES['end_date']}&limit=5", None),
+     ("GET", f"{API}/reportes/facturacion?start_date={ANIO['start_date']}&end_date={ANIO['end_date']}&limit=100", None)),
+    ("cálculo de bonos", 2, ("POST", f"{API}/bonos/calcular", MES), ("POST", f"{API}/bonos/calcular", ANIO)),
+]
+
+@pytest.fixture(autouse=True)
+def sin_ledger(monkeypatch):
+    # Sin ledger el reporte y los bonos leen facturas directo (y no materializan meses)
+    monkeypatch.setattr(settings, "BONO_LEDGER_ENABLED", False)
+
+def _medir(client, presupuesto, peticion, **limites):
+    metodo, ruta, cuerpo = peticion
+    client.request(metodo, ruta, json=cuerpo) # Calentamiento
+    with presupuesto(**limites) as registro:
+        respuesta = client.request(metodo, ruta, json=cuerpo)
+    assert respuesta.status_code == 200, respuesta.text
+    return registro, respuesta
+
+@pytest.mark.parametrize("nombre, maximo, chica, grande", CASOS, ids=[caso[0] for caso in CASOS])
+def test_consultas_no_dependen_del_tamano_de_la_respuesta(client, presupuesto, nombre, maximo, chica, grande):
+    registro_chico, _ = _medir(client, presupuesto, chica, maximo=maximo, max_repeticiones=1)
+    registro_grande, respuesta = _medir(client, presupuesto, grande, maximo=maximo, max_repeticiones=1)
+    assert respuesta.content != b"[]" # La respuesta grande tiene datos
+    assert registro_chico.total == registro_grande.total, registro_grande.resumen()
+
+def test_listado_de_facturas_carga_la_cartera_sin_n_mas_1(client, presupuesto):
+    # Regresión: cada factura serializa la cartera del vendedor con sus clientes; sin
+    # _CARGA_FACTURA se cargaban con una consulta por vendedor y otra por asignación
+    registro, respuesta = _medir(client, presupuesto, ("GET", f"{API}/facturas/?limit=100", None), maximo=3, max_repeticiones=1)
+    facturas = respuesta.json()["items"]
+    assert len(facturas) == 100
+    assert any(f["vendedor"]["clientes_asignados"] for f in facturas)
+
+def test_presupuesto_detecta_el_n_mas_1_sin_carga_anticipada(client, presupuesto, monkeypatch):
+    monkeypatch.setattr(crud_factura, "_CARGA_FACTURA", ())
+    with pytest.raises(PresupuestoConsultasExcedido, match="N\\+1"):
+        _medir(client, presupuesto, ("GET", f"{API}/facturas/?limit=100", None), max_repeticiones=1)
@@ -1,13 +1,12 @@
 // src/components/clientes/ClienteUploadModal.tsx
 import React, { useState, ChangeEvent, FormEvent, useEffect } from 'react';
 import clienteService from '../../services/clienteService';
-import { Cliente } from '../../types/cliente';
 import { toast } from 'react-toastify'; // Importar toast
 
 interface ClienteUploadModalProps {
   isOpen: boolean;
   onClose: () => void;
-  onUploadSuccess: (uploadedClientes: Cliente[]) => void;
+  onUploadSuccess: () => void;
 }
 
 const ClienteUploadModal: React.FC<ClienteUploadModalProps> = ({
@@ -54,31 +53,39 @@ const ClienteUploadModal: React.FC<ClienteUploadModalProps> = ({
   };
 
   const handleSubmit = async (event: FormEvent) => {
-    // ...
+    event.preventDefault();
+    if (!selectedFile) return;
+    setIsLoading(true);
+    setError(null);
+    setSuccessMessage(null);
     try {
-      const uploadedClientes = await clienteService.uploadClientesCSV(selectedFile);
-      // setSuccessMessage(`Carga exitosa. Se procesaron ${uploadedClientes.length} clientes.`); // Reemplazado por toast
-      toast.success(`Carga exitosa. Se procesaron ${uploadedClientes.length} clientes.`);
-      onUploadSuccess(uploadedClientes);
+      const job = await clienteService.uploadClientesCSV(selectedFile, (j) =>
+        setSuccessMessage(`Procesando... ${j.rows_processed} filas`)
+      );
+      setSuccessMessage(null);
+      const errores = job.errors ?? [];
+      const detalleErrores = errores.map((e) => `Fila ${e.row} (RUT: ${e.rut || 'N/A'}): ${e.error}`).join('\n');
+      if (job.status === 'failed' || (errores.length > 0 && job.created_count === 0)) {
+        const finalErrorMsg = errores.length > 0 ? `Errores en el archivo CSV:\n${detalleErrores}` : (job.message || 'Error al subir el archivo CSV.');
+        toast.error(errores.length > 0 ? "Hubo errores en algunas filas del CSV. Revisa los detalles." : finalErrorMsg, { autoClose: 7000 });
+        setError(finalErrorMsg);
+        return;
+      }
+      toast.success(`Carga exitosa. Se crearon ${job.created_count} clientes.`);
+      if (job.skipped_count > 0) {
+        toast.info(`${job.skipped_count} clientes ya existían o estaban repetidos en el archivo.`);
+      }
+      if (job.error_count > 0) {
+        toast.warn(`${job.error_count} filas fueron omitidas.`);
+      }
+      onUploadSuccess();
     } catch (err: any) {
-      // ... (manejo de error existente)
       const errorDetail = err.response?.data?.detail;
-      let finalErrorMsg = 'Error al subir el archivo CSV.';
-      if (typeof errorDetail === 'object' && errorDetail !== null && errorDetail.errors) {
-          finalErrorMsg = `Errores en el archivo CSV:\n${errorDetail.errors.map((e: any) => `Fila ${e.row} (RUT: ${e.rut || 'N/A'}): ${e.error}`).join('\n')}`;
-          // Para errores largos en toast, considera un resumen o mostrarlo en el modal
-          toast.error("Hubo errores en algunas filas del CSV. Revisa los detalles.", { autoClose: 7000 });
-          setError(finalErrorMsg); // Aún puedes setear el error para mostrarlo en el modal
-      } else if (typeof errorDetail === 'string') {
-          finalErrorMsg = errorDetail;
-          toast.error(finalErrorMsg);
-          setError(finalErrorMsg);
-      } else {
-          toast.error(finalErrorMsg);
-          setError(finalErrorMsg);
-      }
+      const finalErrorMsg = typeof errorDetail === 'string' ? errorDetail : 'Error al subir el archivo CSV.';
+      toast.error(finalErrorMsg);
+      setError(finalErrorMsg);
     } finally {
-      // ...
+      setIsLoading(false);
     }
   };
 
@@ -134,7 +141,7 @@ const ClienteUploadModal: React.FC<ClienteUploadModalProps> = ({
                 disabled={isLoading || !selectedFile}
                 className="px-4 py-2 text-sm font-medium text-white bg-blue-500 rounded-md hover:bg-blue-600 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-blue-500 disabled:opacity-50"
               >
-                {isLoading ? 'Subiendo...' : 'Subir Archivo'}
+                {isLoading ? 'Procesando...' : 'Subir Archivo'}
               </button>
             </div>
           </form>
@@ -3,17 +3,18 @@ import React, { useState, useCallback } from 'react';
 import { useDropzone } from 'react-dropzone';
 import { toast } from 'react-toastify';
 import facturaService from '../../services/facturaService';
-import { Factura } from '../../types/factura';
+import { ErrorFilaCSV } from '../../types/importacion';
 
 interface FacturaUploadCSVModalProps {
   isOpen: boolean;
   onClose: () => void;
-  onUploadSuccess: (nuevasFacturas: Factura[]) => void;
+  onUploadSuccess: () => void;
 }
 
 const FacturaUploadCSVModal: React.FC<FacturaUploadCSVModalProps> = ({ isOpen, onClose, onUploadSuccess }) => {
   const [file, setFile] = useState<File | null>(null);
   const [isUploading, setIsUploading] = useState(false);
+  const [filasProcesadas, setFilasProcesadas] = useState<number | null>(null);
 
   const onDrop = useCallback((acceptedFiles: File[]) => {
     if (acceptedFiles.length > 0) setFile(acceptedFiles[0]);
@@ -28,14 +29,23 @@ const FacturaUploadCSVModal: React.FC<FacturaUploadCSVModalProps> = ({ isOpen, o
   const handleUpload = async () => {
     if (!file) return;
     setIsUploading(true);
+    setFilasProcesadas(null);
     try {
-      const response = await facturaService.uploadFacturasCSV(file);
-      toast.success(`${response.length} facturas procesadas exitosamente.`);
-      onUploadSuccess(response);
+      const job = await facturaService.uploadFacturasCSV(file, (j) => setFilasProcesadas(j.rows_processed));
+      if (job.status === 'failed') {
+        if (job.errors && job.errors.length > 0) {
+          toast.error(<div><p>{job.message}</p><pre>{job.errors.map((e: ErrorFilaCSV) => `Fila ${e.row}: ${e.error}`).join('\n')}</pre></div>, { autoClose: false });
+        } else {
+          toast.error(job.message || 'Error al procesar el archivo CSV.');
+        }
+        return;
+      }
+      toast.success(`${job.created_count} facturas procesadas exitosamente.`);
+      onUploadSuccess();
     } catch (err: any) {
       const errorDetail = err.response?.data?.detail;
       if (typeof errorDetail === 'object' && errorDetail.errors) {
-        toast.error(<div><p>Errores en el archivo:</p><pre>{errorDetail.errors.join('\n')}</pre></div>, { autoClose: false });
+        toast.error(<div><p>Errores en el archivo:</p><pre>{errorDetail.errors.map((e: ErrorFilaCSV) => `Fila ${e.row}: ${e.error}`).join('\n')}</pre></div>, { autoClose: false });
       } else {
         toast.error(errorDetail || 'Error al procesar el archivo CSV.');
       }
@@ -51,7 +61,7 @@ const FacturaUploadCSVModal: React.FC<FacturaUploadCSVModalProps> = ({ isOpen, o
       <div className="bg-white p-6 rounded-lg shadow-xl w-full max-w-lg">
         <h2 className="text-xl font-semibold mb-4">Cargar Facturas desde CSV</h2>
         <p className="text-sm text-gray-600 mb-4">
-          Columnas requeridas: <strong>numero_orden, honorarios_generados, gastos_generados, fecha_venta, vendedor_rut, cliente_rut</strong>.
+          Columnas requeridas: <strong>numero_orden, honorarios_generados, gastos_generados, fecha_emision, vendedor_rut, cliente_rut</strong>.
         </p>
         <div {...getRootProps()} className="border-2 border-dashed rounded-md p-8 text-center cursor-pointer">
           <input {...getInputProps()} />
@@ -60,7 +70,7 @@ const FacturaUploadCSVModal: React.FC<FacturaUploadCSVModalProps> = ({ isOpen, o
         <div className="mt-6 flex justify-end space-x-2">
           <button onClick={onClose} disabled={isUploading} className="px-4 py-2 bg-gray-200 rounded-md">Cancelar</button>
           <button onClick={handleUpload} disabled={!file || isUploading} className="px-4 py-2 bg-blue-500 text-white rounded-md disabled:opacity-50">
-            {isUploading ? 'Subiendo...' : 'Subir y Procesar'}
+            {isUploading ? (filasProcesadas !== null ? `Procesando... ${filasProcesadas} filas` : 'Subiendo...') : 'Subir y Procesar'}
           </button>
         </div>
       </div>
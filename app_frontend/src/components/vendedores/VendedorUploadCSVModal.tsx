@@ -3,17 +3,18 @@ import React, { useState, useCallback } from 'react';
 import { useDropzone } from 'react-dropzone';
 import { toast } from 'react-toastify';
 import vendedorService from '../../services/vendedorService';
-import { Vendedor } from '../../types/vendedor';
+import { ErrorFilaCSV } from '../../types/importacion';
 
 interface VendedorUploadCSVModalProps {
   isOpen: boolean;
   onClose: () => void;
-  onUploadSuccess: (nuevosVendedores: Vendedor[]) => void;
+  onUploadSuccess: () => void;
 }
 
 const VendedorUploadCSVModal: React.FC<VendedorUploadCSVModalProps> = ({ isOpen, onClose, onUploadSuccess }) => {
   const [file, setFile] = useState<File | null>(null);
   const [isUploading, setIsUploading] = useState(false);
+  const [filasProcesadas, setFilasProcesadas] = useState<number | null>(null);
 
   const onDrop = useCallback((acceptedFiles: File[]) => {
     if (acceptedFiles.length > 0) {
@@ -30,14 +31,24 @@ const VendedorUploadCSVModal: React.FC<VendedorUploadCSVModalProps> = ({ isOpen,
   const handleUpload = async () => {
     if (!file) return;
     setIsUploading(true);
+    setFilasProcesadas(null);
     try {
-      const response = await vendedorService.uploadVendedoresCSV(file);
-      toast.success(`${response.length} vendedores procesados.`);
-      onUploadSuccess(response);
+      const job = await vendedorService.uploadVendedoresCSV(file, (j) => setFilasProcesadas(j.rows_processed));
+      if (job.status === 'failed') {
+        if (job.errors && job.errors.length > 0) {
+          const errorMessages = job.errors.map((e: ErrorFilaCSV) => `Fila ${e.row}: ${e.error}`).join('\n');
+          toast.error(<div><p>{job.message}</p><pre>{errorMessages}</pre></div>, { autoClose: false });
+        } else {
+          toast.error(job.message || 'Error al procesar el archivo.');
+        }
+        return;
+      }
+      toast.success(`${job.created_count} vendedores creados y ${job.updated_count} actualizados.`);
+      onUploadSuccess();
     } catch (err: any) {
       const errorDetail = err.response?.data?.detail;
       if (typeof errorDetail === 'object' && errorDetail.errors) {
-        const errorMessages = errorDetail.errors.join('\n');
+        const errorMessages = errorDetail.errors.map((e: ErrorFilaCSV) => `Fila ${e.row}: ${e.error}`).join('\n');
         toast.error(<div><p>Errores en el archivo:</p><pre>{errorMessages}</pre></div>, { autoClose: false });
       } else {
         toast.error(errorDetail || 'Error al procesar el archivo.');
@@ -61,7 +72,7 @@ const VendedorUploadCSVModal: React.FC<VendedorUploadCSVModalProps> = ({ isOpen,
         <div className="mt-6 flex justify-end space-x-2">
           <button onClick={onClose} disabled={isUploading} className="px-4 py-2 bg-gray-200 rounded-md">Cancelar</button>
           <button onClick={handleUpload} disabled={!file || isUploading} className="px-4 py-2 bg-blue-500 text-white rounded-md disabled:opacity-50">
-            {isUploading ? 'Subiendo...' : 'Subir'}
+            {isUploading ? (filasProcesadas !== null ? `Procesando... ${filasProcesadas} filas` : 'Subiendo...') : 'Subir'}
           </button>
         </div>
       </div>
@@ -6,7 +6,7 @@ import { Cliente } from '../types/cliente';
 import { ReporteFacturaItem, SumatoriaPorVendedor } from '../types/reporte';
 import vendedorService from '../services/vendedorService';
 import clienteService from '../services/clienteService';
-import reportService from '../services/reportService';
+import reportService, { FormatoExportacion } from '../services/reportService';
 import bonusService from '../services/bonusService';
 import ReportTable from '../components/reportes/ReportTable';
 import { toast } from 'react-toastify';
@@ -53,6 +53,7 @@ const ReportsPage: React.FC = () => {
     const [sumatoriaTotal, setSumatoriaTotal] = useState(0);
     const [sumatoriasVendedor, setSumatoriasVendedor] = useState<SumatoriaPorVendedor[]>([]);
     const [isLoading, setIsLoading] = useState(false);
+    const [isExporting, setIsExporting] = useState(false);
     const [error, setError] = useState<string | null>(null);
     const [searchTerm, setSearchTerm] = useState('');
     const [visibleColumns, setVisibleColumns] = useState(getInitialVisibility());
@@ -172,6 +173,28 @@ const ReportsPage: React.FC = () => {
         }
     };
 
+    const handleExport = async (formato: FormatoExportacion) => {
+        if (!filters.startDate || !filters.endDate) {
+          toast.warn("Debe seleccionar un período de fechas para exportar el reporte.");
+          return;
+        }
+        setIsExporting(true);
+        try {
+          await reportService.exportFacturacionReport({
+            start_date: filters.startDate,
+            end_date: filters.endDate,
+            numero_caso: filters.numero_caso || undefined,
+            vendedor_id: filters.vendedorId ? Number(filters.vendedorId) : undefined,
+            cliente_id: filters.clienteId ? Number(filters.clienteId) : undefined,
+            vendedor_rut: filters.vendedorRut || undefined,
+          }, formato);
+        } catch (err: any) {
+          toast.error("Error al exportar el reporte.");
+        } finally {
+          setIsExporting(false);
+        }
+    };
+
     const filteredData = useMemo(() => {
         if (!searchTerm) return reportData;
         const lowercasedTerm = searchTerm.toLowerCase();
@@ -231,7 +254,21 @@ const ReportsPage: React.FC = () => {
                         <input type="text" name="vendedorRut" id="vendedorRut" placeholder="Ej: 12345678-9" value={filters.vendedorRut} onChange={handleFilterChange} className="mt-1 block w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-marrs-green focus:border-marrs-green sm:text-sm"/>
                     </div>
                 </div>
-                <div className="mt-6 text-right">
+                <div className="mt-6 flex justify-end gap-3">
+                    <button
+                        onClick={() => handleExport('csv')}
+                        disabled={isExporting}
+                        className="inline-flex justify-center py-2 px-4 border border-gray-300 shadow-sm text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-marrs-green disabled:opacity-50"
+                    >
+                        Exportar CSV
+                    </button>
+                    <button
+                        onClick={() => handleExport('xlsx')}
+                        disabled={isExporting}
+                        className="inline-flex justify-center py-2 px-4 border border-gray-300 shadow-sm text-sm font-medium rounded-md text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-marrs-green disabled:opacity-50"
+                    >
+                        {isExporting ? 'Exportando...' : 'Exportar Excel'}
+                    </button>
                     <button
                         onClick={handleGenerateReport}
                         disabled={isLoading}
@@ -86,7 +86,7 @@ const VendedoresPage: React.FC = () => {
     setIsVendedorUploadModalOpen(false);
   };
 
-  const handleUploadSuccess = (nuevosVendedores: Vendedor[]) => {
+  const handleUploadSuccess = () => {
     handleCloseVendedorUploadModal();
     fetchVendedores(); 
   };
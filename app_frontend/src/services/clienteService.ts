@@ -1,10 +1,13 @@
 // src/services/clienteService.ts
 import apiClient from './apiClient';
 import { Cliente, ClienteCreate, ClienteUpdate, ClienteFormData, ClienteSimple } from '../types/cliente';
+import { ImportJob } from '../types/importacion';
+import jobService from './jobService';
 
 interface ClientesResponse {
   items: Cliente[];
   total_count: number;
+  next_cursor?: string | null;
 }
 
 const getAllClientes = async (
@@ -15,6 +18,7 @@ const getAllClientes = async (
   const params: any = { skip, limit };
   if (search) {
     params.search = search;
+    params.search_mode = 'trigram'; // Búsqueda indexada, ordenada por relevancia
   }
   const response = await apiClient.get<ClientesResponse>('/clientes/', { params });
   return response.data; 
@@ -44,16 +48,9 @@ const deleteCliente = async (id: number): Promise<void> => {
   await apiClient.delete(`/clientes/${id}`);
 };
 
-const uploadClientesCSV = async (file: File): Promise<Cliente[]> => {
-  const formData = new FormData();
-  formData.append('file', file);
-  const response = await apiClient.post<Cliente[]>('/clientes/upload-csv/', formData, {
-    headers: {
-      'Content-Type': 'multipart/form-data',
-    },
-  });
-  return response.data;
-};
+// La carga corre en el servidor en segundo plano; se espera consultando /jobs/{id}
+const uploadClientesCSV = (file: File, onProgress?: (job: ImportJob) => void): Promise<ImportJob> =>
+  jobService.subirCSVEnSegundoPlano('clientes', file, onProgress);
 
 // --- FUNCIÓN CORREGIDA ---
 const getAllClientesSimple = async (): Promise<ClienteSimple[]> => {
@@ -1,6 +1,8 @@
 // src/services/facturaService.ts
 import apiClient from './apiClient';
 import { Factura, FacturaCreate, FacturaUpdate, FacturasResponse } from '../types/factura';
+import { ImportJob } from '../types/importacion';
+import jobService from './jobService';
 
 // Se define una interfaz para los filtros
 interface FacturaFilters {
@@ -36,9 +38,9 @@ const deleteFactura = async (id: number): Promise<void> => {
     await apiClient.delete(`/facturas/${id}`);
 }
 
-const uploadFacturasCSV = async (file: File): Promise<Factura[]> => {
-    // ... (esta función no cambia)
-};
+// La carga corre en el servidor en segundo plano; se espera consultando /jobs/{id}
+const uploadFacturasCSV = (file: File, onProgress?: (job: ImportJob) => void): Promise<ImportJob> =>
+    jobService.subirCSVEnSegundoPlano('facturas', file, onProgress);
 
 const facturaService = {
     getAllFacturas,
@@ -0,0 +1,44 @@
+// src/services/jobService.ts
+import apiClient from './apiClient';
+import { ImportJob } from '../types/importacion';
+
+const INTERVALO_CONSULTA_MS = 1000;
+
+const getJob = async (jobId: string): Promise<ImportJob> => {
+  const response = await apiClient.get<ImportJob>(`/jobs/${jobId}`);
+  return response.data;
+};
+
+// Consulta el trabajo hasta que termina (completed o failed); onProgress recibe cada avance
+const esperarTrabajo = async (jobId: string, onProgress?: (job: ImportJob) => void): Promise<ImportJob> => {
+  for (;;) {
+    const job = await getJob(jobId);
+    if (job.status === 'completed' || job.status === 'failed') {
+      return job;
+    }
+    onProgress?.(job);
+    await new Promise((resolve) => setTimeout(resolve, INTERVALO_CONSULTA_MS));
+  }
+};
+
+// Sube el CSV a la ruta en segundo plano del recurso y espera a que el trabajo termine
+const subirCSVEnSegundoPlano = async (
+  recurso: 'facturas' | 'clientes' | 'vendedores',
+  file: File,
+  onProgress?: (job: ImportJob) => void
+): Promise<ImportJob> => {
+  const formData = new FormData();
+  formData.append('file', file);
+  const response = await apiClient.post<ImportJob>(`/${recurso}/upload-csv/background`, formData, {
+    headers: { 'Content-Type': 'multipart/form-data' },
+  });
+  return esperarTrabajo(response.data.id, onProgress);
+};
+
+const jobService = {
+  getJob,
+  esperarTrabajo,
+  subirCSVEnSegundoPlano,
+};
+
+export default jobService;
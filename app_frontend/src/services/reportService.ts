@@ -26,8 +26,39 @@ const getFacturacionReport = async (params: ReportParams): Promise<ReporteRespon
   return response.data;
 };
 
+export type FormatoExportacion = 'csv' | 'xlsx';
+
+// Descarga el reporte completo (sin paginar) que el backend genera por bloques
+const exportFacturacionReport = async (
+  params: Omit<ReportParams, 'skip' | 'limit'>,
+  formato: FormatoExportacion
+): Promise<void> => {
+  const cleanParams: { [key: string]: any } = { formato };
+  for (const key in params) {
+    const value = params[key as keyof typeof params];
+    if (value !== null && value !== undefined && value !== '') {
+      cleanParams[key] = value;
+    }
+  }
+
+  const response = await apiClient.get<Blob>('/reportes/facturacion/exportar', {
+    params: cleanParams,
+    responseType: 'blob',
+  });
+  const nombre = `reporte_facturacion_${params.start_date}_${params.end_date}.${formato}`;
+  const url = URL.createObjectURL(response.data);
+  const enlace = document.createElement('a');
+  enlace.href = url;
+  enlace.download = nombre;
+  document.body.appendChild(enlace);
+  enlace.click();
+  enlace.remove();
+  URL.revokeObjectURL(url);
+};
+
 const reportService = {
   getFacturacionReport,
+  exportFacturacionReport,
 };
 
 export default reportService;
@@ -10,16 +10,22 @@ import {
     VendedorSimple
 } from '../types/vendedor';
 import { ClienteSimple } from '../types/cliente';
+import { ImportJob } from '../types/importacion';
+import jobService from './jobService';
 
 interface VendedoresResponse {
     items: Vendedor[];
     total_count: number;
+    next_cursor?: string | null;
 }
 
 // --- Vendedor CRUD ---
 const getAllVendedores = async (skip: number = 0, limit: number = 10, search: string = ''): Promise<VendedoresResponse> => {
   const params: any = { skip, limit };
-  if (search) params.search = search;
+  if (search) {
+    params.search = search;
+    params.search_mode = 'trigram'; // Búsqueda indexada, ordenada por relevancia
+  }
   const response = await apiClient.get<VendedoresResponse>('/vendedores/', { params });
   return response.data;
 };
@@ -61,14 +67,9 @@ const removeClienteFromVendedor = async (vendedorId: number, clienteId: number):
 };
 
 // --- Carga Masiva CSV ---
-const uploadVendedoresCSV = async (file: File): Promise<Vendedor[]> => {
-    const formData = new FormData();
-    formData.append('file', file);
-    const response = await apiClient.post<Vendedor[]>('/vendedores/upload-csv/', formData, {
-      headers: { 'Content-Type': 'multipart/form-data' },
-    });
-    return response.data;
-};
+// La carga corre en el servidor en segundo plano; se espera consultando /jobs/{id}
+const uploadVendedoresCSV = (file: File, onProgress?: (job: ImportJob) => void): Promise<ImportJob> =>
+    jobService.subirCSVEnSegundoPlano('vendedores', file, onProgress);
 
 // --- Funciones para listas simplificadas ---
 
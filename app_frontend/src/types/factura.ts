@@ -33,4 +33,5 @@ export interface Factura extends FacturaBase {
 export interface FacturasResponse {
     items: Factura[];
     total_count: number;
+    next_cursor?: string | null;
 }
\ No newline at end of file
@@ -0,0 +1,31 @@
+// src/types/importacion.ts
+
+export interface ErrorFilaCSV {
+    row: number;
+    rut?: string | null;
+    error: string;
+}
+
+export interface ResultadoImportacion {
+    created_count: number;
+    updated_count: number;
+    skipped_count: number;
+    errors: ErrorFilaCSV[];
+}
+
+// Carga en segundo plano (POST /<recurso>/upload-csv/background, GET /jobs/{id})
+export type ImportJobStatus = 'pending' | 'running' | 'completed' | 'failed';
+
+export interface ImportJob extends ResultadoImportacion {
+    id: string;
+    tipo: string;
+    filename?: string | null;
+    status: ImportJobStatus;
+    rows_processed: number;
+    error_count: number; // Total de errores; `errors` trae solo los primeros
+    message?: string | null;
+    rows_per_second?: number | null;
+    created_at?: string | null;
+    started_at?: string | null;
+    finished_at?: string | null;
+}